@@ -0,0 +1,238 @@
+# atlas.py
+
+# standard library dependencies
+import glob
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from typing import Dict, List, Tuple, Union
+
+# external dependencies
+import pygame
+
+IMAGES_DIRPATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "images"
+)
+CACHE_DIRPATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    ".atlas_cache"
+)
+
+# images are packed into rows ("shelves") at least this wide
+MIN_ATLAS_WIDTH = 1024
+
+Region = Tuple[int, int, int, int]
+
+def write_atomically(path: str, data: bytes):
+    """Writes `data` to a temporary file next to `path`, then renames
+    it to `path`, so other processes see the old file or the whole new
+    one, never a partly written one (a file they mapped stays intact).
+    """
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(path),
+        prefix=os.path.basename(path) + ".",
+        suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as temporary_file:
+            temporary_file.write(data)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+def hash_source_files(filepaths: List[str], root: str) -> str:
+    """Hashes the names and contents of the source images,
+    so that any change to them invalidates the cached atlas.
+
+    Parameters
+    ----------
+    filepaths : List[str]
+        Paths of the source images.
+    root : str
+        Folder the names are taken relative to.
+
+    Returns
+    -------
+    str
+        Hex digest identifying this set of images.
+    """
+    digest = hashlib.sha1()
+    for filepath in filepaths:
+        digest.update(os.path.relpath(filepath, root).encode())
+        with open(filepath, "rb") as source_file:
+            digest.update(source_file.read())
+    return digest.hexdigest()
+
+def pack_shelves(sizes: Dict[str, Tuple[int, int]]) -> Tuple[Tuple[int, int], Dict[str, Region]]:
+    """Packs rectangles into rows, tallest first.
+
+    Parameters
+    ----------
+    sizes : Dict[str, Tuple[int, int]]
+        (width, height) of every image, by name.
+
+    Returns
+    -------
+    Tuple[Tuple[int, int], Dict[str, Region]]
+        Size of the atlas, and the (x, y, width, height) region of every image.
+    """
+    atlas_width = max([MIN_ATLAS_WIDTH] + [width for width, _ in sizes.values()])
+    regions = {}
+    x = y = shelf_height = 0
+    for name in sorted(sizes, key=lambda name: (-sizes[name][1], name)):
+        width, height = sizes[name]
+        if x + width > atlas_width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        regions[name] = (x, y, width, height)
+        x += width
+        shelf_height = max(shelf_height, height)
+    return (atlas_width, y + shelf_height), regions
+
+class SpriteAtlas:
+    """Every image in `images_dirpath`, packed into a single surface.
+
+    The packed pixels are cached in `cache_dirpath` as raw RGBA bytes
+    (plus a small JSON index), keyed by a hash of the source images;
+    later runs memory-map that file instead of decoding the PNGs.
+    Images are handed out by `get` as subsurfaces of the atlas,
+    converted to the display's pixel format once a display exists.
+    """
+    def __init__(   self,
+                    images_dirpath: str = IMAGES_DIRPATH,
+                    cache_dirpath: Union[str, None] = CACHE_DIRPATH):
+        """
+        Parameters
+        ----------
+        images_dirpath : str, optional
+            Folder holding one sub-folder of PNGs per kind of sprite.
+        cache_dirpath : str, optional
+            Folder for the cached atlas; `None` disables the cache.
+        """
+        self.images_dirpath = images_dirpath
+        self.cache_dirpath = cache_dirpath
+        filepaths = sorted(glob.glob(os.path.join(images_dirpath, "*", "*.png")))
+        self.key = hash_source_files(filepaths, images_dirpath)
+        self._mmap = None
+        self._display_surface = None
+        self._subsurfaces: Dict[str, pygame.Surface] = {}
+        if not self._load_cache():
+            self._build(filepaths)
+
+    def _cache_paths(self) -> Tuple[str, str]:
+        prefix = os.path.join(self.cache_dirpath, f"atlas-{self.key}")
+        return prefix + ".rgba", prefix + ".json"
+
+    def _load_cache(self) -> bool:
+        """Memory-maps the cached atlas, if there is one.
+        """
+        if self.cache_dirpath is None:
+            return False
+        pixels_path, index_path = self._cache_paths()
+        # a missing, truncated or malformed cache is rebuilt
+        try:
+            with open(index_path) as index_file:
+                index = json.load(index_file)
+            size = tuple(index["size"])
+            regions = {name: tuple(region) for name, region in index["regions"].items()}
+            with open(pixels_path, "rb") as pixels_file:
+                self._mmap = mmap.mmap(pixels_file.fileno(), 0, access=mmap.ACCESS_COPY)
+            # `frombuffer` shares the mapped memory rather than copying it
+            surface = pygame.image.frombuffer(self._mmap, size, "RGBA")
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            return False
+        self.size = size
+        self.regions = regions
+        self.surface = surface
+        return True
+
+    def _build(self, filepaths: List[str]):
+        """Decodes the PNGs, packs them and caches the result.
+        """
+        images = {
+            os.path.relpath(filepath, self.images_dirpath).replace(os.sep, "/"):
+                pygame.image.load(filepath)
+            for filepath in filepaths
+        }
+        self.size, self.regions = pack_shelves(
+            {name: image.get_size() for name, image in images.items()}
+        )
+        self.surface = pygame.Surface(self.size, pygame.SRCALPHA, 32)
+        for name, image in images.items():
+            x, y, _, _ = self.regions[name]
+            # blending onto the transparent atlas with MAX copies the pixels exactly
+            self.surface.blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        if self.cache_dirpath is None:
+            return
+        pixels_path, index_path = self._cache_paths()
+        try:
+            os.makedirs(self.cache_dirpath, exist_ok=True)
+            write_atomically(pixels_path, pygame.image.tobytes(self.surface, "RGBA"))
+            # the index is written last, so an index always comes with its pixels
+            write_atomically(
+                index_path,
+                json.dumps({"size": self.size, "regions": self.regions}).encode()
+            )
+        except OSError:
+            # a read-only checkout still works, it just decodes the PNGs every time
+            pass
+
+    def _source_surface(self) -> pygame.Surface:
+        """The atlas in the display's format if possible, converted once.
+        """
+        if self._display_surface is None and pygame.display.get_surface() is not None:
+            self._display_surface = self.surface.convert_alpha()
+            # subsurfaces handed out before the display existed stay valid
+            self._subsurfaces.clear()
+        if self._display_surface is None:
+            return self.surface
+        return self._display_surface
+
+    def get(self, name: str) -> pygame.Surface:
+        """Returns the image called `name`, e.g. "Dino/DinoRun1.png".
+
+        Parameters
+        ----------
+        name : str
+            Path of the image, relative to `images_dirpath`.
+
+        Returns
+        -------
+        pygame.Surface
+            Subsurface of the atlas holding that image.
+        """
+        source = self._source_surface()
+        subsurface = self._subsurfaces.get(name)
+        if subsurface is None:
+            subsurface = source.subsurface(self.regions[name])
+            self._subsurfaces[name] = subsurface
+        return subsurface
+
+_ATLASES: Dict[str, SpriteAtlas] = {}
+
+def get_atlas(images_dirpath: str = IMAGES_DIRPATH) -> SpriteAtlas:
+    """Returns the (shared) atlas for `images_dirpath`, building it on first use.
+
+    Parameters
+    ----------
+    images_dirpath : str, optional
+        Folder holding the images, by default the one next to this file.
+
+    Returns
+    -------
+    SpriteAtlas
+        The atlas.
+    """
+    atlas = _ATLASES.get(images_dirpath)
+    if atlas is None:
+        atlas = SpriteAtlas(images_dirpath)
+        _ATLASES[images_dirpath] = atlas
+    return atlas
@@ -0,0 +1,242 @@
+# background.py
+
+# standard library dependencies
+import math
+import random
+from functools import lru_cache
+from typing import List, Sequence, Union
+
+# external dependencies
+import pygame
+
+BACKGROUND_COLOR = (255, 255, 255)
+HILLS_COLOR = (200, 200, 200)
+
+# every layer is one opaque blit of its band, so the cost of drawing
+# the background grows with the rows the layers cover (it isn't flat in
+# the number of layers); the count is kept small
+MAX_LAYERS = 4
+
+# layers other than the ground, as fractions of `game_speed`
+CLOUDS_SPEED_FACTOR = 0.2
+HILLS_SPEED_FACTOR = 0.4
+
+@lru_cache(maxsize=None)
+def ground_tile(bg_image: pygame.Surface) -> pygame.Surface:
+    """Returns the visible part of the track image (without the
+    transparent border it's padded with), so that copies side by side
+    join up without a gap.
+    """
+    return bg_image.subsurface(bg_image.get_bounding_rect())
+
+@lru_cache(maxsize=None)
+def clouds_tile( cloud_image: pygame.Surface,
+                 width: int = 2200,
+                 height: int = 50,
+                 count: int = 3,
+                 seed: int = 0) -> pygame.Surface:
+    """Returns a transparent tile with `count` clouds at random
+    (seeded) places; clouds crossing its right edge continue on its
+    left edge, so that the tile repeats seamlessly.
+    """
+    cloud = cloud_image.subsurface(cloud_image.get_bounding_rect())
+    tile = pygame.Surface((width, height), pygame.SRCALPHA)
+    rng = random.Random(seed)
+    slot_width = width // count
+    for i in range(count):
+        # one cloud per slot, so they don't pile up
+        x = i * slot_width + rng.randrange(slot_width)
+        y = rng.randrange(height - cloud.get_height() + 1)
+        tile.blit(cloud, (x, y))
+        tile.blit(cloud, (x - width, y))
+    return tile
+
+@lru_cache(maxsize=None)
+def hills_tile( width: int = 1600,
+                height: int = 40,
+                step: int = 100,
+                seed: int = 0) -> pygame.Surface:
+    """Returns a transparent tile with the outline of a range of
+    hills, which starts and ends at the same height.
+
+    Only the outline is drawn, like the rest of the line art: the
+    sprites have white edges that would show over a filled shape.
+    """
+    rng = random.Random(seed)
+    heights = [rng.randint(height // 4, height - 2) for _ in range(width // step)]
+    points = [(i * step, height - h) for i, h in enumerate(heights)]
+    points.append((width, height - heights[0]))
+    tile = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.lines(tile, HILLS_COLOR, False, points, 2)
+    return tile
+
+@lru_cache(maxsize=None)
+def strip_of(tile: pygame.Surface, screen_width: int) -> pygame.Surface:
+    """Returns `tile` repeated over one period plus a screen width on
+    an opaque background, so that any `screen_width` window of the
+    scrolling tile is one rectangle of the strip.
+
+    Strips are built once per tile and kept; they're converted to the
+    display's format when there's a display.
+    """
+    period, height = tile.get_size()
+    strip = pygame.Surface((period + screen_width, height))
+    strip.fill(BACKGROUND_COLOR)
+    for x in range(0, period + screen_width, period):
+        strip.blit(tile, (x, 0))
+    if pygame.display.get_surface() is not None:
+        strip = strip.convert()
+    return strip
+
+class Layer:
+    """A horizontal band of the background that scrolls left at
+    `speed_factor` times the game speed, repeating `tile` forever.
+
+    Layers are opaque: each frame, the whole band is copied from a
+    pre-composited strip (see `strip_of`) in a single blit.
+    """
+    def __init__(   self,
+                    tile: pygame.Surface,
+                    y: int,
+                    speed_factor: float = 1.0,
+                    x: float = 0):
+        """
+        Parameters
+        ----------
+        tile : pygame.Surface
+            Image repeated along the band; its width is the layer's period.
+        y : int
+            y-position of the band.
+        speed_factor : float, optional
+            Scrolling speed as a fraction of the game speed, by default 1.0 (the ground).
+        x : float, optional
+            Starting x-position of the tile, by default 0.
+        """
+        self.tile = tile
+        self.y = y
+        self.speed_factor = speed_factor
+        self.period = tile.get_width()
+        self.initial_x = x
+        self.x = x
+
+    def reset(self, x: Union[float, None] = None):
+        """Puts the layer back to `x`, by default its starting position.
+        """
+        self.x = self.initial_x if x is None else x
+
+    def update(self, game_speed: int):
+        """Scrolls the layer, keeping `x` within one period.
+        """
+        self.x -= game_speed * self.speed_factor
+        if self.x <= -self.period:
+            self.x += self.period
+
+    def draw_rect(self, screen_width: int) -> pygame.Rect:
+        """Returns the band covered by `draw`.
+        """
+        return pygame.Rect(0, self.y, screen_width, self.tile.get_height())
+
+    def strip_x(self, offset: float = 0) -> int:
+        """Returns the x-position in the layer's strip (see `strip_of`)
+        of the left edge of the screen, shifted by `offset`.
+        """
+        return math.floor(-(self.x + offset)) % self.period
+
+    def draw(   self,
+                screen: pygame.Surface,
+                offset: float = 0) -> pygame.Rect:
+        """Draws the band on the screen.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            Game screen.
+        offset : float, optional
+            Shift from the layer's position, used when drawing between
+            two ticks; by default 0.
+
+        Returns
+        -------
+        pygame.Rect
+            Area covered by the band.
+        """
+        screen_width = screen.get_width()
+        strip = strip_of(self.tile, screen_width)
+        rect = self.draw_rect(screen_width)
+        screen.blit(strip, rect, (self.strip_x(offset), 0, screen_width, rect.height))
+        return rect
+
+    def interpolation_offset(   self,
+                                previous_x: float,
+                                alpha: float) -> float:
+        """Returns the shift from `x` to `alpha` of the way from
+        `previous_x` to `x`, going the short way around the period
+        (`x` jumps by a period when it wraps around).
+        """
+        dx = (previous_x - self.x) % self.period
+        if dx > self.period / 2:
+            dx -= self.period
+        return dx * (1 - alpha)
+
+class ParallaxBackground:
+    """Layers of the background, drawn back to front.
+
+    Every layer is a separate band of the screen, copied in one blit,
+    so the background costs one blit per layer whatever is on it.
+    """
+    def __init__(self, layers: Sequence[Layer]):
+        """
+        Parameters
+        ----------
+        layers : Sequence[Layer]
+            Layers from the farthest to the nearest, at most `MAX_LAYERS`.
+        """
+        if len(layers) > MAX_LAYERS:
+            raise ValueError(f"at most {MAX_LAYERS} layers are supported, got {len(layers)}")
+        self.layers = list(layers)
+
+    def reset(self):
+        for layer in self.layers:
+            layer.reset()
+
+    def update(self, game_speed: int):
+        for layer in self.layers:
+            layer.update(game_speed)
+
+    def positions(self) -> List[float]:
+        """Returns the x-position of every layer.
+        """
+        return [layer.x for layer in self.layers]
+
+    def draw_rects(self, screen_width: int) -> List[pygame.Rect]:
+        """Returns the bands covered by `draw`.
+        """
+        return [layer.draw_rect(screen_width) for layer in self.layers]
+
+    def draw(   self,
+                screen: pygame.Surface,
+                previous: Union[List[float], None] = None,
+                alpha: float = 1.0) -> List[pygame.Rect]:
+        """Draws every layer on the screen.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            Game screen.
+        previous : List[float], optional
+            Layer positions before the last tick (see `positions`); if
+            given, layers are drawn `alpha` of the way from those.
+        alpha : float, optional
+            How far past the previous tick to draw, by default 1.0 (the current tick).
+
+        Returns
+        -------
+        List[pygame.Rect]
+            Bands drawn on.
+        """
+        if previous is None or alpha >= 1.0:
+            return [layer.draw(screen) for layer in self.layers]
+        return [
+            layer.draw(screen, layer.interpolation_offset(previous_x, alpha))
+            for layer, previous_x in zip(self.layers, previous)
+        ]
@@ -0,0 +1,511 @@
+# batch_game_state.py
+
+# standard library dependencies
+import random
+from typing import Sequence, Union
+
+# external dependencies
+import numpy as np
+
+# local dependencies
+from .background import ground_tile
+from .dino_avatar import (
+    RUNNING,
+    DUCKING,
+    JUMPING,
+    X_POSITION,
+    Y_POSITION,
+    Y_POSITION_WHEN_DUCKING,
+    JUMP_VELOCITY,
+    TICKS_PER_IMAGE,
+    jump_arc
+)
+from .game_state import (
+    NOOP,
+    JUMP,
+    DUCK,
+    MAX_GAME_SPEED,
+    SCREEN_WIDTH,
+    SWEEP_SPEED,
+    collision_sweep,
+    update_score_and_game_speed
+)
+from .spawn_scheduler import SpawnScheduler, BIRD
+from .sprites import Sprites, mask_of, swept_mask
+
+# marks an empty obstacle slot (other kinds come from `spawn_scheduler`)
+NO_OBSTACLE = -1
+
+# same constants as `DinoAvatar` and the obstacle classes
+DINO_X = X_POSITION
+DINO_Y = Y_POSITION
+DINO_Y_WHEN_DUCKING = Y_POSITION_WHEN_DUCKING
+
+class DinoBatch:
+    """State and physics of `n` dinos stored as NumPy arrays (one
+    entry per dino): `DinoAvatar.update` for all of them in a few
+    vectorized operations.
+    """
+    def __init__(self, sprites: Sprites, n: int):
+        """
+        Parameters
+        ----------
+        sprites : Sprites
+            Images used by the game (only the dino's sizes and masks are used).
+        n : int
+            Number of dinos.
+        """
+        self.n = n
+        # collision masks, indexed by [pose][image]
+        self.dino_masks = [
+            [mask_of(image) for image in images]
+            for images in (
+                sprites.running_images,
+                sprites.ducking_images,
+                sprites.jumping_images
+            )
+        ]
+        # dino image sizes, indexed by [pose, image]
+        self.dino_sizes = np.zeros((3, max(map(len, self.dino_masks)), 2), dtype=np.int64)
+        for pose, masks in enumerate(self.dino_masks):
+            for image, mask in enumerate(masks):
+                self.dino_sizes[pose, image] = mask.get_size()
+        self.dino_image_counts = np.array([len(masks) for masks in self.dino_masks])
+        # the jump, indexed by tick (see `jump_arc`), shared with `DinoAvatar`
+        offsets, velocities = jump_arc()
+        self.jump_offsets = np.array(offsets, dtype=np.int64)
+        self.jump_velocities = np.array(velocities, dtype=np.float64)
+
+        self.dino_y = np.empty(n, dtype=np.int64)
+        self.jump_velocity = np.empty(n, dtype=np.float64)
+        self.jump_tick = np.empty(n, dtype=np.int64)
+        self.jump_start_y = np.empty(n, dtype=np.int64)
+        self.is_running = np.empty(n, dtype=bool)
+        self.is_ducking = np.empty(n, dtype=bool)
+        self.is_jumping = np.empty(n, dtype=bool)
+        self.step_index = np.empty(n, dtype=np.int64)
+        self.pose = np.empty(n, dtype=np.int8)
+
+    def reset_dinos(self, mask: Union[np.ndarray, slice]):
+        """Vectorized `DinoAvatar.reset` for the dinos in `mask`.
+        """
+        self.dino_y[mask] = DINO_Y
+        self.jump_velocity[mask] = JUMP_VELOCITY
+        self.jump_tick[mask] = 0
+        self.jump_start_y[mask] = DINO_Y
+        self.is_running[mask] = True
+        self.is_ducking[mask] = False
+        self.is_jumping[mask] = False
+        self.step_index[mask] = 0
+        self.pose[mask] = RUNNING
+
+    def dino_images(self) -> np.ndarray:
+        """Returns the index of every dino's current image in its pose's images.
+        """
+        return (self.step_index // TICKS_PER_IMAGE) % self.dino_image_counts[self.pose]
+
+    def _jump(self, mask: np.ndarray):
+        """Vectorized `DinoAvatar.jump` for the dinos in `mask`.
+        """
+        self.step_index[mask] += 1
+        self.pose[mask] = JUMPING
+        airborne = mask & self.is_jumping
+        self.jump_tick[airborne] += 1
+        landed = airborne & (self.jump_tick >= len(self.jump_offsets))
+        flying = airborne & ~landed
+        tick = self.jump_tick[flying]
+        self.dino_y[flying] = self.jump_start_y[flying] + self.jump_offsets[tick]
+        self.jump_velocity[flying] = self.jump_velocities[tick]
+
+        self.is_jumping[landed] = False
+        self.jump_velocity[landed] = JUMP_VELOCITY
+        self.dino_y[landed] = DINO_Y
+
+    def _duck(self, mask: np.ndarray):
+        """Vectorized `DinoAvatar.duck` for the dinos in `mask`.
+        """
+        self.step_index[mask] += 1
+        self.pose[mask] = DUCKING
+        self.dino_y[mask] = DINO_Y_WHEN_DUCKING
+        self.is_ducking[mask] = True
+
+    def _run(self, mask: np.ndarray):
+        """Vectorized `DinoAvatar.run` for the dinos in `mask`.
+        """
+        self.step_index[mask] += 1
+        self.pose[mask] = RUNNING
+        self.dino_y[mask] = DINO_Y
+        self.is_running[mask] = True
+
+    def _update_dinos(self, actions: np.ndarray, live: np.ndarray):
+        """Vectorized `DinoAvatar.update`; every branch of the
+        scalar version becomes a mask over the batch.
+        """
+        up = live & (actions == JUMP)
+        down = live & (actions == DUCK)
+
+        self._duck(live & self.is_ducking)
+        self._run(live & self.is_running)
+        self._jump(live & self.is_jumping)
+
+        start_jump = up & ~self.is_jumping
+        start_duck = down & ~self.is_jumping & ~start_jump
+        start_run = live & ~(self.is_jumping | down) & ~start_jump
+
+        self.is_ducking[start_jump] = False
+        self.is_running[start_jump] = False
+        self.is_jumping[start_jump] = True
+        self.jump_tick[start_jump] = 0
+        self.jump_start_y[start_jump] = self.dino_y[start_jump]
+        self._jump(start_jump)
+
+        self.is_running[start_duck] = False
+        self.is_jumping[start_duck] = False
+        self._duck(start_duck)
+
+        self.is_ducking[start_run] = False
+        self.is_running[start_run] = True
+        self.is_jumping[start_run] = False
+
+class BatchGameState(DinoBatch):
+    """Runs `n` independent games in lockstep, with the state of
+    every game stored as NumPy arrays (one entry per game).
+
+    Each tick is the same as `GameState.step`, but the dino physics,
+    obstacle scrolling and collision checks are each a single
+    vectorized operation over the whole batch (only the pixel tests of
+    the few games whose dino and obstacle rects overlap run one game
+    at a time). Each game has `max_obstacles` obstacle slots; spawns
+    (drawn by one `SpawnScheduler` per game) fill free slots, and
+    obstacles that leave the screen free theirs. Given the same seeds,
+    every game plays out exactly like a `GameState` with that seed.
+    The cloud is left out since it has no
+    effect on the game.
+    """
+    # features written by `observe`, in this order
+    OBSERVATION_FEATURES = (
+        "dino_y",
+        "jump_velocity",
+        "is_jumping",
+        "is_ducking",
+        "obstacle_distance",
+        "obstacle_y",
+        "obstacle_width",
+        "obstacle_height",
+        "obstacle_kind",
+        "game_speed",
+    )
+    OBSERVATION_SIZE = len(OBSERVATION_FEATURES)
+
+    def __init__(   self,
+                    sprites: Sprites,
+                    n: int,
+                    seeds: Union[Sequence[int], None] = None,
+                    screen_width: int = SCREEN_WIDTH,
+                    game_speed: int = 15,
+                    x_pos_bg: int = 0,
+                    gap_scale: float = 1.0,
+                    max_obstacles: Union[int, None] = None):
+        """
+        Parameters
+        ----------
+        sprites : Sprites
+            Images used by the game (only their sizes and masks are used).
+        n : int
+            Number of games.
+        seeds : Sequence[int], optional
+            One seed per game, by default `range(n)`.
+        screen_width : int, optional
+            Width of the game screen, by default 1100.
+        game_speed : int, optional
+            Starting value for game speed, by default 15.
+        x_pos_bg : int, optional
+            Starting value for the x-position of the background image, by default 0.
+        gap_scale : float, optional
+            Multiplies the minimum gap between obstacles (see `SpawnScheduler`), by default 1.0.
+        max_obstacles : int, optional
+            Most obstacles alive at once in a game, by default as many as
+            the spawn scheduler can put on the screen at once (see
+            `SpawnScheduler.max_obstacles`; 4 with the default gaps).
+        """
+        if seeds is None:
+            seeds = range(n)
+        if len(seeds) != n:
+            raise ValueError(f"expected {n} seeds, got {len(seeds)}")
+        super().__init__(sprites, n)
+        self.screen_width = screen_width
+        self.initial_game_speed = game_speed
+        self.initial_x_pos_bg = x_pos_bg
+        # period of the track (see `Layer.update`)
+        self.bg_width = ground_tile(sprites.bg_image).get_width()
+        self.rngs = [random.Random(seed) for seed in seeds]
+        self.spawn_schedulers = [SpawnScheduler(sprites, rng, gap_scale) for rng in self.rngs]
+        if max_obstacles is None:
+            # the game speed never drops below its starting value
+            max_obstacles = SpawnScheduler(sprites, None, gap_scale).max_obstacles(
+                screen_width,
+                game_speed
+            )
+        self.max_obstacles = max_obstacles
+        # next spawn of every game, and its tick as an array
+        self.next_spawns = [None] * n
+        self.next_spawn_tick = np.empty(n, dtype=np.int64)
+
+        # obstacle image sizes, indexed by [kind, variant]
+        max_variants = max(len(sprites.small_cactus_images), len(sprites.large_cactus_images))
+        self.obstacle_sizes = np.zeros((3, max_variants, 2), dtype=np.int64)
+        for kind, images in enumerate((
+                sprites.small_cactus_images,
+                sprites.large_cactus_images,
+                # a bird keeps the rect of its first image
+                sprites.bird_images[:1])):
+            for variant, image in enumerate(images):
+                self.obstacle_sizes[kind, variant] = image.get_size()
+
+        # collision masks, indexed by [kind][variant] (by [BIRD][image] for birds)
+        self.obstacle_masks = [
+            [mask_of(image) for image in images]
+            for images in (
+                sprites.small_cactus_images,
+                sprites.large_cactus_images,
+                sprites.bird_images
+            )
+        ]
+        # obstacle state, one row of `max_obstacles` slots per game
+        # (slots aren't ordered by x)
+        shape = (n, max_obstacles)
+        self.obstacle_kind = np.empty(shape, dtype=np.int8)
+        self.obstacle_variant = np.empty(shape, dtype=np.int8)
+        self.obstacle_x = np.empty(shape, dtype=np.int64)
+        self.obstacle_y = np.empty(shape, dtype=np.int64)
+        self.obstacle_width = np.empty(shape, dtype=np.int64)
+        self.obstacle_height = np.empty(shape, dtype=np.int64)
+        self.bird_image_index = np.empty(shape, dtype=np.int64)
+
+        # game state
+        self.x_pos_bg = np.empty(n, dtype=np.int64)
+        self.score = np.empty(n, dtype=np.int64)
+        self.game_speed = np.empty(n, dtype=np.int64)
+        self.game_over = np.empty(n, dtype=bool)
+        self.ticks = np.empty(n, dtype=np.int64)
+
+        self.reset()
+
+    def reset(self, mask: Union[np.ndarray, None] = None):
+        """Puts games back to their starting state; their random
+        number generators keep going, like `GameState.reset`.
+
+        Parameters
+        ----------
+        mask : np.ndarray, optional
+            Boolean mask (or indices) of the games to reset, by default all of them.
+        """
+        if mask is None:
+            mask = slice(None)
+        initial_score, initial_game_speed = update_score_and_game_speed(
+            -1,
+            self.initial_game_speed
+        )
+        self.reset_dinos(mask)
+
+        self.obstacle_kind[mask] = NO_OBSTACLE
+        self.obstacle_variant[mask] = 0
+        self.obstacle_x[mask] = 0
+        self.obstacle_y[mask] = 0
+        self.obstacle_width[mask] = 0
+        self.obstacle_height[mask] = 0
+        self.bird_image_index[mask] = 0
+
+        self.x_pos_bg[mask] = self.initial_x_pos_bg
+        self.score[mask] = initial_score
+        self.game_speed[mask] = initial_game_speed
+        self.game_over[mask] = False
+        self.ticks[mask] = 0
+        for i in np.arange(self.n)[mask]:
+            self.next_spawns[i] = self.spawn_schedulers[i].first_event()
+            self.next_spawn_tick[i] = self.next_spawns[i].tick
+
+    def _spawn_obstacles(self, mask: np.ndarray):
+        """Same as `GameState.spawn_obstacle` for the games in `mask`,
+        whose next spawn is due; only those go through this Python loop.
+        """
+        for i in np.flatnonzero(mask):
+            event = self.next_spawns[i]
+            free = np.flatnonzero(self.obstacle_kind[i] == NO_OBSTACLE)
+            if len(free) == 0:
+                raise RuntimeError(
+                    f"game {i} has more than {self.max_obstacles} obstacles; "
+                    "increase max_obstacles"
+                )
+            slot = free[0]
+            width, height = self.obstacle_sizes[event.kind, event.variant]
+            self.obstacle_kind[i, slot] = event.kind
+            self.obstacle_variant[i, slot] = event.variant
+            self.obstacle_x[i, slot] = self.screen_width
+            self.obstacle_y[i, slot] = event.y
+            self.obstacle_width[i, slot] = width
+            self.obstacle_height[i, slot] = height
+            self.bird_image_index[i, slot] = 0
+            self.next_spawns[i] = self.spawn_schedulers[i].next_event(
+                event,
+                int(self.game_speed[i])
+            )
+            self.next_spawn_tick[i] = self.next_spawns[i].tick
+
+    def collides(self, dino_dy: Union[np.ndarray, None] = None) -> np.ndarray:
+        """Vectorized `DinoAvatar.collides_with`: the rects of every dino
+        and all of its game's obstacles are compared at once, then the
+        masks are compared for the pairs where those overlap.
+
+        Like in `GameState.step`, the obstacles of games faster than
+        `SWEEP_SPEED` are swept over their motion since the last tick.
+
+        Parameters
+        ----------
+        dino_dy : np.ndarray, optional
+            How far up every dino jumped during the last tick, by default 0.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array, True where the dino touches one of its obstacles.
+        """
+        dino_image = self.dino_images()
+        dino_size = self.dino_sizes[self.pose, dino_image]
+        dino_y = self.dino_y[:, None]
+        # swept obstacles cover their path back to their previous position
+        swept = self.game_speed > SWEEP_SPEED
+        sweep_x = np.where(swept, self.game_speed, 0)[:, None]
+        sweep_y = np.zeros((self.n, 1), dtype=np.int64) if dino_dy is None \
+            else np.where(swept, dino_dy, 0)[:, None]
+        overlapping = (self.obstacle_kind != NO_OBSTACLE) \
+            & (self.obstacle_x < DINO_X + dino_size[:, 0, None]) \
+            & (DINO_X < self.obstacle_x + self.obstacle_width + sweep_x) \
+            & (self.obstacle_y + np.minimum(0, -sweep_y) < dino_y + dino_size[:, 1, None]) \
+            & (dino_y < self.obstacle_y + self.obstacle_height + np.maximum(0, -sweep_y))
+        collided = np.zeros(self.n, dtype=bool)
+        for i, slot in zip(*np.nonzero(overlapping)):
+            if collided[i]:
+                continue
+            kind = self.obstacle_kind[i, slot]
+            if kind == BIRD:
+                obstacle_mask = self.obstacle_masks[BIRD][
+                    (self.bird_image_index[i, slot] // 5) % len(self.obstacle_masks[BIRD])
+                ]
+            else:
+                obstacle_mask = self.obstacle_masks[kind][self.obstacle_variant[i, slot]]
+            dino_mask = self.dino_masks[self.pose[i]][dino_image[i]]
+            offset = (
+                int(self.obstacle_x[i, slot]) - DINO_X,
+                int(self.obstacle_y[i, slot] - self.dino_y[i])
+            )
+            if swept[i]:
+                obstacle_mask, left, top = swept_mask(
+                    obstacle_mask,
+                    *collision_sweep(int(self.game_speed[i]), int(sweep_y[i, 0]))
+                )
+                offset = (offset[0] + left, offset[1] + top)
+            collided[i] = dino_mask.overlap(obstacle_mask, offset) is not None
+        return collided
+
+    def nearest_obstacles(self) -> np.ndarray:
+        """Vectorized `GameState.nearest_obstacle`.
+
+        Returns
+        -------
+        np.ndarray
+            Slot of the nearest obstacle of every game, or -1 if there is none.
+        """
+        ahead = (self.obstacle_kind != NO_OBSTACLE) \
+            & (self.obstacle_x + self.obstacle_width > DINO_X)
+        slots = np.argmin(np.where(ahead, self.obstacle_x, np.iinfo(np.int64).max), axis=1)
+        return np.where(ahead.any(axis=1), slots, -1)
+
+    def observe(self, out: Union[np.ndarray, None] = None) -> np.ndarray:
+        """Writes one row of `OBSERVATION_FEATURES` per game into `out`;
+        the obstacle features describe the nearest obstacle the dino
+        hasn't passed yet (see `nearest_obstacles`).
+
+        Games without such an obstacle see one a full screen width away.
+
+        Parameters
+        ----------
+        out : np.ndarray, optional
+            Array of shape (n, OBSERVATION_SIZE) to fill, by default a new float32 array.
+
+        Returns
+        -------
+        np.ndarray
+            `out`.
+        """
+        if out is None:
+            out = np.empty((self.n, self.OBSERVATION_SIZE), dtype=np.float32)
+        slots = self.nearest_obstacles()
+        has_obstacle = slots >= 0
+        games = np.arange(self.n)
+        slots = np.maximum(slots, 0)
+        out[:, 0] = self.dino_y
+        out[:, 1] = self.jump_velocity
+        out[:, 2] = self.is_jumping
+        out[:, 3] = self.is_ducking
+        out[:, 4] = np.where(
+            has_obstacle,
+            self.obstacle_x[games, slots] - DINO_X,
+            self.screen_width
+        )
+        out[:, 5] = self.obstacle_y[games, slots] * has_obstacle
+        out[:, 6] = self.obstacle_width[games, slots] * has_obstacle
+        out[:, 7] = self.obstacle_height[games, slots] * has_obstacle
+        out[:, 8] = np.where(has_obstacle, self.obstacle_kind[games, slots], NO_OBSTACLE)
+        out[:, 9] = self.game_speed
+        return out
+
+    def step(self, actions: Union[np.ndarray, int] = NOOP) -> np.ndarray:
+        """Advances every game that isn't over by one tick.
+
+        Parameters
+        ----------
+        actions : Union[np.ndarray, int], optional
+            One action (`NOOP`, `JUMP` or `DUCK`) per game, or one
+            action for all of them, by default `NOOP`.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array, True for the games that are over.
+        """
+        actions = np.broadcast_to(actions, (self.n,))
+        live = ~self.game_over
+        self.ticks[live] += 1
+
+        previous_y = self.dino_y.copy()
+        was_jumping = self.is_jumping.copy()
+        self._update_dinos(actions, live)
+        dino_dy = np.where(was_jumping | self.is_jumping, previous_y - self.dino_y, 0)
+
+        self._spawn_obstacles(live & (self.ticks >= self.next_spawn_tick))
+
+        # `GameElement.update` for every obstacle at once
+        moving = live[:, None] & (self.obstacle_kind != NO_OBSTACLE)
+        self.obstacle_x -= np.where(moving, self.game_speed[:, None], 0)
+        self.bird_image_index[moving & (self.obstacle_kind == BIRD)] += 1
+
+        # completely off-screen obstacles are removed, and can't collide
+        off_screen = moving & (self.obstacle_x < -self.obstacle_width)
+        self.obstacle_kind[off_screen] = NO_OBSTACLE
+
+        collided = live & self.collides(dino_dy)
+        self.game_over |= collided
+
+        # the track's `Layer.update` and `update_score_and_game_speed`
+        scoring = live & ~collided
+        x_pos_bg = self.x_pos_bg[scoring] - self.game_speed[scoring]
+        self.x_pos_bg[scoring] = np.where(
+            x_pos_bg <= -self.bg_width,
+            x_pos_bg + self.bg_width,
+            x_pos_bg
+        )
+        self.score[scoring] += 1
+        self.game_speed[scoring] += (self.score[scoring] % 100 == 0)
+        np.minimum(self.game_speed, MAX_GAME_SPEED, out=self.game_speed)
+        return self.game_over
@@ -0,0 +1,142 @@
+# chaos.py
+
+# standard library dependencies
+from typing import Dict, Iterable, List, Tuple, Union
+
+# external dependencies
+import pygame
+
+# local dependencies
+from .background import Layer, ParallaxBackground, strip_of
+from .sprites import Sprites, flipped
+
+class MirrorView:
+    """Draws a game mirrored left to right (the world scrolls the other
+    way) and/or upside down (the dino runs on the ceiling, cacti hang
+    from it), for chaos mode.
+
+    Only the drawing is mirrored: the game itself doesn't change, so
+    chaos games collide, record and replay like any other. Every image
+    (and every background strip) is flipped once, when the view is
+    built, with the offset that mirrors its position; a frame draws
+    the flipped images at mirrored positions in one `Surface.blits`
+    call.
+    """
+    def __init__(   self,
+                    sprites: Sprites,
+                    background: ParallaxBackground,
+                    screen_size: Tuple[int, int],
+                    flip_x: bool = True,
+                    flip_y: bool = True):
+        """
+        Parameters
+        ----------
+        sprites : Sprites
+            Images used by the game (see `load_sprites`).
+        background : ParallaxBackground
+            Background of the game, whose strips are flipped up front.
+        screen_size : Tuple[int, int]
+            Width and height of the screen the game is drawn on.
+        flip_x : bool, optional
+            Whether to mirror the game left to right, by default True.
+        flip_y : bool, optional
+            Whether to turn the game upside down, by default True.
+        """
+        self.width, self.height = screen_size
+        self.flip_x = flip_x
+        self.flip_y = flip_y
+        # a game position (x, y) of an image is drawn at
+        # (x0 + x_sign * x, y0 + y_sign * y), with x0 and y0 per image
+        self.x_sign = -1 if flip_x else 1
+        self.y_sign = -1 if flip_y else 1
+        # (flipped image, x0, y0) of every image
+        self.placements: Dict[pygame.Surface, Tuple[pygame.Surface, int, int]] = {
+            image: (
+                flipped(image, flip_x, flip_y),
+                self.width - image.get_width() if flip_x else 0,
+                self.height - image.get_height() if flip_y else 0
+            )
+            for images in sprites
+            for image in (images if isinstance(images, list) else [images])
+        }
+        self.strips: Dict[pygame.Surface, pygame.Surface] = {}
+        for layer in background.layers:
+            self.strip_of(layer)
+
+    def strip_of(self, layer: Layer) -> pygame.Surface:
+        """Returns the flipped strip of `layer` (see `strip_of`).
+        """
+        strip = self.strips.get(layer.tile)
+        if strip is None:
+            strip = flipped(strip_of(layer.tile, self.width), self.flip_x, self.flip_y)
+            self.strips[layer.tile] = strip
+        return strip
+
+    def rect(self, rect: pygame.Rect) -> pygame.Rect:
+        """Returns where `rect` of the game is on the mirrored screen.
+        """
+        x, y, width, height = rect
+        if self.flip_x:
+            x = self.width - x - width
+        if self.flip_y:
+            y = self.height - y - height
+        return pygame.Rect(x, y, width, height)
+
+    def draw(   self,
+                screen: pygame.Surface,
+                sprites: Iterable[Tuple[pygame.Surface, Tuple[int, int]]]) -> List[pygame.Rect]:
+        """Draws the sprites' images, mirrored, where the game draws
+        them, in one `Surface.blits` call.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            Game screen.
+        sprites : Iterable[Tuple[pygame.Surface, Tuple[int, int]]]
+            Images (from the sprites) and their positions in the game.
+
+        Returns
+        -------
+        List[pygame.Rect]
+            Areas drawn on.
+        """
+        placements = self.placements
+        x_sign = self.x_sign
+        y_sign = self.y_sign
+        sequence = []
+        for image, (x, y) in sprites:
+            mirrored, x0, y0 = placements[image]
+            sequence.append((mirrored, (x0 + x_sign * x, y0 + y_sign * y)))
+        return screen.blits(sequence)
+
+    def background_rects(self, background: ParallaxBackground) -> List[pygame.Rect]:
+        """Returns the bands covered by `draw_background`.
+        """
+        return [self.rect(rect) for rect in background.draw_rects(self.width)]
+
+    def draw_background(self,
+                        background: ParallaxBackground,
+                        screen: pygame.Surface,
+                        previous: Union[List[float], None] = None,
+                        alpha: float = 1.0) -> List[pygame.Rect]:
+        """Same as `ParallaxBackground.draw`, mirrored.
+
+        Returns
+        -------
+        List[pygame.Rect]
+            Bands drawn on.
+        """
+        rects = []
+        for i, layer in enumerate(background.layers):
+            offset = 0
+            if previous is not None and alpha < 1.0:
+                offset = layer.interpolation_offset(previous[i], alpha)
+            # the strip is flipped too, so the screen's left edge is
+            # the same distance from the end of its period
+            left = layer.strip_x(offset)
+            if self.flip_x:
+                left = layer.period - left
+            rect = self.rect(layer.draw_rect(self.width))
+            screen.blit(self.strip_of(layer), rect, (left, 0, rect.width, rect.height))
+            rects.append(rect)
+        return rects
@@ -1,15 +1,156 @@
 # dino_avatar.py
 
 # standard library dependencies
-from typing import List 
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple
 
 # external dependencies
 import pygame
 
 # local dependencies
 from .game_element import GameElement
+from .sprites import swept_mask
+
+# dino poses (which image list the current image comes from)
+RUNNING = 0
+DUCKING = 1
+JUMPING = 2
+
+# positional parameters
+X_POSITION = 80
+Y_POSITION = 310
+Y_POSITION_WHEN_DUCKING = 340
+
+# jump physics: the dino moves up by `JUMP_SCALE` times its velocity
+# every tick, and the velocity drops by `GRAVITY`, until it's below
+# `-JUMP_VELOCITY`
+JUMP_VELOCITY = 8.5
+GRAVITY = 0.8
+JUMP_SCALE = 4
+
+# ticks each image of an animation is shown for
+TICKS_PER_IMAGE = 5
+
+class Frame(NamedTuple):
+    """One animation frame of the dino: its image and where it's drawn.
+    """
+    image: pygame.Surface
+    # where `image` is drawn; shared by every avatar, so it's never modified
+    rect: pygame.Rect
+
+class JumpArc(NamedTuple):
+    """The whole jump, one entry per tick since it started.
+
+    The dino lands on tick `len(offsets)`.
+    """
+    # y-position relative to where the jump started
+    offsets: Tuple[int, ...]
+    # `jump_velocity` after the tick
+    velocities: Tuple[float, ...]
+
+@lru_cache(maxsize=None)
+def jump_arc() -> JumpArc:
+    """Returns the jump, computed once with the same float physics as
+    the game always had.
+
+    The y-position is moved on a `pygame.Rect`, which rounds every
+    float assignment half away from zero. As long as the dino stays
+    below the top of the screen, that rounding doesn't depend on where
+    the jump starts, so the same offsets serve jumps from the ground
+    and from a duck.
+    """
+    rect = pygame.Rect(0, Y_POSITION, 0, 0)
+    velocity = JUMP_VELOCITY
+    offsets = [0]
+    velocities = [velocity]
+    while True:
+        rect.y -= velocity * JUMP_SCALE
+        velocity -= GRAVITY
+        if velocity < -JUMP_VELOCITY:
+            return JumpArc(tuple(offsets), tuple(velocities))
+        offsets.append(rect.y - Y_POSITION)
+        velocities.append(velocity)
+
+def cycle_of(images: Sequence[pygame.Surface], y: int) -> Tuple[Frame, ...]:
+    """Returns the frames of an animation at height `y`, indexed by
+    `step_index % len(frames)`: each image lasts `TICKS_PER_IMAGE` frames.
+    """
+    return tuple(
+        Frame(image, image.get_rect(topleft = (X_POSITION, y)))
+        for image in images
+        for _ in range(TICKS_PER_IMAGE)
+    )
+
+class DinoAnimation:
+    """Lookup tables of every frame the dino can be in, by pose and
+    animation frame and, for jumps, by tick of the jump.
+    """
+    def __init__(   self,
+                    running_images: Sequence[pygame.Surface],
+                    ducking_images: Sequence[pygame.Surface],
+                    jumping_images: Sequence[pygame.Surface]):
+        self.jumping_images = jumping_images
+        # indexed by [pose][step_index % cycle]
+        self.poses = (
+            cycle_of(running_images, Y_POSITION),
+            cycle_of(ducking_images, Y_POSITION_WHEN_DUCKING),
+            cycle_of(jumping_images, Y_POSITION)
+        )
+        # widest rect of any frame (they all start at `X_POSITION`)
+        self.width = max(frame.rect.width for frames in self.poses for frame in frames)
+        self.jump_arc = jump_arc()
+        self.jumps: Dict[int, Tuple[Tuple[Frame, ...], ...]] = {}
+
+    def jump_frames(self, start_y: int) -> Tuple[Tuple[Frame, ...], ...]:
+        """Returns the frames of a jump starting at `start_y`, indexed by
+        [jump_tick][step_index % cycle]; the last tick is the landing.
+        """
+        frames = self.jumps.get(start_y)
+        if frames is None:
+            frames = tuple(
+                cycle_of(self.jumping_images, start_y + offset)
+                for offset in self.jump_arc.offsets
+            ) + (self.poses[JUMPING],)
+            self.jumps[start_y] = frames
+        return frames
+
+@lru_cache(maxsize=None)
+def animation_of(   running_images: Tuple[pygame.Surface, ...],
+                    ducking_images: Tuple[pygame.Surface, ...],
+                    jumping_images: Tuple[pygame.Surface, ...]) -> DinoAnimation:
+    """Returns the tables for a set of images, built on first use and
+    shared by every `DinoAvatar` drawn with those images.
+    """
+    return DinoAnimation(running_images, ducking_images, jumping_images)
 
 class DinoAvatar(GameElement):
+    """The player's dinosaur.
+
+    Every frame is compiled once into lookup tables (see
+    `DinoAnimation`), shared by every avatar drawn with the same
+    images, so that a tick only does a few index lookups. `rect` comes
+    from those tables too: replace it, don't modify it.
+    """
+    __slots__ = (
+        "debug_mode",
+        "running_images",
+        "ducking_images",
+        "jumping_images",
+        "animation",
+        "jump_frames",
+        "x_position",
+        "y_position",
+        "y_position_when_ducking",
+        "jump_velocity",
+        "jump_tick",
+        "jump_start_y",
+        "is_running",
+        "is_ducking",
+        "is_jumping",
+        "can_jump",
+        "step_index",
+    )
+
     def __init__(   self, 
                     running_images: List[pygame.Surface],
                     ducking_images: List[pygame.Surface],
@@ -23,17 +164,33 @@ class DinoAvatar(GameElement):
 
         self.debug_mode = debug_mode 
 
-        # positional parameters
-        self.rect.x = 80
-        self.rect.y = 310
-        self.x_position = 80
-        self.y_position = 310
-        self.y_position_when_ducking = 340
-        self.jump_velocity = 8.5
-
         self.running_images = running_images
         self.ducking_images = ducking_images
         self.jumping_images = jumping_images
+        self.animation = animation_of(
+            tuple(running_images),
+            tuple(ducking_images),
+            tuple(jumping_images)
+        )
+
+        self.reset()
+
+    def reset(self):
+        """Puts the dinosaur back to its starting state, so that
+        the same instance can be reused for a new game.
+        """
+        self.image, self.rect = self.animation.poses[RUNNING][0]
+
+        # positional parameters
+        self.x_position = X_POSITION
+        self.y_position = Y_POSITION
+        self.y_position_when_ducking = Y_POSITION_WHEN_DUCKING
+        self.jump_velocity = JUMP_VELOCITY
+        # ticks since the current jump started, where it started from
+        # and its frames (see `DinoAnimation.jump_frames`)
+        self.jump_tick = 0
+        self.jump_start_y = Y_POSITION
+        self.jump_frames = self.animation.jump_frames(Y_POSITION)
 
         # some booleans used to record the dinosaur's state
         self.is_running = True
@@ -44,74 +201,63 @@ class DinoAvatar(GameElement):
         # counter used to flip between images
         self.step_index = 0
 
-        # defining points-of-interest for collision detection
-        self.front_point = [self.rect.x + 45, self.rect.y + 5]
-        self.front_point_when_ducking = (self.rect.x + 105, self.rect.y + 40)
-        self.bottom_point = [self.rect.x + 10, self.rect.y + 70]
-        self.tail_point = [self.rect.x, self.rect.y + 50]
-
     def update_step_index(self) -> int:
         self.step_index = self.step_index + 1
         return self.step_index
 
-    def draw(self, screen: pygame.Surface):
+    def draw(self, 
+            screen: pygame.Surface,
+            offset: Tuple[int, int] = (0, 0)):
         screen.blit(
             self.image, 
-            (self.rect.x, self.rect.y)
+            (self.rect.x + offset[0], self.rect.y + offset[1])
         )
-        # displays the collision points; useful for running tests
+        # displays the outline of the collision mask; useful for running tests
         if self.debug_mode:
-            colors = (
-                (0,0,255), # blue = front
-                (255,0,0), # red = when crouching
-                (0,255,0), # green = bottom
-                (0,0,0) # black = tail
-            )
-            points = (self.front_point, self.front_point_when_ducking, self.bottom_point, self.tail_point)
-            for point, color in zip(points, colors):
-                pygame.draw.circle(screen, color, point, 10)
+            x = self.rect.x + offset[0]
+            y = self.rect.y + offset[1]
+            outline = self.mask.outline()
+            if len(outline) > 1:
+                pygame.draw.lines(
+                    screen,
+                    (0,0,255),
+                    True,
+                    [(x + point_x, y + point_y) for point_x, point_y in outline]
+                )
 
     def duck(self):
-        # change `image`
-        self.image = self.ducking_images[(self.update_step_index() // 5) % len(self.ducking_images)]
-        # update rect attribute (which depends on self.image); could make this a property
-        self.rect = self.image.get_rect()
-        # update `rect`
-        self.rect.x = self.x_position
-        self.rect.y = self.y_position_when_ducking
-        # ducking brings the snout further to the right and the head closer to the ground;
-        # make those updates
-        self.front_point_when_ducking = (self.rect.x + 105, 310 + 40)
+        self.step_index += 1
+        frames = self.animation.poses[DUCKING]
+        self.image, self.rect = frames[self.step_index % len(frames)]
         self.is_ducking = True
 
     def run(self):
-        # change `image`
-        self.image = self.running_images[(self.update_step_index() // 5) % len(self.running_images)]
-        self.rect = self.image.get_rect()
-        self.rect.x = self.x_position
-        self.rect.y = self.y_position
-        self.front_point = [self.rect.x + 45, self.rect.y + 5]
+        self.step_index += 1
+        frames = self.animation.poses[RUNNING]
+        self.image, self.rect = frames[self.step_index % len(frames)]
         self.is_running = True
     
     def jump(self):
-        # change `image`
-        self.image = self.jumping_images[(self.update_step_index() // 5) % len(self.jumping_images)]
-        if self.is_jumping:
-            # disable continuous jumping
-            self.can_jump = False
-            self.rect.y -= self.jump_velocity * 4
-            self.front_point[1] -= self.jump_velocity * 4
-            self.bottom_point[1] -= self.jump_velocity * 4
-            self.tail_point[1] -= self.jump_velocity * 4
-            self.jump_velocity -= 0.8
-        if self.jump_velocity < -8.5:
+        self.step_index += 1
+        if not self.is_jumping:
+            # only the image changes
+            frames = self.animation.poses[JUMPING]
+            self.image, rect = frames[self.step_index % len(frames)]
+            self.rect = rect.move(0, self.rect.y - rect.y)
+            return
+        # disable continuous jumping
+        self.can_jump = False
+        self.jump_tick += 1
+        frames = self.jump_frames[self.jump_tick]
+        self.image, self.rect = frames[self.step_index % len(frames)]
+        velocities = self.animation.jump_arc.velocities
+        if self.jump_tick < len(velocities):
+            self.jump_velocity = velocities[self.jump_tick]
+        else:
+            # landed
             self.can_jump = True 
             self.is_jumping = False
-            self.jump_velocity = 8.5
-            self.rect.y = 310
-            self.front_point[1] = self.rect.y + 5
-            self.bottom_point[1] = self.rect.y + 70
-            self.tail_point[1] = self.rect.y + 50
+            self.jump_velocity = JUMP_VELOCITY
         
     def update(self, userInput):
         if self.is_ducking:
@@ -125,6 +271,9 @@ class DinoAvatar(GameElement):
             self.is_ducking = False
             self.is_running = False
             self.is_jumping = True
+            self.jump_tick = 0
+            self.jump_start_y = self.rect.y
+            self.jump_frames = self.animation.jump_frames(self.jump_start_y)
             self.jump()
         elif userInput[pygame.K_DOWN] and not self.is_jumping:
             self.is_ducking = True 
@@ -137,45 +286,48 @@ class DinoAvatar(GameElement):
             self.is_running = True
             self.is_jumping = False
 
-    def collides_with(self, rect: pygame.Rect) -> bool:
-        """Returns a boolean indicating whether the `DinoAvatar`
-        instance's points-of-interest are colliding with 
-        `rect` or not.
+    def collides_with(  self,
+                        obstacle: GameElement,
+                        motion: Tuple[int, int] = (0, 0),
+                        steps: int = 1) -> bool:
+        """Returns a boolean indicating whether any opaque pixel of the
+        `DinoAvatar` instance overlaps an opaque pixel of `obstacle`.
+
+        The bounding rects are compared first; the masks of the two
+        images (see `mask_of`) are only compared when those overlap.
+        With more than one step, the obstacle is tested at `steps`
+        positions along its `motion` since the last tick, in one mask
+        comparison (see `swept_mask`).
 
         Parameters
         ----------
-        rect : pygame.Rect
-            pygame.Rect attribute of any obstacle
+        obstacle : GameElement
+            Any obstacle; its `rect` must contain its image.
+        motion : Tuple[int, int], optional
+            How far the obstacle moved relative to the dino during the
+            last tick, by default (0, 0).
+        steps : int, optional
+            Number of positions tested, by default 1 (only the current one).
 
         Returns
         -------
         bool
             Boolean indicating whether the `DinoAvatar`
-            instance's points-of-interest are colliding with 
-            `rect` or not
+            instance is colliding with `obstacle` or not
         """
-        if self.is_ducking:
-            is_colliding = rect.collidepoint(self.bottom_point) \
-                or rect.collidepoint(self.front_point_when_ducking)
-            # the next if-block was useful in debugging
-            # if is_colliding:
-            #     print("A")
-            #     print(self.front_point_when_ducking)
-            #     print(self.front_point)
-            #     print(dir(rect))
-            return is_colliding
-        elif self.is_jumping:
-            is_colliding = rect.collidepoint(self.bottom_point) \
-                or rect.collidepoint(self.front_point) \
-                or rect.collidepoint(self.tail_point)
-            # the next if-block was useful in debugging
-            # if is_colliding:
-            #     print("B")
-            return is_colliding
-        else:
-            is_colliding = rect.collidepoint(self.front_point)
-            # the next if-block was useful in debugging
-            # if is_colliding:
-            #     print("C")
-            return is_colliding
-
+        rect = self.rect
+        obstacle_rect = obstacle.rect
+        if steps == 1:
+            if not rect.colliderect(obstacle_rect):
+                return False
+            return self.mask.overlap(
+                obstacle.mask,
+                (obstacle_rect.x - rect.x, obstacle_rect.y - rect.y)
+            ) is not None
+        mask, left, top = swept_mask(obstacle.mask, *motion, steps)
+        x = obstacle_rect.x + left
+        y = obstacle_rect.y + top
+        width, height = mask.get_size()
+        if x >= rect.right or rect.x >= x + width or y >= rect.bottom or rect.y >= y + height:
+            return False
+        return self.mask.overlap(mask, (x - rect.x, y - rect.y)) is not None
@@ -1,14 +1,19 @@
 # standard library dependencies
-import os 
-import random
+from typing import Tuple
 
 # external dependencies
 import pygame
 
+# local dependencies
+from .sprites import mask_of
+
 class GameElement:
     """Parent class for obstacles (cactus classes, bird class)
-    and extra game elements (cloud)
     """
+    # every subclass declares its own attributes too, so that
+    # instances have no `__dict__`
+    __slots__ = ("image", "screen_width", "rect")
+
     def __init__(   self, 
                     image: pygame.Surface, 
                     screen_width: int):
@@ -20,69 +25,43 @@ class GameElement:
     def update(self, game_speed: int):
         self.rect.x -= game_speed
 
-    def draw(self, screen: pygame.Surface):
-        screen.blit(
-            self.image, 
-            self.rect
-        )
-
-    def update_and_draw(self,
-                        game_speed: int,
-                        screen: pygame.Surface):
-        self.update(game_speed)
-        self.draw(screen)
-
-class Cloud(GameElement):
-    def __init__(   self, 
-                    screen_width: int,
-                    image: pygame.Surface = None):
-        if image is None:
-            image = pygame.image.load(
-                os.path.join(
-                    os.getcwd(),
-                    "images",
-                    "Other", 
-                    "Cloud.png"
-                )
-            )
-        # NOTE: remind them what this `super()` does and
-        # what `super().__init__` triggers
-        super().__init__(
-            image, 
-            screen_width
-        )
-        self.x = screen_width + random.randint(800, 1000)
-        self.y = random.randint(50, 100)
-        self.width = self.image.get_width()
-
-    def update(self, game_speed: int):
-        """Updates the position of the cloud, 
-        and respawns it if it is 100% off-screen.
-
-        Parameters
-        ----------
-        game_speed : int
-            Current game speed.
-        """
-        self.x -= game_speed
-        if self.x < -self.width:
-            self.respawn()
-
-    def respawn(self):
-        """Resets the cloud's x- and y-positions.
+    @property
+    def mask(self) -> pygame.mask.Mask:
+        """Collision mask of the current image, which is drawn at
+        `rect.topleft`.
         """
-        self.x = self.screen_width + random.randint(2500, 3000)
-        self.y = random.randint(50, 100)
+        return mask_of(self.image)
 
-    def draw(self, screen: pygame.Surface):
-        """Draws the cloud on the screen
+    def draw(self, 
+            screen: pygame.Surface,
+            offset: Tuple[int, int] = (0, 0)):
+        """Draws the element on the screen.
 
         Parameters
         ----------
         screen : pygame.Surface
             Game screen.
+        offset : Tuple[int, int], optional
+            Shift from the element's position, used when drawing
+            between two ticks; by default (0, 0).
         """
         screen.blit(
             self.image, 
-            (self.x, self.y)
-        )
\ No newline at end of file
+            self.rect.move(offset)
+        )
+
+    def draw_rect(self) -> pygame.Rect:
+        """Returns the area of the screen covered by `draw`.
+
+        Returns
+        -------
+        pygame.Rect
+            Area covered by the element's image.
+        """
+        return self.image.get_rect(topleft=self.rect.topleft)
+
+    def update_and_draw(self,
+                        game_speed: int,
+                        screen: pygame.Surface):
+        self.update(game_speed)
+        self.draw(screen)
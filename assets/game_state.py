@@ -0,0 +1,408 @@
+# game_state.py
+
+# standard library dependencies
+import random
+from collections import deque
+from typing import Deque, Dict, Tuple, Union
+
+# external dependencies
+import pygame
+
+# local dependencies
+from .background import (
+    Layer,
+    ParallaxBackground,
+    clouds_tile,
+    ground_tile,
+    hills_tile,
+    CLOUDS_SPEED_FACTOR,
+    HILLS_SPEED_FACTOR
+)
+from .dino_avatar import DinoAvatar
+from .game_element import GameElement
+from .obstacles import SmallCactus, LargeCactus, Bird, ObstaclePool
+from .profiler import DINO_UPDATE, OBSTACLES_UPDATE, BACKGROUND_UPDATE, SCORE_UPDATE
+from .snapshot import GameSnapshot, SnapshotLayout, new_snapshot
+from .spawn_scheduler import SpawnEvent, SpawnScheduler, SMALL_CACTUS, LARGE_CACTUS
+from .sprites import Sprites
+
+# constants
+SCREEN_HEIGHT = 600
+SCREEN_WIDTH = 1100
+
+# `update_score_and_game_speed` never goes faster
+MAX_GAME_SPEED = 40
+
+# above this speed, collisions are tested all along the obstacles' path
+# since the last tick, so that they can't jump over parts of the dino;
+# up to it, only where they are at every tick
+SWEEP_SPEED = 20
+
+# actions accepted by `GameState.step`
+NOOP = 0
+JUMP = 1
+DUCK = 2
+
+# `DinoAvatar.update` reads its input like `pygame.key.get_pressed()`;
+# these mappings stand in for the keyboard in the headless simulation
+ACTION_INPUTS: Dict[int, Dict[int, bool]] = {
+    NOOP: {pygame.K_UP: False, pygame.K_DOWN: False},
+    JUMP: {pygame.K_UP: True, pygame.K_DOWN: False},
+    DUCK: {pygame.K_UP: False, pygame.K_DOWN: True},
+}
+
+def update_score_and_game_speed(points: int,
+                                game_speed: int) -> Tuple[int,int]:
+    """Updates `points` and `game_speed`
+
+    Parameters
+    ----------
+    points : int
+        Current points.
+    game_speed : int
+        Current game speed.
+
+    Returns
+    -------
+    Tuple[int,int]
+        The updated values for points and game speed.
+    """
+    points += 1
+    if points % 100 == 0:
+        game_speed += 1
+    # cap game_speed at 40
+    return points, min(game_speed, MAX_GAME_SPEED)
+
+def collision_sweep(game_speed: int,
+                    dino_dy: int) -> Tuple[int, int, int]:
+    """Returns the motion of the obstacles relative to the dino during
+    a tick, and the number of steps to sweep it in (see
+    `DinoAvatar.collides_with`).
+
+    Up to `SWEEP_SPEED`, obstacles are only tested where they are; above
+    it, they're swept over `game_speed` to the left and the height the
+    dino jumped, about a pixel across or down per step.
+
+    Parameters
+    ----------
+    game_speed : int
+        Current game speed.
+    dino_dy : int
+        How far up the dino jumped during the tick (0 if it didn't jump).
+
+    Returns
+    -------
+    Tuple[int, int, int]
+        Horizontal and vertical motion of the obstacles, and number of steps.
+    """
+    if game_speed <= SWEEP_SPEED:
+        return 0, 0, 1
+    return -game_speed, dino_dy, game_speed + abs(dino_dy)
+
+def action_from_keys(user_input, inverted: bool = False) -> int:
+    """Converts keyboard state (as returned by `pygame.key.get_pressed()`)
+    to an action for `GameState.step`.
+
+    The jump key wins over the duck key, just like UP over DOWN in
+    `DinoAvatar.update`.
+
+    Parameters
+    ----------
+    user_input
+        Keyboard state.
+    inverted : bool, optional
+        If True (chaos mode), DOWN jumps and UP ducks, by default False.
+
+    Returns
+    -------
+    int
+        One of `NOOP`, `JUMP` or `DUCK`.
+    """
+    jump_key, duck_key = (pygame.K_DOWN, pygame.K_UP) if inverted else (pygame.K_UP, pygame.K_DOWN)
+    if user_input[jump_key]:
+        return JUMP
+    if user_input[duck_key]:
+        return DUCK
+    return NOOP
+
+class GameState:
+    """All the game logic, with no display, font or frame cap.
+
+    One call to `step` advances the game by one tick (one frame
+    of the windowed game), so the simulation runs as fast as the
+    CPU allows; `main.py` only draws this state on the screen.
+    """
+    def __init__(   self,
+                    sprites: Sprites,
+                    screen_width: int = SCREEN_WIDTH,
+                    game_speed: int = 15,
+                    x_pos_bg: int = 0,
+                    y_pos_bg: int = 380,
+                    seed: Union[int, None] = None,
+                    gap_scale: float = 1.0):
+        """
+        Parameters
+        ----------
+        sprites : Sprites
+            Images used by the game elements (see `load_sprites`).
+        screen_width : int, optional
+            Width of the game screen, by default 1100.
+        game_speed : int, optional
+            Starting value for game speed, by default 15.
+        x_pos_bg : int, optional
+            Starting value for the x-position of the track, by default 0.
+        y_pos_bg : int, optional
+            y-position of the track image, by default 380.
+        seed : int, optional
+            Seed for the game's own random number generators, by default a random one.
+            Two games with the same seed and the same actions play out identically.
+        gap_scale : float, optional
+            Multiplies the minimum gap between obstacles (see `SpawnScheduler`), by default 1.0.
+        """
+        self.sprites = sprites
+        self.screen_width = screen_width
+        self.initial_game_speed = game_speed
+        self.y_pos_bg = y_pos_bg
+        self.seed = random.getrandbits(32) if seed is None else seed
+        # obstacles and clouds draw from separate generators, so that the
+        # obstacles only depend on the seed (and match `BatchGameState`)
+        self.rng = random.Random(self.seed)
+        self.cloud_rng = random.Random(f"{self.seed}/cloud")
+
+        self.dino_avatar = DinoAvatar(
+            sprites.running_images,
+            sprites.ducking_images,
+            sprites.jumping_images,
+            screen_width
+        )
+        # the track is drawn where the image used to be, minus its padding
+        self.ground = Layer(
+            ground_tile(sprites.bg_image),
+            y_pos_bg + sprites.bg_image.get_bounding_rect().y,
+            x = x_pos_bg
+        )
+        # far to near: hills, clouds, then the track
+        hills = hills_tile()
+        self.clouds = Layer(clouds_tile(sprites.cloud_image), 52, CLOUDS_SPEED_FACTOR)
+        self.background = ParallaxBackground([
+            Layer(hills, self.ground.y - hills.get_height(), HILLS_SPEED_FACTOR),
+            self.clouds,
+            self.ground,
+        ])
+        # ordered by x (they all spawn at the right edge and move together),
+        # so the leftmost one is the first to leave the screen
+        self.obstacles: Deque[GameElement] = deque()
+        # obstacles that leave the game are reused by the next spawns
+        self.obstacle_pool = ObstaclePool(screen_width)
+        self.spawn_scheduler = SpawnScheduler(sprites, self.rng, gap_scale)
+        # `FrameProfiler` timing the phases of `step`, if any
+        self.profiler = None
+        self.snapshot_layout = SnapshotLayout(self)
+        self.reset()
+
+    def reset(self, seed: Union[int, None] = None):
+        """Puts the game back to its starting state, reusing its
+        game elements.
+
+        Parameters
+        ----------
+        seed : int, optional
+            If given, the random number generators start over from this
+            seed; otherwise they keep going from where they were.
+        """
+        if seed is not None:
+            self.seed = seed
+            self.rng.seed(seed)
+            self.cloud_rng.seed(f"{seed}/cloud")
+        # states of the random number generators, saved by the first
+        # `snapshot` after they're used (anything else drawing from them
+        # must set this back to None); `cloud_rng` is only drawn from
+        # here, so its state is kept apart and survives the spawns
+        self.rng_states = None
+        self.cloud_rng_state = None
+        self.dino_avatar.reset()
+        self.background.reset()
+        self.clouds.reset(-self.cloud_rng.randrange(self.clouds.period))
+        for obstacle in self.obstacles:
+            self.obstacle_pool.release(obstacle)
+        self.obstacles.clear()
+        self.next_spawn = self.spawn_scheduler.first_event()
+        # the first score update happens before the first frame
+        self.score, self.game_speed = update_score_and_game_speed(
+            -1,
+            self.initial_game_speed
+        )
+        self.game_over = False
+        # number of calls to `step` since the game started
+        self.ticks = 0
+
+    @property
+    def x_pos_bg(self) -> int:
+        """x-position of the track (the ground layer of `background`).
+        """
+        return self.ground.x
+
+    def spawn_obstacle(self, event: SpawnEvent) -> GameElement:
+        """Adds the obstacle described by `event` at the right end of
+        `obstacles`, reusing one from `obstacle_pool` if possible.
+
+        Parameters
+        ----------
+        event : SpawnEvent
+            Obstacle to add (see `SpawnScheduler`).
+
+        Returns
+        -------
+        GameElement
+            The new obstacle.
+        """
+        if event.kind == SMALL_CACTUS:
+            obstacle = self.obstacle_pool.acquire(
+                SmallCactus,
+                self.sprites.small_cactus_images[event.variant]
+            )
+        elif event.kind == LARGE_CACTUS:
+            obstacle = self.obstacle_pool.acquire(
+                LargeCactus,
+                self.sprites.large_cactus_images[event.variant]
+            )
+        else:
+            obstacle = self.obstacle_pool.acquire(
+                Bird,
+                self.sprites.bird_images
+            )
+        obstacle.rect.y = event.y
+        self.obstacles.append(obstacle)
+        return obstacle
+
+    def update_obstacles(self) -> Deque[GameElement]:
+        """Spawns the obstacle due this tick (if any), moves every
+        obstacle and removes those that left the screen.
+
+        Returns
+        -------
+        Deque[GameElement]
+            `obstacles`.
+        """
+        if self.ticks >= self.next_spawn.tick:
+            self.spawn_obstacle(self.next_spawn)
+            self.next_spawn = self.spawn_scheduler.next_event(
+                self.next_spawn,
+                self.game_speed
+            )
+            self.rng_states = None
+
+        obstacles = self.obstacles
+        for obstacle in obstacles:
+            obstacle.update(self.game_speed)
+
+        # obstacles whose image is completely off-screen are
+        # removed from the left
+        while obstacles and obstacles[0].rect.x < -obstacles[0].rect.width:
+            self.obstacle_pool.release(obstacles.popleft())
+        return obstacles
+
+    def nearest_obstacle(self) -> Union[GameElement, None]:
+        """Returns the leftmost obstacle the dino hasn't passed yet, if any.
+        """
+        dino_left = self.dino_avatar.rect.x
+        for obstacle in self.obstacles:
+            # at most one or two obstacles are behind the dino
+            if obstacle.rect.right > dino_left:
+                return obstacle
+        return None
+
+    def snapshot(self) -> GameSnapshot:
+        """Saves the state of the game, to go back to it with `restore`
+        (e.g. to try several moves from the same state).
+
+        The state is packed into a small fixed-layout record (see
+        `SnapshotLayout`). The random number generators only change
+        when an obstacle spawns, so their states are saved once between
+        two spawns and shared by every snapshot taken in between.
+
+        Returns
+        -------
+        GameSnapshot
+            The saved state.
+        """
+        if self.rng_states is None:
+            if self.cloud_rng_state is None:
+                self.cloud_rng_state = self.cloud_rng.getstate()
+            self.rng_states = (self.rng.getstate(), self.cloud_rng_state)
+        return new_snapshot((self.snapshot_layout.pack(self), self.rng_states))
+
+    def restore(self, snapshot: GameSnapshot):
+        """Puts the game back to the state saved by `snapshot`, reusing
+        its game elements; afterwards, the game plays out exactly like
+        it would have from that state.
+
+        Parameters
+        ----------
+        snapshot : GameSnapshot
+            State saved by `snapshot` on this game.
+        """
+        self.snapshot_layout.unpack(self, snapshot.record)
+        if snapshot.rng_states is not self.rng_states:
+            rng_state, cloud_rng_state = snapshot.rng_states
+            self.rng.setstate(rng_state)
+            # unless a reset happened in between, only `rng` moved on
+            if cloud_rng_state is not self.cloud_rng_state:
+                self.cloud_rng.setstate(cloud_rng_state)
+                self.cloud_rng_state = cloud_rng_state
+            self.rng_states = snapshot.rng_states
+
+    def step(self, action: int = NOOP) -> bool:
+        """Advances the game by one tick.
+
+        Parameters
+        ----------
+        action : int, optional
+            One of `NOOP`, `JUMP` or `DUCK`, by default `NOOP`.
+
+        Returns
+        -------
+        bool
+            Whether the dino collided with an obstacle (game over).
+        """
+        if self.game_over:
+            return True
+        self.ticks += 1
+        profiler = self.profiler
+
+        dino_avatar = self.dino_avatar
+        previous_y = dino_avatar.rect.y
+        was_jumping = dino_avatar.is_jumping
+        dino_avatar.update(ACTION_INPUTS[action])
+        if profiler is not None:
+            profiler.mark(DINO_UPDATE)
+
+        obstacles = self.update_obstacles()
+
+        # obstacles move by `game_speed`, and the dino by its jump
+        # (other changes of height come with a change of pose)
+        dino_dy = previous_y - dino_avatar.rect.y if was_jumping or dino_avatar.is_jumping else 0
+        dx, dy, steps = collision_sweep(self.game_speed, dino_dy)
+        # obstacles are ordered by x, so only the first few can reach the dino
+        dino_right = dino_avatar.rect.right
+        for obstacle in obstacles:
+            if obstacle.rect.x >= dino_right:
+                break
+            if dino_avatar.collides_with(obstacle, (dx, dy), steps):
+                self.game_over = True
+                if profiler is not None:
+                    profiler.mark(OBSTACLES_UPDATE)
+                return True
+        if profiler is not None:
+            profiler.mark(OBSTACLES_UPDATE)
+
+        self.background.update(self.game_speed)
+        if profiler is not None:
+            profiler.mark(BACKGROUND_UPDATE)
+        self.score, self.game_speed = update_score_and_game_speed(
+            self.score,
+            self.game_speed
+        )
+        if profiler is not None:
+            profiler.mark(SCORE_UPDATE)
+        return False
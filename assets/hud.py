@@ -0,0 +1,151 @@
+# hud.py
+
+# standard library dependencies
+from functools import lru_cache
+from typing import Tuple
+
+# external dependencies
+import pygame
+
+TEXT_COLOR = (0, 0, 0)
+DEFAULT_FONT = 'freesansbold.ttf'
+# characters `ScoreHUD` can draw a score with
+GLYPHS = "0123456789-"
+
+@lru_cache(maxsize=None)
+def get_font(name: str = DEFAULT_FONT, size: int = 20) -> pygame.font.Font:
+    """Returns the font `name` at `size`, loading it on first use.
+
+    Parameters
+    ----------
+    name : str, optional
+        Font file, by default 'freesansbold.ttf' (bundled with pygame).
+    size : int, optional
+        Font size, by default 20.
+
+    Returns
+    -------
+    pygame.font.Font
+        The (shared) font.
+    """
+    return pygame.font.Font(name, size)
+
+# bounded, since texts like "Your score: 123" keep changing
+@lru_cache(maxsize=256)
+def render_text(text: str,
+                name: str = DEFAULT_FONT,
+                size: int = 20,
+                color: Tuple[int, int, int] = TEXT_COLOR) -> pygame.Surface:
+    """Renders `text`, or returns the surface from a previous call
+    with the same text, font, size and color.
+
+    Parameters
+    ----------
+    text : str
+        Text to render.
+    name : str, optional
+        Font file, by default 'freesansbold.ttf'.
+    size : int, optional
+        Font size, by default 20.
+    color : Tuple[int, int, int], optional
+        Text color, by default black.
+
+    Returns
+    -------
+    pygame.Surface
+        The rendered text (don't draw on it, it's shared).
+    """
+    return get_font(name, size).render(text, True, color)
+
+class ScoreHUD:
+    """Draws "Points: <score>" without rendering any text per frame.
+
+    The label is rendered once, and the digits 0-9 (and a minus sign)
+    are rendered once into a strip; drawing the score is a single
+    `Surface.blits` call with one area of the strip per character. The
+    blit sequence is only rebuilt when the score changes.
+    """
+    def __init__(   self,
+                    font: pygame.font.Font,
+                    center: Tuple[int, int] = (1000, 40),
+                    label: str = "Points: ",
+                    color: Tuple[int, int, int] = TEXT_COLOR):
+        """
+        Parameters
+        ----------
+        font : pygame.font.Font
+            Font used for the display.
+        center : Tuple[int, int], optional
+            Center of the score on the screen, by default (1000, 40).
+        label : str, optional
+            Text shown before the score, by default "Points: ".
+        color : Tuple[int, int, int], optional
+            Text color, by default black.
+        """
+        self.center = center
+        self.label = font.render(label, True, color)
+        self.height = font.get_height()
+
+        glyphs = [font.render(character, True, color) for character in GLYPHS]
+        self.glyphs = pygame.Surface(
+            (sum(glyph.get_width() for glyph in glyphs), self.height),
+            pygame.SRCALPHA
+        )
+        # areas of `glyphs` holding each character
+        self.glyph_areas = []
+        x = 0
+        for glyph in glyphs:
+            # blending onto the transparent strip with MAX copies the pixels exactly
+            self.glyphs.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.glyph_areas.append(pygame.Rect(x, 0, glyph.get_width(), self.height))
+            x += glyph.get_width()
+        if pygame.display.get_surface() is not None:
+            self.label = self.label.convert_alpha()
+            self.glyphs = self.glyphs.convert_alpha()
+        # lookups by character, so `layout` can walk `str(points)` directly
+        self.glyph_areas = dict(zip(GLYPHS, self.glyph_areas))
+        self.label_width = self.label.get_width()
+
+        # blit sequence and area of the last score drawn
+        self.points = None
+        self.sequence = []
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+    def layout(self, points: int):
+        """Builds the blit sequence and the area of `points`.
+        """
+        areas = [self.glyph_areas[character] for character in str(points)]
+        rect = pygame.Rect(0, 0, self.label_width, self.height)
+        for area in areas:
+            rect.width += area.width
+        rect.center = self.center
+        x = rect.x + self.label_width
+        y = rect.y
+        sequence = [(self.label, rect.topleft)]
+        for area in areas:
+            sequence.append((self.glyphs, (x, y), area))
+            x += area.width
+        self.points = points
+        self.sequence = sequence
+        self.rect = rect
+
+    def draw(self, points: int, screen: pygame.Surface) -> pygame.Rect:
+        """Displays the score (`points`) on the screen.
+
+        Parameters
+        ----------
+        points : int
+            Current points (may be negative).
+        screen : pygame.Surface
+            Game screen.
+
+        Returns
+        -------
+        pygame.Rect
+            Area covered by the score (shared until the score changes,
+            don't modify it).
+        """
+        if points != self.points:
+            self.layout(points)
+        screen.blits(self.sequence, doreturn=False)
+        return self.rect
@@ -0,0 +1,224 @@
+# leaderboard.py
+
+# standard library dependencies
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from typing import List, NamedTuple, Tuple, Union
+
+# runs are indexed by score for top-K queries, and `score_counts`
+# holds how many runs have each score (updated in the same transaction
+# as the runs), so a rank only adds up the counts of the distinct
+# scores above it
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    seed INTEGER,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+"""
+
+INSERT_RUN = "INSERT INTO runs (score, seed, played_at) VALUES (?, ?, ?)"
+ADD_COUNT = """INSERT INTO score_counts (score, count) VALUES (?, ?)
+ON CONFLICT (score) DO UPDATE SET count = count + excluded.count"""
+TOP_RUNS = "SELECT score, seed, played_at FROM runs ORDER BY score DESC, id LIMIT ?"
+RUNS_ABOVE = "SELECT COALESCE(SUM(count), 0) FROM score_counts WHERE score > ?"
+RUN_COUNT = "SELECT COALESCE(SUM(count), 0) FROM score_counts"
+# runs are never deleted, so their ids are consecutive
+LAST_ID = "SELECT COALESCE(MAX(id), 0) FROM runs"
+
+# tells the writer thread to stop
+STOP = None
+
+class Run(NamedTuple):
+    """One game on the leaderboard.
+    """
+    score: int
+    seed: Union[int, None]
+    played_at: float
+
+def connect(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path)
+    # readers don't wait for the writer (and the other way around)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    return connection
+
+class Leaderboard:
+    """Scores of every game played, stored in an SQLite file.
+
+    `submit` only queues a run: a background thread inserts queued
+    runs in batches (one transaction each), so saving a score never
+    waits for the disk. Queries run on the calling thread and count
+    the runs still queued as well as the committed ones. If a batch
+    can't be saved, the next call to `submit`, a query, `flush` or
+    `close` raises the error.
+    """
+    def __init__(   self,
+                    path: str,
+                    batch_size: int = 10_000):
+        """
+        Parameters
+        ----------
+        path : str
+            SQLite file, created if needed.
+        batch_size : int, optional
+            Most runs inserted per transaction, by default 10,000.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = connect(path)
+        self.connection.executescript(SCHEMA)
+        self.queue = queue.Queue()
+        # runs submitted but not committed yet, oldest first, and the id
+        # of the last run committed before them: the writer drops runs
+        # and moves `saved_id` together, after committing them
+        self.pending = deque()
+        self.pending_lock = threading.Lock()
+        self.saved_id = self.connection.execute(LAST_ID).fetchone()[0]
+        # last exception of the writer thread, raised on the next call
+        self.error = None
+        self.writer = threading.Thread(target = self._write, daemon = True)
+        self.writer.start()
+
+    def submit( self,
+                score: int,
+                seed: Union[int, None] = None,
+                played_at: Union[float, None] = None):
+        """Queues a run to be saved, without waiting for it.
+
+        Parameters
+        ----------
+        score : int
+            Final score of the game.
+        seed : int, optional
+            Seed of the game, by default None.
+        played_at : float, optional
+            When the game ended (seconds since the epoch), by default now.
+        """
+        self.raise_error()
+        if played_at is None:
+            played_at = time.time()
+        run = (score, seed, played_at)
+        with self.pending_lock:
+            self.pending.append(run)
+            self.queue.put_nowait(run)
+
+    def raise_error(self):
+        """Raises (once) the error the writer thread ran into, if any;
+        the runs of the batch it failed on are lost.
+        """
+        with self.pending_lock:
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def flush(self):
+        """Waits until every run submitted so far is saved.
+        """
+        self.queue.join()
+        self.raise_error()
+
+    def close(self):
+        """Saves the runs still queued and closes the file.
+        """
+        self.queue.put(STOP)
+        self.writer.join()
+        self.connection.close()
+        self.raise_error()
+
+    def __enter__(self) -> "Leaderboard":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _query(self, query: str, parameters: tuple = ()) -> Tuple[list, list]:
+        """Runs `query` without waiting for the writer thread.
+
+        Returns
+        -------
+        Tuple[list, list]
+            The rows of `query`, and the runs still queued that it
+            doesn't see (a batch committed meanwhile is seen by the
+            query and left out of them, so no run is counted twice).
+        """
+        self.raise_error()
+        with self.pending_lock:
+            pending = list(self.pending)
+            saved_id = self.saved_id
+        connection = self.connection
+        # one read transaction, so both queries see the same commits
+        connection.execute("BEGIN")
+        try:
+            rows = connection.execute(query, parameters).fetchall()
+            last_id = connection.execute(LAST_ID).fetchone()[0]
+        finally:
+            connection.execute("COMMIT")
+        return rows, pending[last_id - saved_id:]
+
+    def top(self, k: int = 10) -> List[Run]:
+        """Returns the `k` best runs, best first (earliest first on a tie).
+        """
+        rows, pending = self._query(TOP_RUNS, (k,))
+        # queued runs come after the committed ones on a tie
+        rows.extend(pending)
+        rows.sort(key = lambda row: -row[0])
+        return [Run(*row) for row in rows[:k]]
+
+    def rank(self, score: int) -> int:
+        """Returns the rank of `score`: 1 + the number of runs with a higher score.
+        """
+        rows, pending = self._query(RUNS_ABOVE, (score,))
+        return 1 + rows[0][0] + sum(1 for run in pending if run[0] > score)
+
+    def __len__(self) -> int:
+        rows, pending = self._query(RUN_COUNT)
+        return rows[0][0] + len(pending)
+
+    def _write(self):
+        """Writer thread: inserts queued runs until `STOP`.
+        """
+        connection = connect(self.path)
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            runs = [run for run in batch if run is not STOP]
+            stopping = len(runs) < len(batch)
+            try:
+                error = None
+                try:
+                    if runs:
+                        with connection:
+                            connection.executemany(INSERT_RUN, runs)
+                            connection.executemany(
+                                ADD_COUNT,
+                                Counter(score for score, _, _ in runs).items()
+                            )
+                except Exception as exception:
+                    error = exception
+                with self.pending_lock:
+                    for _ in runs:
+                        self.pending.popleft()
+                    if error is None:
+                        self.saved_id += len(runs)
+                    else:
+                        self.error = error
+            finally:
+                # `flush` and `close` wait for these, whatever happened
+                for _ in batch:
+                    self.queue.task_done()
+        connection.close()
@@ -0,0 +1,344 @@
+# lookahead.py
+
+# standard library dependencies
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterator, List, Sequence, Tuple, Union
+
+# external dependencies
+import pygame
+
+# local dependencies
+from .dino_avatar import DinoAnimation, DinoAvatar, Frame, X_POSITION
+from .game_state import GameState, JUMP, DUCK, MAX_GAME_SPEED, SWEEP_SPEED, collision_sweep
+from .obstacles import Bird
+from .spawn_scheduler import SMALL_CACTUS, LARGE_CACTUS
+from .sprites import mask_of, swept_mask
+
+class DinoTimeline:
+    """The dino's frames while it plays a sequence of actions, without
+    changing the avatar it starts from.
+
+    `step` plays one action like `DinoAvatar.update`, indexing the
+    avatar's tables. `advance` skips to any later tick in a few steps:
+    the rest of a jump only moves along its precomputed arc (see
+    `jump_arc`), and between jumps the dino runs or ducks, so the
+    animation index just counts the ticks and the ducks.
+    """
+    def __init__(   self,
+                    dino_avatar: DinoAvatar,
+                    actions: Sequence[int]):
+        """
+        Parameters
+        ----------
+        dino_avatar : DinoAvatar
+            Dino to start from.
+        actions : Sequence[int]
+            One of `NOOP`, `JUMP` or `DUCK` per tick.
+        """
+        self.animation = dino_avatar.animation
+        self.running_frames, self.ducking_frames, _ = self.animation.poses
+        self.landing_tick = len(self.animation.jump_arc.offsets)
+        self.actions = tuple(actions)
+        # number of actions played so far
+        self.tick = 0
+        self.is_running = dino_avatar.is_running
+        self.is_ducking = dino_avatar.is_ducking
+        self.is_jumping = dino_avatar.is_jumping
+        self.step_index = dino_avatar.step_index
+        self.jump_tick = dino_avatar.jump_tick
+        self.jump_frames = dino_avatar.jump_frames
+        self.frame = Frame(dino_avatar.image, dino_avatar.rect)
+
+    def step(self):
+        """Plays the next action.
+        """
+        action = self.actions[self.tick]
+        self.tick += 1
+        up = action == JUMP
+        down = action == DUCK
+        # mirrors `DinoAvatar.update`, `duck`, `run` and `jump`
+        if self.is_ducking:
+            self.step_index += 1
+            self.frame = self.ducking_frames[self.step_index % len(self.ducking_frames)]
+        if self.is_running:
+            self.step_index += 1
+            self.frame = self.running_frames[self.step_index % len(self.running_frames)]
+        if self.is_jumping:
+            self.step_index += 1
+            self.jump_tick += 1
+            frames = self.jump_frames[self.jump_tick]
+            self.frame = frames[self.step_index % len(frames)]
+            self.is_jumping = self.jump_tick < self.landing_tick
+
+        if up and not self.is_jumping:
+            self.is_ducking = False
+            self.is_running = False
+            self.is_jumping = True
+            self.jump_frames = self.animation.jump_frames(self.frame.rect.y)
+            self.step_index += 1
+            self.jump_tick = 1
+            frames = self.jump_frames[self.jump_tick]
+            self.frame = frames[self.step_index % len(frames)]
+        elif down and not self.is_jumping:
+            self.is_ducking = True
+            self.is_running = False
+            self.step_index += 1
+            self.frame = self.ducking_frames[self.step_index % len(self.ducking_frames)]
+        elif not (self.is_jumping or down):
+            self.is_ducking = False
+            self.is_running = True
+
+    def advance(self, tick: int) -> Frame:
+        """Plays the actions up to `tick` (a tick already played is
+        kept) and returns the dino's frame after it.
+        """
+        actions = self.actions
+        while self.tick < tick:
+            if self.is_jumping:
+                # up to the tick before the landing, the actions don't matter
+                count = min(self.landing_tick - 1 - self.jump_tick, tick - self.tick)
+                if count <= 0:
+                    self.step()
+                    continue
+                self.tick += count
+                self.step_index += count
+                self.jump_tick += count
+                frames = self.jump_frames[self.jump_tick]
+                self.frame = frames[self.step_index % len(frames)]
+            elif (self.is_running or self.is_ducking) and tick - self.tick > 1:
+                # up to the next jump, every tick moves the animation
+                # on, and ducking moves it on once more
+                played = actions[self.tick:tick]
+                if JUMP in played:
+                    played = played[:played.index(JUMP)]
+                    if not played:
+                        self.step()
+                        continue
+                self.tick += len(played)
+                self.step_index += len(played) + played.count(DUCK)
+                # after a duck, the next tick still shows a ducking frame
+                if played[-1] == DUCK or (played[-2] == DUCK if len(played) > 1 else self.is_ducking):
+                    frames = self.ducking_frames
+                else:
+                    frames = self.running_frames
+                self.frame = frames[self.step_index % len(frames)]
+                self.is_ducking = played[-1] == DUCK
+                self.is_running = not self.is_ducking
+            else:
+                self.step()
+        return self.frame
+
+def dino_frames(dino_avatar: DinoAvatar,
+                actions: Sequence[int]) -> Iterator[Tuple[Frame, bool]]:
+    """Yields the dino's frame (image and rect) after each of `actions`,
+    without changing `dino_avatar`.
+
+    Same as calling `DinoAvatar.update` once per action, but only
+    indexes the avatar's tables (see `DinoTimeline`).
+
+    Parameters
+    ----------
+    dino_avatar : DinoAvatar
+        Dino to start from.
+    actions : Sequence[int]
+        One of `NOOP`, `JUMP` or `DUCK` per tick.
+
+    Yields
+    ------
+    Tuple[Frame, bool]
+        The dino's image and rect after the tick, and whether it's jumping.
+    """
+    timeline = DinoTimeline(dino_avatar, actions)
+    for _ in range(len(timeline.actions)):
+        timeline.step()
+        yield timeline.frame, timeline.is_jumping
+
+@lru_cache(maxsize=None)
+def opaque_columns(images: Tuple[pygame.Surface, ...]) -> Tuple[int, int]:
+    """Returns the first and one past the last column with an opaque
+    pixel in any of `images` (drawn at the same x), computed once.
+    """
+    rects = [rect for image in images for rect in mask_of(image).get_bounding_rects()]
+    if not rects:
+        return 0, 0
+    return min(rect.left for rect in rects), max(rect.right for rect in rects)
+
+@lru_cache(maxsize=None)
+def dino_columns(animation: DinoAnimation) -> Tuple[int, int]:
+    """Returns the screen columns the dino's opaque pixels can cover,
+    whatever its pose (the frames all start at `X_POSITION`).
+    """
+    left, right = opaque_columns(tuple(
+        frame.image for frames in animation.poses for frame in frames
+    ))
+    return X_POSITION + left, X_POSITION + right
+
+def first_collision(game_state: GameState,
+                    actions: Sequence[int]) -> Union[int, None]:
+    """Predicts whether the dino survives playing `actions`, without
+    stepping (or changing) `game_state`.
+
+    Obstacles move by the game speed every tick, which only changes
+    every 100 points, so between two speed-ups their positions are a
+    linear function of the tick. That gives, in closed form, the window
+    of ticks in which each obstacle's opaque columns (swept above
+    `SWEEP_SPEED`) overlap the ones the dino can cover. Collisions are
+    only tested in those windows, like in `GameState.step` (rects, then
+    masks), against the dino's frames on those ticks (see
+    `DinoTimeline`).
+
+    Only the obstacles already in the game and the next scheduled spawn
+    are known; the ones after that are drawn from the game's random
+    number generator when that spawn happens. Since they appear at the
+    right edge of the screen, they can't reach the dino for at least
+    `screen_width / 40` ticks after the next spawn.
+
+    Parameters
+    ----------
+    game_state : GameState
+        Game to predict.
+    actions : Sequence[int]
+        One of `NOOP`, `JUMP` or `DUCK` per tick; their number is how far ahead to look.
+
+    Returns
+    -------
+    Union[int, None]
+        Number of calls to `step` after which the game is over (1 for
+        the next one, 0 if it's already over), or None if the dino
+        survives every action.
+    """
+    if game_state.game_over:
+        return 0
+    horizon = len(actions)
+
+    # the game speed by stretches of ticks: (first tick, speed, distance
+    # scrolled before the first tick); the speed goes up after the ticks
+    # that bring the score to a multiple of 100, and is capped after
+    # the first tick (like `update_score_and_game_speed`)
+    stretches: List[Tuple[int, int, int]] = []
+    game_speed = game_state.game_speed
+    speed_up_tick = 100 - game_state.score % 100
+    tick = 1
+    scrolled = 0
+    while tick <= horizon:
+        if game_speed > MAX_GAME_SPEED:
+            last = tick
+        elif game_speed == MAX_GAME_SPEED:
+            last = horizon
+        else:
+            last = min(speed_up_tick, horizon)
+        stretches.append((tick, game_speed, scrolled))
+        scrolled += game_speed * (last - tick + 1)
+        if last == speed_up_tick:
+            game_speed += 1
+            speed_up_tick += 100
+        game_speed = min(game_speed, MAX_GAME_SPEED)
+        tick = last + 1
+    stretches.append((horizon + 1, 0, scrolled))
+
+    # one entry per obstacle: x-position plus the distance scrolled
+    # before it appeared, y-position, size, images, image index at tick
+    # 0 (birds flip images as they move) and first tick in the game
+    obstacles: List[tuple] = []
+    for obstacle in game_state.obstacles:
+        x, y, width, height = obstacle.rect
+        if type(obstacle) is Bird:
+            obstacles.append((x, y, width, height, tuple(obstacle.images), obstacle.image_index, 1))
+        else:
+            obstacles.append((x, y, width, height, (obstacle.image,), 0, 1))
+    next_spawn = game_state.next_spawn
+    spawn_tick = max(next_spawn.tick - game_state.ticks, 1)
+    if spawn_tick <= horizon:
+        sprites = game_state.sprites
+        if next_spawn.kind == SMALL_CACTUS:
+            images = (sprites.small_cactus_images[next_spawn.variant],)
+        elif next_spawn.kind == LARGE_CACTUS:
+            images = (sprites.large_cactus_images[next_spawn.variant],)
+        else:
+            images = tuple(sprites.bird_images)
+        width, height = images[0].get_size()
+        # it appears at the right edge, then moves on the same tick; a
+        # respawned bird starts its animation over
+        for first, speed, before in stretches:
+            if first > spawn_tick:
+                break
+            spawn_scrolled = before + speed * (spawn_tick - first)
+        obstacles.append((
+            game_state.screen_width + spawn_scrolled,
+            next_spawn.y,
+            width,
+            height,
+            images,
+            1 - spawn_tick,
+            spawn_tick
+        ))
+
+    # the ticks on which each obstacle may touch the dino:
+    # (first tick, end tick, speed, x on the first tick, obstacle)
+    dino_avatar = game_state.dino_avatar
+    dino_left, dino_right = dino_columns(dino_avatar.animation)
+    windows: List[tuple] = []
+    stretch_ends = list(zip(stretches, stretches[1:]))
+    for obstacle in obstacles:
+        x, _, _, _, images, _, appears = obstacle
+        left, right = opaque_columns(images)
+        if x + left - dino_right >= scrolled:
+            # out of reach until after the last tick
+            continue
+        for (first, speed, before), (end, _, _) in stretch_ends:
+            if end <= appears:
+                continue
+            # on tick t of the stretch, the obstacle is at
+            # x - before - speed * (t - first + 1); its opaque columns
+            # must start left of the dino's right edge, and end (plus
+            # the sweep to where it was on the tick before) right of
+            # its left edge
+            sweep = speed if speed > SWEEP_SPEED else 0
+            start = max(first + (x + left - dino_right - before) // speed, first, appears)
+            stop = min(first - 1 - (before + dino_left - x - right - sweep) // speed, end)
+            if start < stop:
+                windows.append((start, stop, speed, x - before - speed * (start - first + 1), obstacle))
+    if not windows:
+        return None
+    windows.sort(key = itemgetter(0))
+
+    timeline = DinoTimeline(dino_avatar, actions)
+    collision = horizon + 1
+    for start, stop, speed, x, (_, y, width, height, images, image_index, _) in windows:
+        if start >= collision:
+            break
+        if start <= timeline.tick:
+            # windows that overlap go back in time
+            timeline = DinoTimeline(dino_avatar, actions)
+        timeline.advance(start - 1)
+        sweep = speed > SWEEP_SPEED
+        for tick in range(start, min(stop, collision)):
+            previous_y = timeline.frame.rect.y
+            was_jumping = timeline.is_jumping
+            image, dino_rect = timeline.advance(tick)
+            dino_x, dino_y, dino_width, dino_height = dino_rect
+            obstacle_image = images[((image_index + tick) // 5) % len(images)]
+            if sweep:
+                # the motion swept by `GameState.step`
+                dx, dy, steps = collision_sweep(
+                    speed,
+                    previous_y - dino_y if was_jumping or timeline.is_jumping else 0
+                )
+                obstacle_mask, left, top = swept_mask(mask_of(obstacle_image), dx, dy, steps)
+                swept_x = x + left
+                swept_y = y + top
+                swept_width, swept_height = obstacle_mask.get_size()
+            else:
+                obstacle_mask = None
+                swept_x, swept_y, swept_width, swept_height = x, y, width, height
+            if swept_x < dino_x + dino_width and dino_x < swept_x + swept_width \
+                    and swept_y < dino_y + dino_height and dino_y < swept_y + swept_height:
+                if obstacle_mask is None:
+                    obstacle_mask = mask_of(obstacle_image)
+                offset = (swept_x - dino_x, swept_y - dino_y)
+                if mask_of(image).overlap(obstacle_mask, offset) is not None:
+                    collision = tick
+                    break
+            x -= speed
+    return collision if collision <= horizon else None
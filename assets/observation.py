@@ -0,0 +1,186 @@
+# observation.py
+
+# standard library dependencies
+from typing import Tuple, Union
+
+# external dependencies
+import numpy as np
+import pygame
+
+# local dependencies
+from .background import BACKGROUND_COLOR
+from .batch_game_state import BatchGameState, NO_OBSTACLE
+from .game_state import GameState
+from .obstacles import OBSTACLE_KINDS
+
+# same features, in the same order, as `BatchGameState.observe`
+FEATURES = BatchGameState.OBSERVATION_FEATURES
+FEATURE_SIZE = BatchGameState.OBSERVATION_SIZE
+
+# integer luma weights (they add up to 256)
+GRAY_WEIGHTS = (np.uint16(77), np.uint16(150), np.uint16(29))
+GRAY_SHIFT = np.uint16(8)
+
+class FeatureObserver:
+    """Writes the state of a `GameState` as a vector of `FEATURES`
+    into the same preallocated float32 array on every call.
+    """
+    def __init__(   self,
+                    game_state: GameState,
+                    out: Union[np.ndarray, None] = None):
+        """
+        Parameters
+        ----------
+        game_state : GameState
+            Game to observe.
+        out : np.ndarray, optional
+            Array of shape (FEATURE_SIZE,) to write to, by default a new float32 array.
+        """
+        self.game_state = game_state
+        self.out = np.zeros(FEATURE_SIZE, dtype=np.float32) if out is None else out
+
+    def observe(self) -> np.ndarray:
+        """Writes the current features to `out`.
+
+        Returns
+        -------
+        np.ndarray
+            `out`; it's overwritten by the next call.
+        """
+        game_state = self.game_state
+        dino_avatar = game_state.dino_avatar
+        out = self.out
+        out[0] = dino_avatar.rect.y
+        out[1] = dino_avatar.jump_velocity
+        out[2] = dino_avatar.is_jumping
+        out[3] = dino_avatar.is_ducking
+        obstacle = game_state.nearest_obstacle()
+        if obstacle is None:
+            out[4] = game_state.screen_width
+            out[5] = out[6] = out[7] = 0
+            out[8] = NO_OBSTACLE
+        else:
+            rect = obstacle.rect
+            out[4] = rect.x - dino_avatar.x_position
+            out[5] = rect.y
+            out[6] = rect.width
+            out[7] = rect.height
+            out[8] = OBSTACLE_KINDS[type(obstacle)]
+        out[9] = game_state.game_speed
+        return out
+
+class PixelObserver:
+    """Draws a `GameState` offscreen into a surface backed by a NumPy
+    array, then downsamples (by striding) and converts it to grayscale
+    straight into a ring buffer of the last `stack` frames.
+
+    Every array is allocated once, in `__init__`; `observe` only
+    writes into them. Only the track is drawn from the background, and
+    the score is left out, since the rest has no effect on the game.
+    """
+    def __init__(   self,
+                    game_state: GameState,
+                    size: Tuple[int, int] = (1100, 600),
+                    scale: int = 4,
+                    stack: int = 4,
+                    grayscale: bool = True):
+        """
+        Parameters
+        ----------
+        game_state : GameState
+            Game to observe.
+        size : Tuple[int, int], optional
+            Size of the offscreen surface, by default (1100, 600) (the game screen).
+        scale : int, optional
+            Only one pixel out of `scale` is kept in each direction, by default 4.
+        stack : int, optional
+            Number of frames kept, by default 4.
+        grayscale : bool, optional
+            Whether frames are converted to grayscale (one channel), by default True.
+        """
+        self.game_state = game_state
+        width, height = size
+        self.stack = stack
+        self.grayscale = grayscale
+
+        # the surface draws straight into `pixels`, rows first
+        self.pixels = np.zeros((height, width, 4), dtype=np.uint8)
+        self.surface = pygame.image.frombuffer(self.pixels, size, "RGBX")
+        downsampled = self.pixels[::scale, ::scale]
+        self.channels = tuple(downsampled[..., i] for i in range(3))
+        self.rgb = downsampled[..., :3]
+        frame_shape = downsampled.shape[:2] if grayscale else downsampled.shape[:2] + (3,)
+
+        # ring buffer of frames; `latest` is the index of the last one
+        self.frames = np.zeros((stack,) + frame_shape, dtype=np.uint8)
+        self.slots = tuple(self.frames[i] for i in range(stack))
+        self.latest = stack - 1
+        # `frames` indices from oldest to newest, for each value of `latest`
+        self.orders = tuple(
+            np.arange(latest + 1, latest + 1 + stack) % stack for latest in range(stack)
+        )
+        self.stacked_frames = np.zeros_like(self.frames)
+        self.luma = np.zeros(downsampled.shape[:2], dtype=np.uint16)
+        self.weighted = np.zeros_like(self.luma)
+
+    def draw(self):
+        """Draws the game on the offscreen surface.
+        """
+        game_state = self.game_state
+        surface = self.surface
+        surface.fill(BACKGROUND_COLOR)
+        game_state.ground.draw(surface)
+        for obstacle in game_state.obstacles:
+            surface.blit(obstacle.image, obstacle.rect)
+        dino_avatar = game_state.dino_avatar
+        surface.blit(dino_avatar.image, dino_avatar.rect)
+
+    def observe(self) -> np.ndarray:
+        """Draws the game and adds the new frame to the ring buffer.
+
+        Returns
+        -------
+        np.ndarray
+            The new frame (a view into `frames`), of shape (height, width)
+            in grayscale or (height, width, 3) in color.
+        """
+        self.draw()
+        self.latest = (self.latest + 1) % self.stack
+        frame = self.slots[self.latest]
+        if self.grayscale:
+            # channels are cast by `copyto` and the arithmetic stays in
+            # uint16, so ufuncs don't allocate buffers to cast operands
+            red, green, blue = self.channels
+            red_weight, green_weight, blue_weight = GRAY_WEIGHTS
+            luma, weighted = self.luma, self.weighted
+            np.copyto(luma, red)
+            np.multiply(luma, red_weight, out=luma)
+            np.copyto(weighted, green)
+            np.multiply(weighted, green_weight, out=weighted)
+            np.add(luma, weighted, out=luma)
+            np.copyto(weighted, blue)
+            np.multiply(weighted, blue_weight, out=weighted)
+            np.add(luma, weighted, out=luma)
+            np.right_shift(luma, GRAY_SHIFT, out=luma)
+            np.copyto(frame, luma, casting="unsafe")
+        else:
+            np.copyto(frame, self.rgb)
+        return frame
+
+    def stacked(self, out: Union[np.ndarray, None] = None) -> np.ndarray:
+        """Copies the frames kept, oldest first, into `out`.
+
+        Parameters
+        ----------
+        out : np.ndarray, optional
+            Array shaped like `frames`, by default one allocated in `__init__`.
+
+        Returns
+        -------
+        np.ndarray
+            `out`.
+        """
+        if out is None:
+            out = self.stacked_frames
+        # "clip" since the default mode buffers `out`
+        return np.take(self.frames, self.orders[self.latest], axis=0, out=out, mode="clip")
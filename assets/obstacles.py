@@ -1,13 +1,18 @@
 # obstacles.py
-from typing import List 
+
+# standard library dependencies
+from typing import Dict, List, Tuple, Type, Union
 
 # external dependencies
 import pygame
 
 # local dependencies
 from .game_element import GameElement
+from .spawn_scheduler import SMALL_CACTUS, LARGE_CACTUS, BIRD
 
 class SmallCactus(GameElement):
+    __slots__ = ()
+
     def __init__(   self, 
                     screen_width: int, 
                     image: pygame.Surface):
@@ -18,7 +23,22 @@ class SmallCactus(GameElement):
         # NOTE: remind them that (0,0) is top-left
         self.rect.y = 325
 
+    def respawn(self, image: pygame.Surface):
+        """Puts the cactus back just past the right edge of the
+        screen with `image`, so that it can be reused.
+
+        Parameters
+        ----------
+        image : pygame.Surface
+            New image for the cactus.
+        """
+        self.image = image
+        self.rect.size = image.get_size()
+        self.rect.topleft = (self.screen_width, 325)
+
 class LargeCactus(GameElement):
+    __slots__ = ()
+
     def __init__(   self, 
                     screen_width: int, 
                     image: pygame.Surface):
@@ -29,7 +49,22 @@ class LargeCactus(GameElement):
         # NOTE: remind them that (0,0) is top-left
         self.rect.y = 300
 
+    def respawn(self, image: pygame.Surface):
+        """Puts the cactus back just past the right edge of the
+        screen with `image`, so that it can be reused.
+
+        Parameters
+        ----------
+        image : pygame.Surface
+            New image for the cactus.
+        """
+        self.image = image
+        self.rect.size = image.get_size()
+        self.rect.topleft = (self.screen_width, 300)
+
 class Bird(GameElement):
+    __slots__ = ("images", "image_index", "debug")
+
     def __init__(   self, 
                     screen_width: int, 
                     images: List[pygame.Surface],
@@ -44,26 +79,66 @@ class Bird(GameElement):
         self.image_index = 0
         self.debug = debug
 
-    def draw(self, screen: pygame.Surface):
-        """Takes care of drawing the bird (and flipping between
-        images) on the `screen`.
+    def respawn(self, images: List[pygame.Surface]):
+        """Puts the bird back just past the right edge of the
+        screen, at the start of its animation, so that it can be reused.
 
         Parameters
         ----------
-        screen : pygame.Surface
-            Game screen.
+        images : List[pygame.Surface]
+            Images to flip between.
+        """
+        self.images = images
+        self.image = images[0]
+        self.image_index = 0
+        self.rect.size = self.image.get_size()
+        self.rect.topleft = (self.screen_width, 250)
+
+    def update(self, game_speed: int):
+        """Flips between images and moves the bird; kept out of
+        `draw` so that the headless simulation animates it too.
+
+        Parameters
+        ----------
+        game_speed : int
+            Current game speed.
         """
         self.image_index = (self.image_index + 1)
         self.image = self.images[(self.image_index // 5) % len(self.images)]
+        super().update(game_speed)
+
+    def draw_rect(self) -> pygame.Rect:
+        """Returns the area of the screen covered by `draw`; the
+        images don't all have the size of the bounding box.
+
+        Returns
+        -------
+        pygame.Rect
+            Area covered by the bird and its bounding box.
+        """
+        return super().draw_rect().union(self.rect)
+
+    def draw(self, 
+            screen: pygame.Surface,
+            offset: Tuple[int, int] = (0, 0)):
+        """Takes care of drawing the bird on the `screen`.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            Game screen.
+        offset : Tuple[int, int], optional
+            Shift from the bird's position, by default (0, 0).
+        """
         screen.blit(
             self.image, 
-            self.rect
+            self.rect.move(offset)
         )
         # if self.debug, draw the bird's bounding box
         if self.debug:    
             collision_box = pygame.Rect(
-                self.rect.x, 
-                self.rect.y, 
+                self.rect.x + offset[0], 
+                self.rect.y + offset[1], 
                 self.rect.width, 
                 self.rect.height
             )
@@ -73,3 +148,59 @@ class Bird(GameElement):
                 collision_box,
                 1
             )
+
+# obstacle classes indexed by kind (see `spawn_scheduler`), and the kind of each class
+OBSTACLE_CLASSES = (SmallCactus, LargeCactus, Bird)
+OBSTACLE_KINDS = {SmallCactus: SMALL_CACTUS, LargeCactus: LARGE_CACTUS, Bird: BIRD}
+
+class ObstaclePool:
+    """Keeps the obstacles that left the game, one free list per
+    obstacle class, so that spawning reuses them (see `respawn`)
+    instead of building new ones.
+    """
+    def __init__(self, screen_width: int):
+        """
+        Parameters
+        ----------
+        screen_width : int
+            Width of the game screen, passed to new obstacles.
+        """
+        self.screen_width = screen_width
+        self.free: Dict[Type[GameElement], List[GameElement]] = {
+            SmallCactus: [],
+            LargeCactus: [],
+            Bird: [],
+        }
+        # number of obstacles built so far (the rest were reused)
+        self.allocated = 0
+
+    def acquire(self,
+                obstacle_class: Type[GameElement],
+                images: Union[pygame.Surface, List[pygame.Surface]]) -> GameElement:
+        """Returns an obstacle of `obstacle_class` just past the right
+        edge of the screen, reusing a free one if there is any.
+
+        Parameters
+        ----------
+        obstacle_class : Type[GameElement]
+            `SmallCactus`, `LargeCactus` or `Bird`.
+        images : Union[pygame.Surface, List[pygame.Surface]]
+            The image of a cactus, or the images of a bird.
+
+        Returns
+        -------
+        GameElement
+            The obstacle.
+        """
+        free = self.free.setdefault(obstacle_class, [])
+        if free:
+            obstacle = free.pop()
+            obstacle.respawn(images)
+            return obstacle
+        self.allocated += 1
+        return obstacle_class(self.screen_width, images)
+
+    def release(self, obstacle: GameElement):
+        """Gives back an obstacle that left the game.
+        """
+        self.free.setdefault(type(obstacle), []).append(obstacle)
@@ -0,0 +1,382 @@
+# population.py
+
+# standard library dependencies
+from typing import List, Tuple, Union
+
+# external dependencies
+import numpy as np
+import pygame
+
+# local dependencies
+from .background import BACKGROUND_COLOR
+from .batch_game_state import BatchGameState, DinoBatch, DINO_X
+from .game_element import GameElement
+from .game_state import (
+    GameState,
+    NOOP,
+    JUMP,
+    DUCK,
+    SCREEN_WIDTH,
+    SWEEP_SPEED,
+    collision_sweep,
+    update_score_and_game_speed
+)
+from .hud import ScoreHUD
+from .obstacles import OBSTACLE_KINDS
+from .sprites import Sprites, swept_mask
+
+# most dino sprites drawn per frame (the others are still simulated)
+MAX_DRAWN = 256
+# ticks a dead dino takes to fade out, and the number of steps of its fading
+FADE_TICKS = 30
+FADE_LEVELS = 8
+
+# packs a dino's height (or jump) into a key; both stay well within it
+HEIGHT_RANGE = 4096
+
+class Population(DinoBatch):
+    """`n` dinos running on the same course: one `GameState` (its
+    obstacles, background, score and speed) that every dino plays
+    against, with its own actions.
+
+    While it lives, every dino plays exactly like a `GameState` with
+    the course's seed and that dino's actions; the course keeps going
+    as long as one of them runs. The dinos are simulated with
+    `DinoBatch`, and the obstacles and spawns only once for all of
+    them. Collisions are tested once per obstacle and distinct dino
+    state (pose, image, height and jump), since dinos in the same state
+    are in the same place.
+    """
+    # same as `BatchGameState`, so policies work with either
+    OBSERVATION_FEATURES = BatchGameState.OBSERVATION_FEATURES
+    OBSERVATION_SIZE = BatchGameState.OBSERVATION_SIZE
+
+    def __init__(   self,
+                    sprites: Sprites,
+                    n: int,
+                    seed: Union[int, None] = None,
+                    screen_width: int = SCREEN_WIDTH,
+                    game_speed: int = 15,
+                    gap_scale: float = 1.0):
+        """
+        Parameters
+        ----------
+        sprites : Sprites
+            Images used by the game elements (see `load_sprites`).
+        n : int
+            Number of dinos.
+        seed : int, optional
+            Seed of the course, by default a random one.
+        screen_width : int, optional
+            Width of the game screen, by default 1100.
+        game_speed : int, optional
+            Starting value for game speed, by default 15.
+        gap_scale : float, optional
+            Multiplies the minimum gap between obstacles (see `SpawnScheduler`), by default 1.0.
+        """
+        super().__init__(sprites, n)
+        # the course's own dino stays at the start, unused
+        self.course = GameState(
+            sprites,
+            screen_width = screen_width,
+            game_speed = game_speed,
+            seed = seed,
+            gap_scale = gap_scale
+        )
+        self.score = np.empty(n, dtype=np.int64)
+        self.game_over = np.empty(n, dtype=bool)
+        # when each dino died, and how far the course had scrolled then
+        self.death_tick = np.empty(n, dtype=np.int64)
+        self.death_distance = np.empty(n, dtype=np.int64)
+        # the same course as a new `GameState` with this seed
+        self.reset(self.course.seed)
+
+    def reset(self, seed: Union[int, None] = None):
+        """Puts every dino and the course back to their starting state.
+
+        Parameters
+        ----------
+        seed : int, optional
+            If given, the course starts over from this seed (see `GameState.reset`).
+        """
+        self.course.reset(seed)
+        self.reset_dinos(slice(None))
+        self.score[:] = self.course.score
+        self.game_over[:] = False
+        self.death_tick[:] = 0
+        self.death_distance[:] = 0
+        # distance the course scrolled since it started
+        self.distance = 0
+
+    @property
+    def ticks(self) -> int:
+        return self.course.ticks
+
+    def alive(self) -> int:
+        """Returns the number of dinos still running.
+        """
+        return self.n - int(np.count_nonzero(self.game_over))
+
+    def _touches(   self,
+                    i: int,
+                    dino_image: int,
+                    obstacle: GameElement,
+                    dino_dy: int) -> bool:
+        """Mask test of `DinoAvatar.collides_with` between dino `i`
+        (whose rect overlaps the obstacle's) and `obstacle`.
+        """
+        dino_mask = self.dino_masks[self.pose[i]][dino_image]
+        obstacle_mask = obstacle.mask
+        x = obstacle.rect.x - DINO_X
+        y = obstacle.rect.y - int(self.dino_y[i])
+        game_speed = self.course.game_speed
+        if game_speed > SWEEP_SPEED:
+            obstacle_mask, left, top = swept_mask(obstacle_mask, *collision_sweep(game_speed, dino_dy))
+            x += left
+            y += top
+        return dino_mask.overlap(obstacle_mask, (x, y)) is not None
+
+    def collides(self, dino_dy: np.ndarray, live: np.ndarray) -> np.ndarray:
+        """Vectorized `DinoAvatar.collides_with` between the live dinos
+        and the course's obstacles.
+
+        Parameters
+        ----------
+        dino_dy : np.ndarray
+            How far up every dino jumped during the last tick.
+        live : np.ndarray
+            Boolean mask of the dinos to test.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array, True where the dino touches an obstacle.
+        """
+        collided = np.zeros(self.n, dtype=bool)
+        dino_image = self.dino_images()
+        dino_size = self.dino_sizes[self.pose, dino_image]
+        dino_right = DINO_X + dino_size[:, 0]
+        dino_y = self.dino_y
+        game_speed = self.course.game_speed
+        # swept obstacles cover their path back to their previous position
+        swept = game_speed > SWEEP_SPEED
+        sweep_x = game_speed if swept else 0
+        sweep_y = dino_dy if swept else np.zeros(self.n, dtype=np.int64)
+        for obstacle in self.course.obstacles:
+            x, y, width, height = obstacle.rect
+            # obstacles are ordered by x, so only the first few can reach a dino
+            if x >= dino_right.max():
+                break
+            overlapping = np.flatnonzero(
+                live & ~collided
+                & (x < dino_right)
+                & (DINO_X < x + width + sweep_x)
+                & (y + np.minimum(0, -sweep_y) < dino_y + dino_size[:, 1])
+                & (dino_y < y + height + np.maximum(0, -sweep_y))
+            )
+            if len(overlapping) == 0:
+                continue
+            # dinos in the same state get the same answer
+            states = ((self.pose[overlapping].astype(np.int64) * len(self.dino_sizes[0])
+                       + dino_image[overlapping]) * HEIGHT_RANGE
+                      + dino_y[overlapping]) * HEIGHT_RANGE + sweep_y[overlapping] + HEIGHT_RANGE // 2
+            _, first, inverse = np.unique(states, return_index=True, return_inverse=True)
+            hits = np.array([
+                self._touches(i, int(dino_image[i]), obstacle, int(sweep_y[i]))
+                for i in overlapping[first]
+            ])
+            collided[overlapping[hits[inverse]]] = True
+        return collided
+
+    def observe(self, out: Union[np.ndarray, None] = None) -> np.ndarray:
+        """Same as `BatchGameState.observe`; the obstacle features are
+        the same for every dino.
+        """
+        if out is None:
+            out = np.empty((self.n, self.OBSERVATION_SIZE), dtype=np.float32)
+        out[:, 0] = self.dino_y
+        out[:, 1] = self.jump_velocity
+        out[:, 2] = self.is_jumping
+        out[:, 3] = self.is_ducking
+        obstacle = self.course.nearest_obstacle()
+        if obstacle is None:
+            out[:, 4] = self.course.screen_width
+            out[:, 5:8] = 0
+            out[:, 8] = -1
+        else:
+            x, y, width, height = obstacle.rect
+            out[:, 4] = x - DINO_X
+            out[:, 5] = y
+            out[:, 6] = width
+            out[:, 7] = height
+            out[:, 8] = OBSTACLE_KINDS[type(obstacle)]
+        out[:, 9] = self.course.game_speed
+        return out
+
+    def step(self, actions: Union[np.ndarray, int] = NOOP) -> np.ndarray:
+        """Advances every dino that is still running, and the course, by one tick.
+
+        Parameters
+        ----------
+        actions : Union[np.ndarray, int], optional
+            One action (`NOOP`, `JUMP` or `DUCK`) per dino, or one
+            action for all of them, by default `NOOP`.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean array, True for the dinos that are out.
+        """
+        live = ~self.game_over
+        if not live.any():
+            return self.game_over
+        course = self.course
+        course.ticks += 1
+        actions = np.broadcast_to(actions, (self.n,))
+
+        previous_y = self.dino_y.copy()
+        was_jumping = self.is_jumping.copy()
+        self._update_dinos(actions, live)
+        dino_dy = np.where(was_jumping | self.is_jumping, previous_y - self.dino_y, 0)
+
+        course.update_obstacles()
+        collided = self.collides(dino_dy, live)
+        self.game_over |= collided
+        live &= ~collided
+        self.death_tick[collided] = course.ticks
+        if not live.any():
+            course.game_over = True
+            self.death_distance[collided] = self.distance
+            return self.game_over
+
+        # the rest of `GameState.step`, for the dinos still running
+        course.background.update(course.game_speed)
+        self.distance += course.game_speed
+        self.death_distance[collided] = self.distance
+        course.score, course.game_speed = update_score_and_game_speed(
+            course.score,
+            course.game_speed
+        )
+        self.score[live] = course.score
+        return self.game_over
+
+def reflex_actions(observations: np.ndarray, reach: np.ndarray) -> np.ndarray:
+    """Actions of dinos that jump (or duck under high birds) once the
+    nearest obstacle is less than `reach` ticks away, like the bots of
+    the benchmarks; a stand-in for evolved policies.
+
+    Parameters
+    ----------
+    observations : np.ndarray
+        Observations of a `Population` or `BatchGameState` (see `observe`).
+    reach : np.ndarray
+        Reaction distance of every dino, in ticks at the current speed.
+
+    Returns
+    -------
+    np.ndarray
+        One action per dino.
+    """
+    distance = observations[:, 4]
+    close = (distance > 0) & (distance < observations[:, 9] * reach)
+    return np.where(close, np.where(observations[:, 5] < 300, DUCK, JUMP), NOOP)
+
+def faded(image: pygame.Surface, level: int) -> pygame.Surface:
+    """Returns a copy of `image` with `level / FADE_LEVELS` of its opacity.
+    """
+    image = image.copy()
+    image.set_alpha(255 * level // FADE_LEVELS)
+    return image
+
+class PopulationRenderer:
+    """Draws a `Population`: the course once, then the dinos in a
+    single `Surface.blits` call.
+
+    Every live dino stands at the same x, so all the dinos with the
+    same image at the same height cover the same pixels: each distinct
+    (image, height) is drawn once, which looks the same as drawing all
+    of them. Dead dinos stay where they died, scroll away with the
+    ground and fade out over `FADE_TICKS`; they're grouped the same
+    way, by the tick they died. At most `max_drawn` sprites are drawn,
+    live dinos first, then the most recently dead.
+    """
+    def __init__(   self,
+                    screen: pygame.Surface,
+                    sprites: Sprites,
+                    score_hud: ScoreHUD,
+                    alive_hud: Union[ScoreHUD, None] = None,
+                    max_drawn: int = MAX_DRAWN):
+        """
+        Parameters
+        ----------
+        screen : pygame.Surface
+            Game screen.
+        sprites : Sprites
+            Images used by the game elements (see `load_sprites`).
+        score_hud : ScoreHUD
+            Display for the score.
+        alive_hud : ScoreHUD, optional
+            If given, displays the number of dinos still running.
+        max_drawn : int, optional
+            Most dino sprites drawn per frame, by default 256.
+        """
+        self.screen = screen
+        self.score_hud = score_hud
+        self.alive_hud = alive_hud
+        self.max_drawn = max_drawn
+        poses = (sprites.running_images, sprites.ducking_images, sprites.jumping_images)
+        # the dino's images by id, and the id of every pose's first image
+        images = [image for pose in poses for image in pose]
+        self.pose_ids = np.cumsum([0] + [len(pose) for pose in poses[:-1]])
+        # `fades[level][id]`: every image at every opacity, the last level opaque
+        self.fades: List[List[pygame.Surface]] = [
+            [faded(image, level) for image in images] for level in range(FADE_LEVELS)
+        ] + [images]
+
+    def dino_blits(self, population: Population) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """Returns the (image, position) of every dino sprite to draw,
+        back to front.
+        """
+        ids = self.pose_ids[population.pose] + population.dino_images()
+        keys = ids * HEIGHT_RANGE + population.dino_y
+        opaque = self.fades[FADE_LEVELS]
+
+        live = np.unique(keys[~population.game_over])[:self.max_drawn]
+        blits = [
+            (opaque[key // HEIGHT_RANGE], (DINO_X, key % HEIGHT_RANGE))
+            for key in live.tolist()
+        ]
+
+        age = population.ticks - population.death_tick
+        fading = np.flatnonzero(population.game_over & (age < FADE_TICKS))
+        budget = self.max_drawn - len(blits)
+        if budget > 0 and len(fading):
+            # newest deaths first, so the cap drops the faintest ones
+            groups, first = np.unique(
+                -population.death_tick[fading] * HEIGHT_RANGE ** 2 + keys[fading],
+                return_index=True
+            )
+            first = fading[first[:budget]]
+            levels = FADE_LEVELS - age[first] * FADE_LEVELS // FADE_TICKS
+            x = DINO_X - (population.distance - population.death_distance[first])
+            dead = [
+                (self.fades[level][key // HEIGHT_RANGE], (dx, key % HEIGHT_RANGE))
+                for level, key, dx in zip(levels.tolist(), keys[first].tolist(), x.tolist())
+            ]
+            blits = dead[::-1] + blits
+        return blits
+
+    def render(self, population: Population):
+        """Draws the whole frame and pushes it to the display.
+        """
+        course = population.course
+        screen = self.screen
+        screen.fill(BACKGROUND_COLOR)
+        course.background.draw(screen)
+        for obstacle in course.obstacles:
+            obstacle.draw(screen)
+        screen.blits(self.dino_blits(population), doreturn=False)
+        self.score_hud.draw(course.score, screen)
+        if self.alive_hud is not None:
+            self.alive_hud.draw(population.alive(), screen)
+        pygame.display.update()
@@ -0,0 +1,224 @@
+# profiler.py
+
+# standard library dependencies
+import csv
+import time
+from array import array
+from typing import Dict, List, Tuple
+
+# external dependencies
+import pygame
+
+# local dependencies
+from .hud import TEXT_COLOR
+
+# phases of a frame, in the order they happen
+EVENTS = 0
+DINO_UPDATE = 1
+OBSTACLES_UPDATE = 2
+BACKGROUND_UPDATE = 3
+SCORE_UPDATE = 4
+ERASE = 5
+BACKGROUND_DRAW = 6
+DINO_DRAW = 7
+OBSTACLES_DRAW = 8
+SCORE_DRAW = 9
+DISPLAY_UPDATE = 10
+WAIT = 11
+PHASE_NAMES = (
+    "events",
+    "dino.update",
+    "obstacles.update",
+    "background.update",
+    "score.update",
+    "erase",
+    "background.draw",
+    "dino.draw",
+    "obstacles.draw",
+    "score.draw",
+    "display.update",
+    "wait",
+)
+N_PHASES = len(PHASE_NAMES)
+
+OVERLAY_COLOR = (240, 240, 240)
+HISTOGRAM_COLOR = (60, 60, 200)
+
+class FrameProfiler:
+    """Times each phase of every frame into a preallocated ring buffer.
+
+    `begin_frame` starts a frame, and each `mark(phase)` adds the time
+    since the previous mark to that phase (phases that run several
+    times in a frame, like the simulation ticks, add up). A frame is
+    timed in a scratch row and only copied into the ring when it's
+    kept: when the next one begins, or on `end_frame`. Code being
+    profiled holds a `profiler` attribute that is `None` when profiling
+    is off, so the only cost then is an `is not None` check per phase.
+    """
+    def __init__(self, capacity: int = 600):
+        """
+        Parameters
+        ----------
+        capacity : int, optional
+            Number of frames kept (the oldest are overwritten), by default 600.
+        """
+        self.capacity = capacity
+        self.timings = array("q", bytes(8 * capacity * N_PHASES))
+        # timings of the frame in progress
+        self.current = array("q", bytes(8 * N_PHASES))
+        self.empty = array("q", bytes(8 * N_PHASES))
+        self.in_frame = False
+        # frames kept so far
+        self.frames = 0
+        self.last_ns = 0
+
+    def begin_frame(self):
+        """Keeps the frame in progress (if any) and starts timing a new one.
+        """
+        if self.in_frame:
+            self.end_frame()
+        self.current[:] = self.empty
+        self.in_frame = True
+        self.last_ns = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Keeps the frame in progress in the ring buffer.
+        """
+        start = (self.frames % self.capacity) * N_PHASES
+        self.timings[start:start + N_PHASES] = self.current
+        self.frames += 1
+        self.in_frame = False
+
+    def cancel_frame(self):
+        """Drops the frame being timed, e.g. when it turns out not to
+        be worth keeping.
+        """
+        self.in_frame = False
+
+    def mark(self, phase: int):
+        """Adds the time since the previous mark to `phase`.
+        """
+        now_ns = time.perf_counter_ns()
+        self.current[phase] += now_ns - self.last_ns
+        self.last_ns = now_ns
+
+    def rows(self) -> List[Tuple[int, ...]]:
+        """Returns the timings (in ns) of the frames kept, oldest first;
+        the frame in progress is left out.
+
+        Returns
+        -------
+        List[Tuple[int, ...]]
+            One tuple of `N_PHASES` timings per frame.
+        """
+        kept = min(self.frames, self.capacity)
+        first = self.frames - kept
+        rows = []
+        for frame in range(first, first + kept):
+            start = (frame % self.capacity) * N_PHASES
+            rows.append(tuple(self.timings[start:start + N_PHASES]))
+        return rows
+
+    def percentiles(self, *quantiles: float) -> Dict[str, Tuple[int, ...]]:
+        """Returns, for each phase and for the whole frame, the given
+        quantiles (between 0 and 1) of its timings in ns.
+        """
+        rows = self.rows()
+        if not rows:
+            return {}
+        columns = list(zip(*rows)) + [tuple(sum(row) for row in rows)]
+        stats = {}
+        for name, column in zip(PHASE_NAMES + ("frame",), columns):
+            ordered = sorted(column)
+            stats[name] = tuple(
+                ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+                for quantile in quantiles
+            )
+        return stats
+
+    def dump_csv(self, filepath: str):
+        """Writes one row per frame kept, with the timing (ns) of every phase.
+        """
+        rows = self.rows()
+        first = self.frames - len(rows)
+        with open(filepath, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(("frame",) + PHASE_NAMES + ("total",))
+            for frame, row in enumerate(rows, start = first):
+                writer.writerow((frame,) + row + (sum(row),))
+
+class ProfilerOverlay:
+    """Shows p50/p99 per phase and a histogram of frame times on top
+    of the game. The text is only re-rendered every `refresh_every`
+    frames, so the overlay costs little more than one blit.
+    """
+    def __init__(   self,
+                    profiler: FrameProfiler,
+                    font: pygame.font.Font,
+                    position: Tuple[int, int] = (10, 10),
+                    refresh_every: int = 15):
+        self.profiler = profiler
+        self.font = font
+        self.position = position
+        self.refresh_every = refresh_every
+        self.visible = False
+        self.surface = None
+        self.rendered_at = -refresh_every
+
+    def toggle(self):
+        """Shows the overlay if it's hidden, hides it otherwise.
+        """
+        self.visible = not self.visible
+
+    def _render(self) -> pygame.Surface:
+        stats = self.profiler.percentiles(0.5, 0.99)
+        line_height = self.font.get_linesize()
+        lines = [("phase", "p50 us", "p99 us")] + [
+            (name, f"{p50 / 1000:.1f}", f"{p99 / 1000:.1f}")
+            for name, (p50, p99) in stats.items()
+        ]
+        # one column for the names, then two right-aligned ones
+        column_width = self.font.size("00000.0 ")[0]
+        name_width = max(self.font.size(line[0])[0] for line in lines) + 10
+        width = name_width + 2 * column_width + 10
+        histogram_height = 60
+        surface = pygame.Surface((width, line_height * len(lines) + histogram_height + 15))
+        surface.fill(OVERLAY_COLOR)
+        for i, (name, p50, p99) in enumerate(lines):
+            y = 5 + i * line_height
+            surface.blit(self.font.render(name, True, TEXT_COLOR), (5, y))
+            for column, text in enumerate((p50, p99), start = 1):
+                rendered = self.font.render(text, True, TEXT_COLOR)
+                right = 5 + name_width + column * column_width
+                surface.blit(rendered, (right - rendered.get_width(), y))
+
+        # frame time histogram, 1 ms per bin up to 50 ms
+        bins = [0] * 50
+        for row in self.profiler.rows():
+            bins[min(49, sum(row) // 1_000_000)] += 1
+        tallest = max(bins) or 1
+        bin_width = max(1, (width - 10) // len(bins))
+        bottom = surface.get_height() - 5
+        for i, count in enumerate(bins):
+            height = count * histogram_height // tallest
+            pygame.draw.rect(
+                surface,
+                HISTOGRAM_COLOR,
+                (5 + i * bin_width, bottom - height, bin_width, height)
+            )
+        return surface
+
+    def draw(self, screen: pygame.Surface) -> pygame.Rect:
+        """Draws the overlay if it's visible.
+
+        Returns
+        -------
+        pygame.Rect
+            Area covered (empty when hidden).
+        """
+        if not self.visible:
+            return pygame.Rect(self.position, (0, 0))
+        if self.surface is None or self.profiler.frames - self.rendered_at >= self.refresh_every:
+            self.surface = self._render()
+            self.rendered_at = self.profiler.frames
+        return screen.blit(self.surface, self.position)
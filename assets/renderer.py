@@ -0,0 +1,246 @@
+# renderer.py
+
+# standard library dependencies
+from typing import Dict, List, Tuple, Union
+
+# external dependencies
+import pygame
+
+# local dependencies
+from .background import BACKGROUND_COLOR
+from .chaos import MirrorView
+from .game_state import GameState
+from .hud import ScoreHUD
+from .profiler import (
+    FrameProfiler,
+    ERASE,
+    BACKGROUND_DRAW,
+    DINO_DRAW,
+    OBSTACLES_DRAW,
+    SCORE_DRAW,
+    DISPLAY_UPDATE
+)
+
+# anything that moved further than this in one tick was teleported
+# (respawned, wrapped around...) and isn't interpolated
+MAX_INTERPOLATED_DISTANCE = 100
+
+Position = Tuple[int, int]
+
+class PositionHistory:
+    """Positions of the moving game elements before the last tick, so
+    that frames drawn between two ticks can interpolate between them.
+    """
+    def __init__(self):
+        self.background: Union[List[float], None] = None
+        self.dino: Union[Position, None] = None
+        self.obstacles: Dict[int, Position] = {}
+
+    def capture(self, game_state: GameState):
+        """Remembers the current positions; call it right before `step`.
+
+        Parameters
+        ----------
+        game_state : GameState
+            Game about to be stepped.
+        """
+        self.background = game_state.background.positions()
+        dino_avatar = game_state.dino_avatar
+        # only the jump moves the dino; other changes in position
+        # come with a change of pose and shouldn't be blended
+        self.dino = dino_avatar.rect.topleft if dino_avatar.is_jumping else None
+        self.obstacles = {
+            id(obstacle): obstacle.rect.topleft for obstacle in game_state.obstacles
+        }
+
+def interpolation_offset(   previous: Union[Position, None],
+                            current: Position,
+                            alpha: float) -> Position:
+    """Returns the shift from `current` to the position `alpha` of
+    the way from `previous` to `current`.
+    """
+    if previous is None:
+        return (0, 0)
+    dx = previous[0] - current[0]
+    dy = previous[1] - current[1]
+    if abs(dx) > MAX_INTERPOLATED_DISTANCE or abs(dy) > MAX_INTERPOLATED_DISTANCE:
+        return (0, 0)
+    return (round(dx * (1 - alpha)), round(dy * (1 - alpha)))
+
+def draw_game(  game_state: GameState,
+                screen: pygame.Surface,
+                score_hud: ScoreHUD,
+                history: Union[PositionHistory, None] = None,
+                alpha: float = 1.0,
+                profiler: Union[FrameProfiler, None] = None,
+                view: Union[MirrorView, None] = None) -> List[pygame.Rect]:
+    """Draws the current state of the game on the screen,
+    on top of whatever is already there.
+
+    Parameters
+    ----------
+    game_state : GameState
+        Game to draw.
+    screen : pygame.Surface
+        Game screen.
+    score_hud : ScoreHUD
+        Display for the score.
+    history : PositionHistory, optional
+        Positions before the last tick; if given, moving elements are
+        drawn `alpha` of the way from those to their current positions.
+    alpha : float, optional
+        How far past the previous tick to draw, by default 1.0 (the current tick).
+    profiler : FrameProfiler, optional
+        If given, times each element's drawing.
+    view : MirrorView, optional
+        If given, the game (but not the score) is drawn mirrored through
+        it; the dino is then drawn with the obstacles, in one call
+        timed as the obstacles' drawing.
+
+    Returns
+    -------
+    List[pygame.Rect]
+        Areas that were drawn on.
+    """
+    dino_avatar = game_state.dino_avatar
+    if history is None or alpha >= 1.0:
+        history = PositionHistory()
+    dino_offset = (0, 0)
+    if dino_avatar.is_jumping:
+        dino_offset = interpolation_offset(history.dino, dino_avatar.rect.topleft, alpha)
+
+    # the background layers are opaque, so they go first
+    if view is None:
+        rects = game_state.background.draw(screen, history.background, alpha)
+    else:
+        rects = view.draw_background(game_state.background, screen, history.background, alpha)
+    if profiler is not None:
+        profiler.mark(BACKGROUND_DRAW)
+    if view is None:
+        rects.append(dino_avatar.draw_rect().move(dino_offset))
+        dino_avatar.draw(screen, dino_offset)
+    else:
+        x, y = dino_avatar.rect.topleft
+        sprites = [(dino_avatar.image, (x + dino_offset[0], y + dino_offset[1]))]
+    if profiler is not None:
+        profiler.mark(DINO_DRAW)
+    for obstacle in game_state.obstacles:
+        offset = interpolation_offset(
+            history.obstacles.get(id(obstacle)),
+            obstacle.rect.topleft,
+            alpha
+        )
+        if view is None:
+            obstacle.draw(screen, offset)
+            rects.append(obstacle.draw_rect().move(offset))
+        else:
+            x, y = obstacle.rect.topleft
+            sprites.append((obstacle.image, (x + offset[0], y + offset[1])))
+    if view is not None:
+        rects.extend(view.draw(screen, sprites))
+    if profiler is not None:
+        profiler.mark(OBSTACLES_DRAW)
+    rects.append(
+        score_hud.draw(
+            game_state.score,
+            screen
+        )
+    )
+    if profiler is not None:
+        profiler.mark(SCORE_DRAW)
+    return rects
+
+class DirtyRectRenderer:
+    """Draws the game by only erasing and pushing to the display
+    the parts of the screen that changed.
+
+    Every frame, the areas drawn on during the previous frame are
+    filled with the background color, the game is drawn again, and
+    only the old and new areas are passed to `pygame.display.update`.
+    The background's bands are skipped when erasing (they're opaque
+    and drawn first) and only counted once.
+    When those areas add up to more than `max_dirty_fraction` of the
+    screen, a full refresh is cheaper and is done instead.
+    """
+    def __init__(   self,
+                    screen: pygame.Surface,
+                    score_hud: ScoreHUD,
+                    max_dirty_fraction: float = 0.5):
+        """
+        Parameters
+        ----------
+        screen : pygame.Surface
+            Game screen.
+        score_hud : ScoreHUD
+            Display for the score.
+        max_dirty_fraction : float, optional
+            Fraction of the screen above which a full refresh is done, by default 0.5.
+        """
+        self.screen = screen
+        self.score_hud = score_hud
+        self.max_dirty_area = max_dirty_fraction * screen.get_width() * screen.get_height()
+        self.previous_rects: List[pygame.Rect] = []
+        self.full_refresh = True
+        # `FrameProfiler` timing the phases of `render`, if any
+        self.profiler: Union[FrameProfiler, None] = None
+        # drawn on top of the game; each has a `draw(screen) -> pygame.Rect`
+        self.overlays = []
+        # `MirrorView` the game is drawn through (chaos mode), if any
+        self.view: Union[MirrorView, None] = None
+
+    def invalidate(self):
+        """Forces a full refresh on the next frame, e.g. after
+        something else (like the menu) drew on the screen.
+        """
+        self.full_refresh = True
+
+    def render( self,
+                game_state: GameState,
+                history: Union[PositionHistory, None] = None,
+                alpha: float = 1.0) -> List[pygame.Rect]:
+        """Draws `game_state` and updates the display.
+
+        Parameters
+        ----------
+        game_state : GameState
+            Game to draw.
+        history : PositionHistory, optional
+            Positions before the last tick, to interpolate from.
+        alpha : float, optional
+            How far past the previous tick to draw, by default 1.0 (the current tick).
+
+        Returns
+        -------
+        List[pygame.Rect]
+            Areas pushed to the display (the whole screen for a full refresh).
+        """
+        screen_rect = self.screen.get_rect()
+        if self.view is None:
+            bands = game_state.background.draw_rects(screen_rect.width)
+        else:
+            bands = self.view.background_rects(game_state.background)
+        previous_rects = [rect for rect in self.previous_rects if rect not in bands]
+        if self.full_refresh:
+            self.screen.fill(BACKGROUND_COLOR)
+        else:
+            for rect in previous_rects:
+                self.screen.fill(BACKGROUND_COLOR, rect)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.mark(ERASE)
+        drawn = draw_game(game_state, self.screen, self.score_hud, history, alpha, profiler, self.view)
+        for overlay in self.overlays:
+            drawn.append(overlay.draw(self.screen))
+        rects = [rect.clip(screen_rect) for rect in drawn]
+        dirty_rects = previous_rects + rects
+        self.previous_rects = rects
+        dirty_area = sum(rect.width * rect.height for rect in dirty_rects)
+        if self.full_refresh or dirty_area > self.max_dirty_area:
+            self.full_refresh = False
+            pygame.display.update()
+            dirty_rects = [screen_rect]
+        else:
+            pygame.display.update(dirty_rects)
+        if profiler is not None:
+            profiler.mark(DISPLAY_UPDATE)
+        return dirty_rects
@@ -0,0 +1,197 @@
+# replay.py
+
+# standard library dependencies
+import struct
+from typing import Iterator, List, Tuple
+
+# local dependencies
+from .game_state import GameState, NOOP, JUMP, DUCK
+from .sprites import Sprites
+
+# file layout: header, then one varint per run of identical actions,
+# holding (run length << 2) | action
+MAGIC = b"DINO"
+# version 2: collisions compare the sprites' pixels (version 1 replays
+# were recorded with the old points-of-interest test);
+# version 3: obstacles come from `SpawnScheduler`;
+# version 4: obstacles are swept above `SWEEP_SPEED`
+VERSION = 4
+HEADER = struct.Struct("<4sBQHI")
+ACTIONS = (NOOP, JUMP, DUCK)
+
+def encode_varint(value: int) -> bytes:
+    """Encodes a non-negative integer 7 bits at a time (LEB128).
+    """
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+def decode_varints(data: bytes) -> Iterator[int]:
+    """Decodes consecutive LEB128 integers.
+    """
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+    if shift:
+        raise ValueError("truncated replay")
+
+class Replay:
+    """Everything needed to play a game again: its seed, its starting
+    game speed and the action (UP/DOWN state) of every tick, stored
+    as runs of identical actions.
+    """
+    def __init__(   self,
+                    seed: int,
+                    game_speed: int = 15,
+                    runs: List[Tuple[int, int]] = None,
+                    score: int = 0):
+        """
+        Parameters
+        ----------
+        seed : int
+            Seed of the recorded game.
+        game_speed : int, optional
+            Starting game speed of the recorded game, by default 15.
+        runs : List[Tuple[int, int]], optional
+            (action, number of ticks) pairs, by default none.
+        score : int, optional
+            Final score claimed for the recorded game, by default 0.
+        """
+        self.seed = seed
+        self.game_speed = game_speed
+        self.runs = [] if runs is None else runs
+        self.score = score
+
+    def __len__(self) -> int:
+        return sum(length for _, length in self.runs)
+
+    def actions(self) -> Iterator[int]:
+        """Yields the action of every tick, in order.
+        """
+        for action, length in self.runs:
+            for _ in range(length):
+                yield action
+
+    def to_bytes(self) -> bytes:
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.game_speed, self.score)
+        return header + b"".join(
+            encode_varint(length << 2 | action) for action, length in self.runs
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        magic, version, seed, game_speed, score = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a dino_runner replay (or an unsupported version)")
+        runs = []
+        for value in decode_varints(data[HEADER.size:]):
+            action = value & 0b11
+            if action not in ACTIONS:
+                raise ValueError(f"unknown action {action} in replay")
+            runs.append((action, value >> 2))
+        return cls(seed, game_speed, runs, score)
+
+    def save(self, filepath: str):
+        with open(filepath, "wb") as replay_file:
+            replay_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, filepath: str) -> "Replay":
+        with open(filepath, "rb") as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+class ReplayRecorder:
+    """Records the actions fed to a game, one tick at a time.
+    """
+    def __init__(self, game_state: GameState):
+        """
+        Parameters
+        ----------
+        game_state : GameState
+            Game being recorded, from its first tick.
+        """
+        self.game_state = game_state
+        self.reset()
+
+    def reset(self):
+        """Starts a new recording, e.g. after the game was reset.
+        """
+        self.replay = Replay(self.game_state.seed, self.game_state.initial_game_speed)
+
+    def record(self, action: int):
+        """Appends the action of one tick.
+        """
+        runs = self.replay.runs
+        if runs and runs[-1][0] == action:
+            runs[-1] = (action, runs[-1][1] + 1)
+        else:
+            runs.append((action, 1))
+        self.replay.score = self.game_state.score
+
+    def step(self, action: int) -> bool:
+        """Records `action` and feeds it to the game.
+
+        Returns
+        -------
+        bool
+            Whether the game is over (see `GameState.step`).
+        """
+        game_over = self.game_state.step(action)
+        self.record(action)
+        return game_over
+
+def simulate(replay: Replay, sprites: Sprites) -> GameState:
+    """Plays a replay again headlessly, as fast as the CPU allows.
+
+    Parameters
+    ----------
+    replay : Replay
+        Replay to play.
+    sprites : Sprites
+        Images used by the game elements (see `load_sprites`).
+
+    Returns
+    -------
+    GameState
+        The game after its last recorded tick.
+    """
+    game_state = GameState(
+        sprites,
+        game_speed = replay.game_speed,
+        seed = replay.seed
+    )
+    for action in replay.actions():
+        if game_state.step(action):
+            break
+    return game_state
+
+def verify(replay: Replay, sprites: Sprites) -> bool:
+    """Checks a claimed score by playing the replay again.
+
+    Parameters
+    ----------
+    replay : Replay
+        Replay to check.
+    sprites : Sprites
+        Images used by the game elements (see `load_sprites`).
+
+    Returns
+    -------
+    bool
+        Whether the game ends, on its last recorded tick, with the claimed score.
+    """
+    game_state = simulate(replay, sprites)
+    return game_state.game_over \
+        and game_state.ticks == len(replay) \
+        and game_state.score == replay.score
@@ -0,0 +1,235 @@
+# rollout.py
+
+# standard library dependencies
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import List, Tuple, Union
+
+# external dependencies
+import numpy as np
+
+# local dependencies
+from .batch_game_state import BatchGameState
+from .sprites import load_sprites
+
+# rewards written by the workers
+REWARD_ALIVE = 1.0
+REWARD_COLLISION = -1.0
+
+def _attach(name: str, shape: Tuple[int, ...], dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """Opens an existing shared memory block as a NumPy array.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+def _worker(connection,
+            names: Tuple[str, str, str, str],
+            total_games: int,
+            start: int,
+            stop: int,
+            seed_sequence: np.random.SeedSequence):
+    """Steps the games `start:stop` every time the parent asks to,
+    reading actions from and writing results to shared memory.
+    """
+    actions_name, observations_name, rewards_name, dones_name = names
+    blocks = []
+    block, actions = _attach(actions_name, (total_games,), np.int8)
+    blocks.append(block)
+    block, observations = _attach(
+        observations_name,
+        (total_games, BatchGameState.OBSERVATION_SIZE),
+        np.float32
+    )
+    blocks.append(block)
+    block, rewards = _attach(rewards_name, (total_games,), np.float32)
+    blocks.append(block)
+    block, dones = _attach(dones_name, (total_games,), np.bool_)
+    blocks.append(block)
+
+    # this worker's own shard of every array
+    actions = actions[start:stop]
+    observations = observations[start:stop]
+    rewards = rewards[start:stop]
+    dones = dones[start:stop]
+
+    seeds = seed_sequence.generate_state(stop - start, dtype=np.uint64)
+    batch = BatchGameState(
+        load_sprites(),
+        stop - start,
+        seeds = [int(seed) for seed in seeds]
+    )
+    batch.observe(observations)
+    connection.send(True)
+
+    try:
+        while True:
+            command = connection.recv()
+            if command == "step":
+                batch.step(actions)
+                np.copyto(dones, batch.game_over)
+                np.copyto(
+                    rewards,
+                    np.where(dones, REWARD_COLLISION, REWARD_ALIVE)
+                )
+                # finished games restart right away, like `menu` restarting `main`
+                if dones.any():
+                    batch.reset(dones.copy())
+                batch.observe(observations)
+            elif command == "reset":
+                batch.reset()
+                batch.observe(observations)
+            else:
+                break
+            connection.send(True)
+    finally:
+        # drop the views before closing the blocks they point into
+        del actions, observations, rewards, dones
+        for block in blocks:
+            block.close()
+
+class RolloutRunner:
+    """Runs many games sharded over worker processes.
+
+    Actions, observations, rewards and done flags live in preallocated
+    shared memory, so a step only sends a short command to each worker;
+    the NumPy arrays exposed by the runner are views of that memory.
+    Games that end are reset in place by their worker, and the
+    observation written for them is the first one of the new game. If
+    a worker dies, the next call raises `RuntimeError` (and the runner
+    is closed) instead of waiting for it.
+    """
+    def __init__(   self,
+                    n_games: int,
+                    n_workers: Union[int, None] = None,
+                    seed: int = 0):
+        """
+        Parameters
+        ----------
+        n_games : int
+            Total number of games.
+        n_workers : int, optional
+            Number of worker processes, by default one per CPU.
+        seed : int, optional
+            Seed from which every worker's seeds are derived, by default 0.
+        """
+        if n_workers is None:
+            n_workers = mp.cpu_count()
+        n_workers = max(1, min(n_workers, n_games))
+        self.n_games = n_games
+        self.n_workers = n_workers
+
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.actions = self._allocate((n_games,), np.int8)
+        self.observations = self._allocate(
+            (n_games, BatchGameState.OBSERVATION_SIZE),
+            np.float32
+        )
+        self.rewards = self._allocate((n_games,), np.float32)
+        self.dones = self._allocate((n_games,), np.bool_)
+        names = tuple(block.name for block in self._blocks)
+
+        bounds = np.linspace(0, n_games, n_workers + 1).astype(int)
+        seed_sequences = np.random.SeedSequence(seed).spawn(n_workers)
+        self._connections = []
+        self._processes = []
+        for start, stop, seed_sequence in zip(bounds[:-1], bounds[1:], seed_sequences):
+            parent_connection, child_connection = mp.Pipe()
+            process = mp.Process(
+                target=_worker,
+                args=(child_connection, names, n_games, int(start), int(stop), seed_sequence),
+                daemon=True
+            )
+            process.start()
+            # only the worker holds its end, so the pipe closes when it dies
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+        self._wait()
+
+    def _allocate(self, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self._blocks.append(block)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.fill(0)
+        return array
+
+    def _broadcast(self, command: str):
+        for connection, process in zip(self._connections, self._processes):
+            try:
+                connection.send(command)
+            except OSError:
+                self._worker_died(process)
+
+    def _wait(self):
+        for connection, process in zip(self._connections, self._processes):
+            try:
+                connection.recv()
+            except (EOFError, OSError):
+                self._worker_died(process)
+
+    def _worker_died(self, process: mp.Process):
+        """Closes the runner and raises the error of a worker that stopped.
+        """
+        process.join()
+        exitcode = process.exitcode
+        self.close()
+        raise RuntimeError(f"a rollout worker stopped (exit code {exitcode})")
+
+    def step(self, actions: Union[np.ndarray, None] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Advances every game by one tick.
+
+        Parameters
+        ----------
+        actions : np.ndarray, optional
+            One action per game; if omitted, whatever was already
+            written to `actions` is used.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            The (shared) observations, rewards and done flags.
+        """
+        if actions is not None:
+            np.copyto(self.actions, actions, casting="unsafe")
+        self._broadcast("step")
+        self._wait()
+        return self.observations, self.rewards, self.dones
+
+    def reset(self) -> np.ndarray:
+        """Restarts every game.
+
+        Returns
+        -------
+        np.ndarray
+            The (shared) observations.
+        """
+        self._broadcast("reset")
+        self._wait()
+        return self.observations
+
+    def close(self):
+        """Stops the workers and frees the shared memory.
+        """
+        if not self._blocks:
+            return
+        for connection, process in zip(self._connections, self._processes):
+            try:
+                connection.send("close")
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join()
+        for connection in self._connections:
+            connection.close()
+        del self.actions, self.observations, self.rewards, self.dones
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,215 @@
+# snapshot.py
+
+# standard library dependencies
+import struct
+from functools import partial
+from typing import Any, NamedTuple, Tuple
+
+# external dependencies
+import pygame
+
+# local dependencies
+from .dino_avatar import X_POSITION
+from .obstacles import SmallCactus, LargeCactus, Bird
+from .spawn_scheduler import SpawnEvent
+
+# game: ticks, score, game_speed, seed, game_over
+GAME = "qqqq?"
+# next spawn: tick, kind, variant, y
+NEXT_SPAWN = "qbbh"
+# dino: y, image id, is_running, is_ducking, is_jumping, can_jump,
+# step_index, jump_velocity, jump_tick, jump_start_y (its rect is the
+# image's, at `X_POSITION` and y)
+DINO = "iH????qdii"
+# one obstacle: image id, x, y, image_index (empty slots are zeros)
+OBSTACLE = "Hiiq"
+
+class GameSnapshot(NamedTuple):
+    """Saved state of a `GameState` (see `GameState.snapshot`).
+    """
+    # every field except the random number generators, packed by `SnapshotLayout`
+    record: bytes
+    # `getstate()` of the game's random number generators; shared by
+    # every snapshot taken while they didn't change
+    rng_states: Tuple[Any, Any]
+
+# builds a `GameSnapshot` from a (record, rng_states) pair, skipping the
+# argument handling of its generated `__new__`
+new_snapshot = partial(tuple.__new__, GameSnapshot)
+
+class SnapshotLayout:
+    """Fixed layout of the records of one game's snapshots.
+
+    Every mutable field of the game goes into one `struct` record:
+    numbers as they are, images as ids (indices into the sprites'
+    lists) and obstacles as (image id, x, y, image index) in
+    `max_obstacles` slots after a header, as many as the game's spawn
+    scheduler can put on screen at once. The background layers are
+    saved as their x-positions, so the record's size depends on how
+    many the game has.
+    """
+    def __init__(self, game_state):
+        """
+        Parameters
+        ----------
+        game_state : GameState
+            Game whose snapshots this layout packs.
+        """
+        sprites = game_state.sprites
+        layers = len(game_state.background.layers)
+        header = "<" + GAME + "d" * layers + NEXT_SPAWN + DINO + "B"
+        # the obstacle count is the header's last byte
+        self.count_offset = struct.calcsize(header) - 1
+        # where each part of the header is in an unpacked record (the
+        # formats have one character per value)
+        game_end = len(GAME)
+        self.layer_values = slice(game_end, game_end + layers)
+        self.next_spawn_values = slice(game_end + layers, game_end + layers + len(NEXT_SPAWN))
+        self.dino_values = slice(self.next_spawn_values.stop, self.next_spawn_values.stop + len(DINO))
+        self.slot_values = slice(self.dino_values.stop + 1, None)
+        self.max_obstacles = game_state.spawn_scheduler.max_obstacles(
+            game_state.screen_width, game_state.initial_game_speed
+        )
+        # whole records with `count` obstacles (and zeros for the empty
+        # slots), indexed by `count`, so a record is packed or unpacked
+        # in one call
+        slot_size = struct.calcsize("<" + OBSTACLE)
+        self.records = [
+            struct.Struct(header + OBSTACLE * count + f"{slot_size * (self.max_obstacles - count)}x")
+            for count in range(self.max_obstacles + 1)
+        ]
+        self.size = self.records[0].size
+        # the dino's images, referenced by their index
+        self.dino_images = tuple(
+            sprites.running_images + sprites.ducking_images + sprites.jumping_images
+        )
+        self.dino_image_ids = {image: i for i, image in enumerate(self.dino_images)}
+        self.dino_sizes = tuple(image.get_size() for image in self.dino_images)
+        # the obstacles' images, referenced by their index, each with
+        # what an obstacle showing it is made of: its class, the images
+        # it's acquired with and the size of its rect (a bird's stays
+        # the size of its first image)
+        self.obstacle_frames = tuple(
+            [(SmallCactus, image, image, *image.get_size()) for image in sprites.small_cactus_images]
+            + [(LargeCactus, image, image, *image.get_size()) for image in sprites.large_cactus_images]
+            + [
+                (Bird, image, sprites.bird_images, *sprites.bird_images[0].get_size())
+                for image in sprites.bird_images
+            ]
+        )
+        self.obstacle_image_ids = {
+            frame[1]: i for i, frame in enumerate(self.obstacle_frames)
+        }
+
+    def pack(self, game_state) -> bytes:
+        """Returns the record of the current state of `game_state`.
+        """
+        obstacles = game_state.obstacles
+        count = len(obstacles)
+        if count > self.max_obstacles:
+            raise RuntimeError(
+                f"can't save more than {self.max_obstacles} obstacles, the game has {count}"
+            )
+        slots = []
+        image_ids = self.obstacle_image_ids
+        for obstacle in obstacles:
+            rect = obstacle.rect
+            slots += (
+                image_ids[obstacle.image],
+                rect.x,
+                rect.y,
+                obstacle.image_index if type(obstacle) is Bird else 0
+            )
+
+        dino_avatar = game_state.dino_avatar
+        return self.records[count].pack(
+            game_state.ticks,
+            game_state.score,
+            game_state.game_speed,
+            game_state.seed,
+            game_state.game_over,
+            *[layer.x for layer in game_state.background.layers],
+            *game_state.next_spawn,
+            dino_avatar.rect.y,
+            self.dino_image_ids[dino_avatar.image],
+            dino_avatar.is_running,
+            dino_avatar.is_ducking,
+            dino_avatar.is_jumping,
+            dino_avatar.can_jump,
+            dino_avatar.step_index,
+            dino_avatar.jump_velocity,
+            dino_avatar.jump_tick,
+            dino_avatar.jump_start_y,
+            count,
+            *slots
+        )
+
+    def unpack(self, game_state, record: bytes):
+        """Puts `game_state` back to the state saved in `record`,
+        reusing its game elements.
+        """
+        count = record[self.count_offset]
+        values = self.records[count].unpack(record)
+        (
+            game_state.ticks,
+            game_state.score,
+            game_state.game_speed,
+            game_state.seed,
+            game_state.game_over
+        ) = values[:5]
+        for layer, x in zip(game_state.background.layers, values[self.layer_values]):
+            layer.x = x
+        # the next spawn only changes when an obstacle spawns
+        next_spawn = values[self.next_spawn_values]
+        if game_state.next_spawn != next_spawn:
+            game_state.next_spawn = SpawnEvent._make(next_spawn)
+
+        dino_avatar = game_state.dino_avatar
+        (
+            y,
+            image_id,
+            dino_avatar.is_running,
+            dino_avatar.is_ducking,
+            dino_avatar.is_jumping,
+            dino_avatar.can_jump,
+            dino_avatar.step_index,
+            dino_avatar.jump_velocity,
+            dino_avatar.jump_tick,
+            jump_start_y
+        ) = values[self.dino_values]
+        image = self.dino_images[image_id]
+        # the avatar's rects are never modified (see `DinoAvatar`), so a
+        # new one is fine; most restores leave it where it is
+        if dino_avatar.image is not image or dino_avatar.rect.y != y:
+            dino_avatar.image = image
+            dino_avatar.rect = pygame.Rect(X_POSITION, y, *self.dino_sizes[image_id])
+        # the jump's frames always go with its start
+        if dino_avatar.jump_start_y != jump_start_y:
+            dino_avatar.jump_start_y = jump_start_y
+            dino_avatar.jump_frames = dino_avatar.animation.jump_frames(jump_start_y)
+
+        # obstacles of the right class are reused where they are, the
+        # others go back to (or come from) the pool
+        obstacles = game_state.obstacles
+        pool = game_state.obstacle_pool
+        while len(obstacles) > count:
+            pool.release(obstacles.pop())
+        kept = len(obstacles)
+        obstacle_frames = self.obstacle_frames
+        # the slots, four values at a time
+        slots = iter(values[self.slot_values])
+        for slot, (image_id, x, y, image_index) in enumerate(zip(slots, slots, slots, slots)):
+            obstacle_class, image, images, width, height = obstacle_frames[image_id]
+            if slot < kept and type(obstacles[slot]) is obstacle_class:
+                obstacle = obstacles[slot]
+            else:
+                obstacle = pool.acquire(obstacle_class, images)
+                if slot < kept:
+                    pool.release(obstacles[slot])
+                    obstacles[slot] = obstacle
+                else:
+                    obstacles.append(obstacle)
+            obstacle.image = image
+            if obstacle_class is Bird:
+                obstacle.image_index = image_index
+            obstacle.rect.update(x, y, width, height)
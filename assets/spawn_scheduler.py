@@ -0,0 +1,129 @@
+# spawn_scheduler.py
+
+# standard library dependencies
+import math
+import random
+from typing import NamedTuple
+
+# local dependencies
+from .dino_avatar import jump_arc
+from .sprites import Sprites
+
+# obstacle kinds
+SMALL_CACTUS = 0
+LARGE_CACTUS = 1
+BIRD = 2
+
+# y-position of each kind of obstacle
+OBSTACLE_Y = (325, 300, 250)
+
+# ticks a jump lasts (the dino lands on tick `len(offsets)` of its
+# `jump_arc`); obstacles are spaced so that it can land between two of them
+JUMP_TICKS = len(jump_arc().offsets)
+
+class SpawnEvent(NamedTuple):
+    """One obstacle to add to the game.
+    """
+    tick: int
+    kind: int
+    variant: int
+    y: int
+
+class SpawnScheduler:
+    """Decides when and which obstacles appear, one event ahead.
+
+    Every event is drawn from the game's own random number generator
+    when the previous one is consumed, so the stream of obstacles only
+    depends on the seed (and the game speed at each spawn), not on
+    when obstacles leave the screen or how fast frames are drawn.
+    """
+    def __init__(   self,
+                    sprites: Sprites,
+                    rng: random.Random,
+                    gap_scale: float = 1.0):
+        """
+        Parameters
+        ----------
+        sprites : Sprites
+            Images used by the game (only the obstacles' widths are used).
+        rng : random.Random
+            The game's random number generator.
+        gap_scale : float, optional
+            Multiplies the minimum gap between obstacles, by default 1.0;
+            small values crowd the screen (e.g. for stress tests).
+        """
+        self.rng = rng
+        self.gap_scale = gap_scale
+        # obstacle image widths, indexed by [kind][variant]
+        self.widths = (
+            [image.get_width() for image in sprites.small_cactus_images],
+            [image.get_width() for image in sprites.large_cactus_images],
+            [sprites.bird_images[0].get_width()],
+        )
+
+    def draw_obstacle(self, tick: int) -> SpawnEvent:
+        """Draws a random obstacle to spawn on `tick`.
+        """
+        kind = self.rng.randint(0, 2)
+        variant = 0
+        if kind != BIRD:
+            variant = self.rng.randint(0, len(self.widths[kind])-1)
+        return SpawnEvent(tick, kind, variant, OBSTACLE_Y[kind])
+
+    def first_event(self) -> SpawnEvent:
+        """Returns the first obstacle of a game, spawned on its first tick.
+        """
+        return self.draw_obstacle(1)
+
+    def next_event(self, previous: SpawnEvent, game_speed: int) -> SpawnEvent:
+        """Returns the obstacle that follows `previous`.
+
+        The gap between the two is at least the width of the previous
+        obstacle plus the distance covered during a jump at `game_speed`,
+        and up to twice that.
+
+        Parameters
+        ----------
+        previous : SpawnEvent
+            Event that was just consumed.
+        game_speed : int
+            Game speed when `previous` spawned.
+
+        Returns
+        -------
+        SpawnEvent
+            The next event.
+        """
+        width = self.widths[previous.kind][previous.variant]
+        min_gap = self.gap_scale * (width + JUMP_TICKS * game_speed)
+        min_ticks = max(1, math.ceil(min_gap / game_speed))
+        gap_ticks = min_ticks + self.rng.randint(0, min_ticks)
+        return self.draw_obstacle(previous.tick + gap_ticks)
+
+    def max_obstacles(self, screen_width: int, game_speed: int) -> int:
+        """Returns the most obstacles that can be on screen at once.
+
+        Consecutive obstacles are at least `min_ticks * game_speed`
+        pixels apart (see `next_event`), which only grows with the game
+        speed, so the closest spacing is the one at the slowest speed
+        with the narrowest obstacle. Obstacles live from the right edge
+        of the screen until they are past its left edge.
+
+        Parameters
+        ----------
+        screen_width : int
+            Width of the screen, in pixels.
+        game_speed : int
+            Slowest game speed (the game's initial speed).
+
+        Returns
+        -------
+        int
+            Upper bound of the number of obstacles alive at once.
+        """
+        speed = max(1, game_speed)
+        min_width = min(min(widths) for widths in self.widths)
+        max_width = max(max(widths) for widths in self.widths)
+        min_gap = self.gap_scale * (min_width + JUMP_TICKS * speed)
+        min_spacing = max(1, math.ceil(min_gap / speed)) * speed
+        return (screen_width + max_width) // min_spacing + 1
@@ -0,0 +1,162 @@
+# sprites.py
+
+# standard library dependencies
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
+
+# external dependencies
+import pygame
+
+# local dependencies
+from .atlas import IMAGES_DIRPATH, get_atlas
+
+class Sprites(NamedTuple):
+    """Every image used by the game, grouped the same way
+    the game elements expect them.
+    """
+    running_images: List[pygame.Surface]
+    jumping_images: List[pygame.Surface]
+    ducking_images: List[pygame.Surface]
+    small_cactus_images: List[pygame.Surface]
+    large_cactus_images: List[pygame.Surface]
+    bird_images: List[pygame.Surface]
+    cloud_image: pygame.Surface
+    bg_image: pygame.Surface
+
+@lru_cache(maxsize=None)
+def mask_of(image: pygame.Surface) -> pygame.mask.Mask:
+    """Returns the collision mask (opaque pixels) of `image`,
+    computing it on first use.
+
+    Parameters
+    ----------
+    image : pygame.Surface
+        One of the sprites' images.
+
+    Returns
+    -------
+    pygame.mask.Mask
+        The (shared) mask; don't modify it.
+    """
+    return pygame.mask.from_surface(image)
+
+@lru_cache(maxsize=None)
+def swept_mask(mask: pygame.mask.Mask,
+               dx: int,
+               dy: int,
+               steps: int) -> Tuple[pygame.mask.Mask, int, int]:
+    """Returns the pixels covered by `mask` at `steps` evenly spaced
+    positions of a move by (dx, dy), the last of which is the end of
+    the move (the start isn't included).
+
+    Parameters
+    ----------
+    mask : pygame.mask.Mask
+        Mask that moves (one of the sprites' masks).
+    dx : int
+        Horizontal motion.
+    dy : int
+        Vertical motion.
+    steps : int
+        Number of positions, at least 1.
+
+    Returns
+    -------
+    Tuple[pygame.mask.Mask, int, int]
+        The (shared) swept mask, and the position of its top-left
+        corner relative to `mask` at the end of the move.
+    """
+    # offsets from the end of the move, rounded down like positions on the screen
+    offsets = [
+        (-(dx * (steps - step)) // steps, -(dy * (steps - step)) // steps)
+        for step in range(1, steps + 1)
+    ]
+    left = min(x for x, _ in offsets)
+    top = min(y for _, y in offsets)
+    width, height = mask.get_size()
+    swept = pygame.mask.Mask((
+        width + max(x for x, _ in offsets) - left,
+        height + max(y for _, y in offsets) - top
+    ))
+    for x, y in offsets:
+        swept.draw(mask, (x - left, y - top))
+    return swept, left, top
+
+@lru_cache(maxsize=None)
+def flipped(image: pygame.Surface,
+            flip_x: bool,
+            flip_y: bool) -> pygame.Surface:
+    """Returns `image` mirrored left to right (`flip_x`) and/or upside
+    down (`flip_y`), computing it on first use.
+
+    Parameters
+    ----------
+    image : pygame.Surface
+        One of the sprites' images (or any surface that isn't modified).
+    flip_x : bool
+        Whether to mirror it left to right.
+    flip_y : bool
+        Whether to turn it upside down.
+
+    Returns
+    -------
+    pygame.Surface
+        The (shared) flipped image, in the same format; don't draw on it.
+    """
+    return pygame.transform.flip(image, flip_x, flip_y)
+
+def load_sprites(images_dirpath: str = IMAGES_DIRPATH) -> Sprites:
+    """Loads every image used by the game from the sprite atlas.
+
+    The collision mask of every image is computed too (see `mask_of`).
+    Nothing here needs a display, so this can be used by the headless
+    simulation as well as by the windowed game; call it after
+    `pygame.display.set_mode` to get images in the display's format.
+
+    Parameters
+    ----------
+    images_dirpath : str, optional
+        Path to the `images` folder, by default the one next to this file.
+
+    Returns
+    -------
+    Sprites
+        The loaded images.
+    """
+    atlas = get_atlas(images_dirpath)
+
+    def load(folder: str, filename: str) -> pygame.Surface:
+        image = atlas.get(f"{folder}/{filename}")
+        # computed now rather than on the first collision
+        mask_of(image)
+        return image
+
+    return Sprites(
+        running_images = [
+            load("Dino", "DinoRun1.png"),
+            load("Dino", "DinoRun2.png")
+        ],
+        jumping_images = [
+            load("Dino", "DinoJump.png")
+        ],
+        ducking_images = [
+            load("Dino", "DinoDuck1.png"),
+            load("Dino", "DinoDuck2.png")
+        ],
+        small_cactus_images = [
+            load("Cactus", "SmallCactus1.png"),
+            load("Cactus", "SmallCactus2.png"),
+            load("Cactus", "SmallCactus3.png")
+        ],
+        large_cactus_images = [
+            load("Cactus", "LargeCactus1.png"),
+            load("Cactus", "LargeCactus2.png"),
+            load("Cactus", "LargeCactus3.png")
+        ],
+        bird_images = [
+            load("Bird", "Bird1.png"),
+            load("Bird", "Bird2.png")
+        ],
+        cloud_image = load("Other", "Cloud.png"),
+        bg_image = load("Other", "Track.png")
+    )
@@ -0,0 +1,77 @@
+# timestep.py
+
+# standard library dependencies
+import time
+
+# ticks per second of the original game (`clock.tick(30)`)
+TICK_RATE = 30
+
+class FixedTimestep:
+    """Decides how many simulation ticks to run for the time that
+    passed since the last frame, whatever the frame rate is.
+
+    Elapsed time goes into an accumulator, and each tick takes a fixed
+    amount out of it; what is left over (as a fraction of a tick) is
+    how far the display is between the last two ticks. Time is kept
+    in integer nanoseconds so the accumulator never drifts.
+    """
+    def __init__(   self,
+                    tick_rate: int = TICK_RATE,
+                    max_ticks_per_frame: int = 8):
+        """
+        Parameters
+        ----------
+        tick_rate : int, optional
+            Simulation ticks per second, by default 30.
+        max_ticks_per_frame : int, optional
+            Most ticks run for a single frame, so a long stall (e.g. a
+            dragged window) slows the game down instead of freezing it
+            while it catches up; by default 8.
+        """
+        self.tick_rate = tick_rate
+        self.tick_ns = 1_000_000_000 // tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator_ns = 0
+        self.last_time_ns = None
+
+    def reset(self):
+        """Forgets the time that passed so far.
+        """
+        self.accumulator_ns = 0
+        self.last_time_ns = None
+
+    def ticks_due(self, now_ns: int = None) -> int:
+        """Adds the time since the last call to the accumulator.
+
+        Parameters
+        ----------
+        now_ns : int, optional
+            Current time in nanoseconds, by default `time.perf_counter_ns()`.
+
+        Returns
+        -------
+        int
+            Number of ticks to run before the next frame is drawn.
+        """
+        if now_ns is None:
+            now_ns = time.perf_counter_ns()
+        if self.last_time_ns is None:
+            # the first frame runs exactly one tick
+            self.last_time_ns = now_ns
+            return 1
+        self.accumulator_ns += now_ns - self.last_time_ns
+        self.last_time_ns = now_ns
+        ticks = self.accumulator_ns // self.tick_ns
+        if ticks > self.max_ticks_per_frame:
+            ticks = self.max_ticks_per_frame
+            self.accumulator_ns = 0
+        else:
+            self.accumulator_ns -= ticks * self.tick_ns
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """How far (from 0 to 1) the display is past the last tick,
+        towards the next one.
+        """
+        return self.accumulator_ns / self.tick_ns
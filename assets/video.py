@@ -0,0 +1,468 @@
+# video.py
+
+# standard library dependencies
+import multiprocessing as mp
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import List, Tuple, Union
+
+# external dependencies
+import numpy as np
+import pygame
+
+# local dependencies
+from .background import BACKGROUND_COLOR
+from .chaos import MirrorView
+from .game_state import GameState, SCREEN_HEIGHT, SCREEN_WIDTH
+from .hud import ScoreHUD, get_font
+from .renderer import draw_game
+from .replay import Replay
+from .sprites import Sprites
+from .timestep import TICK_RATE
+
+# what `VideoRecorder.capture` does when every slot of the ring buffer
+# holds a frame the encoder hasn't written yet: skip the new frame, or
+# wait for a free slot
+DROP = "drop"
+BLOCK = "block"
+
+# GIF palette: a 6x6x6 color cube, then 40 grays (the game is mostly gray)
+CUBE_LEVELS = 6
+GRAY_LEVELS = 256 - CUBE_LEVELS ** 3
+LZW_MIN_CODE_SIZE = 8
+# longest frame delay a GIF can hold (an unsigned 16-bit count of centiseconds)
+MAX_GIF_DELAY = 0xFFFF
+MAX_LZW_CODE = 4096
+# added to the encoder process's niceness (where the OS supports it)
+ENCODER_NICENESS = 10
+
+def gif_palette() -> bytes:
+    """Returns the RGB triplets of the palette indexed by `palette_indices`.
+    """
+    cube = [
+        (r * 255 // (CUBE_LEVELS - 1), g * 255 // (CUBE_LEVELS - 1), b * 255 // (CUBE_LEVELS - 1))
+        for r in range(CUBE_LEVELS)
+        for g in range(CUBE_LEVELS)
+        for b in range(CUBE_LEVELS)
+    ]
+    grays = [(level * 255 // (GRAY_LEVELS - 1),) * 3 for level in range(GRAY_LEVELS)]
+    return bytes(channel for color in cube + grays for channel in color)
+
+def to_rgb(pixels: np.ndarray, shifts: Tuple[int, int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Splits 32-bit pixels (with 8-bit channels at `shifts`) into their
+    red, green and blue channels.
+    """
+    return tuple(((pixels >> shift) & 0xFF).astype(np.uint8) for shift in shifts)
+
+def palette_indices(pixels: np.ndarray, shifts: Tuple[int, int, int]) -> np.ndarray:
+    """Returns the index of the closest `gif_palette` color (grays are
+    matched to the grays, other colors to the cube) of every pixel.
+    """
+    r, g, b = (channel.astype(np.uint16) for channel in to_rgb(pixels, shifts))
+    half = 255 // 2
+    cube = ((r * (CUBE_LEVELS - 1) + half) // 255) * CUBE_LEVELS ** 2 \
+        + ((g * (CUBE_LEVELS - 1) + half) // 255) * CUBE_LEVELS \
+        + (b * (CUBE_LEVELS - 1) + half) // 255
+    gray = CUBE_LEVELS ** 3 + (r * (GRAY_LEVELS - 1) + half) // 255
+    return np.where((r == g) & (g == b), gray, cube).astype(np.uint8)
+
+def lzw_encode(indices: bytes) -> bytes:
+    """Compresses 8-bit palette indices as GIF image data (LZW codes,
+    packed from the lowest bit, without the sub-block framing).
+    """
+    clear = 1 << LZW_MIN_CODE_SIZE
+    end = clear + 1
+    table = {}
+    next_code = end + 1
+    code_size = LZW_MIN_CODE_SIZE + 1
+    out = bytearray()
+    buffer = clear
+    bits = code_size
+
+    prefix = indices[0]
+    for index in indices[1:]:
+        key = (prefix << 8) | index
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        buffer |= prefix << bits
+        bits += code_size
+        if next_code < MAX_LZW_CODE:
+            table[key] = next_code
+            next_code += 1
+            # the decoder widens its codes one code later than it adds them
+            if next_code > 1 << code_size:
+                code_size += 1
+        else:
+            buffer |= clear << bits
+            bits += code_size
+            table.clear()
+            next_code = end + 1
+            code_size = LZW_MIN_CODE_SIZE + 1
+        prefix = index
+        if bits >= 64:
+            out += (buffer & 0xFFFFFFFFFFFFFFFF).to_bytes(8, "little")
+            buffer >>= 64
+            bits -= 64
+    buffer |= prefix << bits
+    bits += code_size
+    buffer |= end << bits
+    bits += code_size
+    out += buffer.to_bytes((bits + 7) // 8, "little")
+    return bytes(out)
+
+class GifWriter:
+    """Writes frames of palette indices to an animated GIF, cropping
+    each one to the area that changed since the previous one.
+
+    A frame is written when the next one arrives (its delay is the time
+    between the two), so identical frames just make the previous one
+    last longer.
+    """
+    def __init__(self, path: str, size: Tuple[int, int], last_delay: float):
+        """
+        Parameters
+        ----------
+        path : str
+            GIF file to write.
+        size : Tuple[int, int]
+            Width and height of the frames.
+        last_delay : float
+            How long the last frame stays, in seconds.
+        """
+        self.file = open(path, "wb")
+        self.last_delay = last_delay
+        width, height = size
+        self.file.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF7, 0, 0))
+        self.file.write(gif_palette())
+        # loop forever
+        self.file.write(b"\x21\xFF\x0BNETSCAPE2.0\x03\x01" + struct.pack("<H", 0) + b"\x00")
+        self.previous: Union[np.ndarray, None] = None
+        # (cropped indices, left, top, timestamp) of the frame waiting for its delay
+        self.pending = None
+        self.start = 0.0
+
+    def add(self, indices: np.ndarray, timestamp: float):
+        """Adds a (height, width) frame of palette indices shown at
+        `timestamp` (in seconds).
+        """
+        if self.previous is None:
+            self.start = timestamp
+            crop = (indices, 0, 0)
+        else:
+            changed = indices != self.previous
+            rows = np.flatnonzero(changed.any(axis=1))
+            if len(rows) == 0:
+                return
+            columns = np.flatnonzero(changed.any(axis=0))
+            top, bottom = rows[0], rows[-1] + 1
+            left, right = columns[0], columns[-1] + 1
+            crop = (indices[top:bottom, left:right], int(left), int(top))
+        self.previous = indices
+        self._flush(timestamp)
+        self.pending = crop + (timestamp,)
+
+    def _flush(self, timestamp: float):
+        if self.pending is None:
+            return
+        indices, left, top, pending_timestamp = self.pending
+        # rounded from the start, so that rounding errors don't add up
+        delay = round((timestamp - self.start) * 100) - round((pending_timestamp - self.start) * 100)
+        delay = min(max(delay, 1), MAX_GIF_DELAY)
+        height, width = indices.shape
+        data = lzw_encode(np.ascontiguousarray(indices).tobytes())
+        blocks = b"".join(
+            bytes((len(data[i:i + 255]),)) + data[i:i + 255]
+            for i in range(0, len(data), 255)
+        )
+        self.file.write(
+            # graphic control: keep the previous frame under this one
+            b"\x21\xF9\x04" + struct.pack("<BHBB", 0x04, delay, 0, 0)
+            + b"\x2C" + struct.pack("<HHHHB", left, top, width, height, 0)
+            + bytes((LZW_MIN_CODE_SIZE,)) + blocks + b"\x00"
+        )
+        self.pending = None
+
+    def close(self):
+        if self.pending is not None:
+            self._flush(self.pending[3] + self.last_delay)
+        self.file.write(b"\x3B")
+        self.file.close()
+
+def png_path(path: str, index: int) -> str:
+    """Returns the file of frame `index` of a PNG sequence saved as `path`.
+    """
+    stem, extension = os.path.splitext(path)
+    return f"{stem}_{index:05d}{extension}"
+
+def _encode(names: Tuple[str, str],
+            path: str,
+            shape: Tuple[int, int],
+            capacity: int,
+            shifts: Tuple[int, int, int],
+            last_delay: float,
+            free,
+            filled,
+            stop):
+    """Encoder process: writes the frames of the ring buffer, in order,
+    until `stop` is set and every frame is written.
+    """
+    frames_name, timestamps_name = names
+    frames_block = shared_memory.SharedMemory(name=frames_name)
+    timestamps_block = shared_memory.SharedMemory(name=timestamps_name)
+    frames = np.ndarray((capacity,) + shape, dtype=np.uint32, buffer=frames_block.buf)
+    timestamps = np.ndarray((capacity,), dtype=np.float64, buffer=timestamps_block.buf)
+    height, width = shape
+    # the game loop comes first when they share a CPU
+    if hasattr(os, "nice"):
+        os.nice(ENCODER_NICENESS)
+    gif = path.lower().endswith(".gif")
+    writer = GifWriter(path, (width, height), last_delay) if gif else None
+    read = 0
+    try:
+        while True:
+            if not filled.acquire(timeout=0.05):
+                if stop.is_set():
+                    break
+                continue
+            slot = read % capacity
+            if gif:
+                # converting copies the frame, so its slot can be reused right away
+                indices = palette_indices(frames[slot], shifts)
+                timestamp = timestamps[slot]
+                free.release()
+                writer.add(indices, timestamp)
+            else:
+                rgb = np.dstack(to_rgb(frames[slot], shifts))
+                free.release()
+                image = pygame.image.frombuffer(rgb.tobytes(), (width, height), "RGB")
+                pygame.image.save(image, png_path(path, read))
+            read += 1
+    finally:
+        if writer is not None:
+            writer.close()
+        del frames, timestamps
+        frames_block.close()
+        timestamps_block.close()
+
+class VideoRecorder:
+    """Records the frames presented on a surface (optionally downscaled)
+    to an animated GIF or to a sequence of PNGs.
+
+    `capture` only copies the surface's pixels into a preallocated ring
+    buffer of raw frames in shared memory; a separate process converts
+    and encodes them, so the game loop never waits for the encoding
+    (and doesn't share its interpreter lock). When every slot holds a
+    frame that isn't encoded yet, `policy` decides: `DROP` skips the new
+    frame (for live play: the clip has a gap but the game doesn't
+    stutter), `BLOCK` waits for the encoder (for headless recording:
+    every frame is kept). Frames carry the time they were captured, so
+    the GIF plays at the speed they were shown, gaps included, except
+    the time between `pause` and the next capture (e.g. menus between
+    two games).
+    """
+    def __init__(   self,
+                    surface: pygame.Surface,
+                    path: str,
+                    scale: int = 2,
+                    capacity: int = 32,
+                    policy: str = DROP,
+                    fps: float = 30):
+        """
+        Parameters
+        ----------
+        surface : pygame.Surface
+            Surface to record (usually the screen), 32 bits per pixel.
+        path : str
+            File to write: an animated GIF if it ends with ".gif",
+            otherwise one PNG per frame, numbered (see `png_path`).
+        scale : int, optional
+            Keeps one pixel out of `scale` each way, by default 2.
+        capacity : int, optional
+            Number of frames in the ring buffer, by default 32.
+        policy : str, optional
+            `DROP` or `BLOCK`, by default `DROP`.
+        fps : float, optional
+            Most frames recorded per second, by default 30 (GIF players
+            slow down faster ones); 0 records every captured frame.
+        """
+        if surface.get_bytesize() != 4:
+            raise ValueError(f"can only record 32-bit surfaces, got {surface.get_bitsize()} bits")
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"unknown policy {policy!r}, expected {DROP!r} or {BLOCK!r}")
+        self.surface = surface
+        self.path = path
+        self.scale = scale
+        self.capacity = capacity
+        self.policy = policy
+        self.interval = 1 / fps if fps else 0.0
+        width, height = surface.get_size()
+        self.shape = (height // scale, width // scale)
+
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.frames = self._allocate((capacity,) + self.shape, np.uint32)
+        self.timestamps = self._allocate((capacity,), np.float64)
+        self.free = mp.Semaphore(capacity)
+        self.filled = mp.Semaphore(0)
+        self.stop = mp.Event()
+        self.encoder = mp.Process(
+            target=_encode,
+            args=(
+                tuple(block.name for block in self._blocks),
+                path,
+                self.shape,
+                capacity,
+                surface.get_shifts()[:3],
+                self.interval or 1 / 30,
+                self.free,
+                self.filled,
+                self.stop
+            ),
+            daemon=True
+        )
+        self.encoder.start()
+        # frames written to the ring buffer, and skipped because it was full
+        self.captured = 0
+        self.dropped = 0
+        self.next_capture = 0.0
+        # subtracted from the capture times, so that paused time is left out
+        self.paused_time = 0.0
+        self.paused = False
+        # (shifted) time of the last frame captured
+        self.last_timestamp = 0.0
+
+    def _allocate(self, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self._blocks.append(block)
+        return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    def capture(self, timestamp: Union[float, None] = None) -> bool:
+        """Copies the surface's current frame into the ring buffer.
+
+        Parameters
+        ----------
+        timestamp : float, optional
+            When the frame is shown, in seconds, by default now
+            (`time.perf_counter()`); a headless recording passes game time.
+
+        Returns
+        -------
+        bool
+            Whether the frame was recorded (it isn't if it comes sooner
+            than `fps` allows, or if it was dropped).
+        """
+        now = time.perf_counter() if timestamp is None else timestamp
+        if now < self.next_capture:
+            return False
+        # on schedule, unless the game was paused
+        self.next_capture = max(self.next_capture + self.interval, now)
+        if self.paused:
+            # the clip goes on one frame after the last one before the pause
+            if self.captured:
+                self.paused_time = now - self.last_timestamp - (self.interval or 1 / 30)
+            self.paused = False
+        if self.policy == DROP:
+            if not self.free.acquire(block=False):
+                if not self.encoder.is_alive():
+                    raise RuntimeError(f"the video encoder stopped (exit code {self.encoder.exitcode})")
+                self.dropped += 1
+                return False
+        else:
+            while not self.free.acquire(timeout=0.5):
+                if not self.encoder.is_alive():
+                    raise RuntimeError(f"the video encoder stopped (exit code {self.encoder.exitcode})")
+        slot = self.captured % self.capacity
+        height, width = self.shape
+        scale = self.scale
+        # the surface's rows are contiguous in memory, so its transpose copies fastest
+        pixels = pygame.surfarray.pixels2d(self.surface)
+        np.copyto(self.frames[slot], pixels.T[:height * scale:scale, :width * scale:scale])
+        del pixels
+        self.last_timestamp = now - self.paused_time
+        self.timestamps[slot] = self.last_timestamp
+        self.captured += 1
+        self.filled.release()
+        return True
+
+    def pause(self):
+        """Leaves the time until the next capture out of the clip, so
+        that it resumes right where it stopped.
+        """
+        self.paused = True
+
+    def close(self):
+        """Waits for the encoder to write every captured frame, then
+        frees the ring buffer.
+        """
+        if not self._blocks:
+            return
+        self.stop.set()
+        self.encoder.join()
+        del self.frames, self.timestamps
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+        if self.encoder.exitcode != 0:
+            raise RuntimeError(f"the video encoder failed (exit code {self.encoder.exitcode})")
+
+    def __enter__(self) -> "VideoRecorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def record_replay(  replay: Replay,
+                    sprites: Sprites,
+                    path: str,
+                    scale: int = 2,
+                    tick_rate: int = TICK_RATE,
+                    chaos: bool = False) -> VideoRecorder:
+    """Records a replay to `path` headlessly, as fast as it encodes:
+    every tick is drawn offscreen and captured, waiting for the encoder
+    when it falls behind, with game time as the frames' timestamps.
+
+    Parameters
+    ----------
+    replay : Replay
+        Game to record.
+    sprites : Sprites
+        Images used by the game (see `load_sprites`).
+    path : str
+        File to write (see `VideoRecorder`).
+    scale : int, optional
+        Keeps one pixel out of `scale` each way, by default 2.
+    tick_rate : int, optional
+        Ticks per second of the recorded clip, by default 30 (normal speed).
+    chaos : bool, optional
+        If True, the game is drawn mirrored and upside down, by default False.
+
+    Returns
+    -------
+    VideoRecorder
+        The closed recorder, with its counts of frames.
+    """
+    game_state = GameState(
+        sprites,
+        screen_width = SCREEN_WIDTH,
+        game_speed = replay.game_speed,
+        seed = replay.seed
+    )
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), depth = 32)
+    score_hud = ScoreHUD(get_font(size = 20))
+    view = None
+    if chaos:
+        view = MirrorView(sprites, game_state.background, surface.get_size())
+    with VideoRecorder(surface, path, scale, policy = BLOCK, fps = tick_rate) as recorder:
+        for action in replay.actions():
+            game_over = game_state.step(action)
+            surface.fill(BACKGROUND_COLOR)
+            draw_game(game_state, surface, score_hud, view = view)
+            recorder.capture(game_state.ticks / tick_rate)
+            if game_over:
+                break
+    return recorder
@@ -0,0 +1,93 @@
+# bench_background.py
+"""Cost per frame of the background, before and after the parallax
+layers, with 1 to `MAX_LAYERS` layers.
+
+"Before" is what the renderer used to do for the track and the cloud:
+erase both, blit the (transparent) track image twice and the cloud
+once. "After" scrolls and draws the layers; their bands are opaque, so
+the renderer doesn't erase them. Each layer is one blit of its band,
+so the cost grows with the rows of the screen the layers cover (it is
+not flat in the number of layers); the cost per row shows this.
+
+Usage: `python -m benchmarks.bench_background` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.background import (
+    BACKGROUND_COLOR,
+    MAX_LAYERS,
+    Layer,
+    ParallaxBackground,
+    hills_tile
+)
+from assets.game_state import GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from assets.sprites import load_sprites
+
+FRAMES = 2_000
+
+def best_us_per_frame(function, repeats: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        function()
+        best = min(best, time.perf_counter_ns() - start)
+    return best / FRAMES / 1000
+
+def legacy(screen: pygame.Surface, sprites):
+    bg_image = sprites.bg_image
+    cloud_image = sprites.cloud_image
+    image_width = bg_image.get_width()
+    track_rect = pygame.Rect(0, 380, SCREEN_WIDTH, bg_image.get_height())
+
+    def frames():
+        x_pos_bg = 0
+        cloud_x = SCREEN_WIDTH
+        for _ in range(FRAMES):
+            # erase last frame's track and cloud
+            screen.fill(BACKGROUND_COLOR, track_rect)
+            screen.fill(BACKGROUND_COLOR, cloud_image.get_rect(topleft = (cloud_x, 75)))
+            if x_pos_bg <= -image_width:
+                x_pos_bg = 0
+            x_pos_bg -= 16
+            cloud_x = cloud_x - 16 if cloud_x > -100 else SCREEN_WIDTH
+            screen.blit(bg_image, (x_pos_bg, 380))
+            screen.blit(bg_image, (image_width + x_pos_bg, 380))
+            screen.blit(cloud_image, (cloud_x, 75))
+    return frames
+
+def layered(screen: pygame.Surface, background: ParallaxBackground):
+    def frames():
+        for _ in range(FRAMES):
+            background.update(16)
+            background.draw(screen)
+    return frames
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+    game_state = GameState(sprites, seed = 0)
+    # the game's layers, nearest first, and a farther range of hills
+    far_hills = Layer(hills_tile(2000, 40, seed = 1), 250, 0.1)
+    layers = list(reversed(game_state.background.layers)) + [far_hills]
+    layers = layers[:MAX_LAYERS]
+
+    print(f"background cost per frame (best of 5 x {FRAMES} frames):")
+    print(f"{'before':>10}: {best_us_per_frame(legacy(screen, sprites)):7.1f} µs (track + cloud)")
+    for count in range(1, len(layers) + 1):
+        background = ParallaxBackground(list(reversed(layers[:count])))
+        rows = sum(rect.height for rect in background.draw_rects(SCREEN_WIDTH))
+        elapsed = best_us_per_frame(layered(screen, background))
+        print(f"{count:>3} layers: {elapsed:7.1f} µs ({rows} rows of the screen, {elapsed / rows:.2f} µs/row)")
+
+if __name__ == '__main__':
+    main()
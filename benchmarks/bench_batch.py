@@ -0,0 +1,135 @@
+# bench_batch.py
+"""Step rates of the vectorized `BatchGameState` against the
+scalar `GameState`, after checking that both play the same games.
+
+The check steps a batch and one `GameState` per game in lockstep, with
+the same seeds and random actions (games restart when they end), and
+compares every game's state after every tick; any mismatch is printed
+and the script exits with status 1. It runs from the default starting
+speed, and from speeds above `SWEEP_SPEED`, where collisions are
+tested with swept masks.
+
+Usage: `python -m benchmarks.bench_batch` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import random
+import sys
+import time
+
+# external dependencies
+import numpy as np
+
+# local dependencies
+from assets.batch_game_state import BatchGameState, NO_OBSTACLE
+from assets.game_state import GameState, NOOP, JUMP, DUCK, SWEEP_SPEED
+from assets.sprites import load_sprites
+
+BATCH_SIZES = (1, 64, 1024, 16384)
+PARITY_GAMES = 64
+# (starting game speed, ticks) of every parity run
+PARITY_RUNS = ((15, 3000), (25, 1000), (40, 1000))
+
+def game_state_of(game_state: GameState) -> tuple:
+    """State of a `GameState` compared by `check_parity`.
+    """
+    obstacles = sorted(obstacle.rect.topleft for obstacle in game_state.obstacles)
+    return (
+        game_state.game_over,
+        game_state.score,
+        game_state.game_speed,
+        game_state.x_pos_bg,
+        game_state.dino_avatar.rect.y,
+        obstacles
+    )
+
+def batch_game_state_of(batch: BatchGameState, i: int) -> tuple:
+    """State of game `i` of a `BatchGameState` compared by `check_parity`.
+    """
+    live = batch.obstacle_kind[i] != NO_OBSTACLE
+    obstacles = sorted(zip(batch.obstacle_x[i, live].tolist(), batch.obstacle_y[i, live].tolist()))
+    return (
+        bool(batch.game_over[i]),
+        int(batch.score[i]),
+        int(batch.game_speed[i]),
+        int(batch.x_pos_bg[i]),
+        int(batch.dino_y[i]),
+        obstacles
+    )
+
+def check_parity(sprites, n: int, ticks: int, game_speed: int = 15) -> int:
+    """Steps `n` games in a `BatchGameState` and in `GameState`s with the
+    same seeds, starting speed and actions, and returns the number of
+    (tick, game) pairs whose states differ (the first few are printed).
+    """
+    batch = BatchGameState(sprites, n, game_speed = game_speed)
+    game_states = [GameState(sprites, seed = seed, game_speed = game_speed) for seed in range(n)]
+    rng = np.random.default_rng(2)
+    mismatches = 0
+    for tick in range(ticks):
+        actions = rng.choice(np.array([NOOP, JUMP, DUCK]), size = n, p = (0.8, 0.1, 0.1))
+        game_over = batch.step(actions)
+        for i, game_state in enumerate(game_states):
+            game_state.step(int(actions[i]))
+            expected = game_state_of(game_state)
+            got = batch_game_state_of(batch, i)
+            if got != expected:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"tick {tick}, game {i}: GameState {expected}, BatchGameState {got}")
+            if game_state.game_over:
+                game_state.reset()
+        if game_over.any():
+            batch.reset(game_over.copy())
+    return mismatches
+
+def bench_scalar(sprites, ticks: int = 20000) -> float:
+    """Returns the number of game steps per second of a single `GameState`.
+    """
+    game_state = GameState(sprites, seed=0)
+    actions = random.Random(1).choices((NOOP, JUMP, DUCK), (8, 1, 1), k=ticks)
+    start = time.perf_counter()
+    for action in actions:
+        if game_state.step(action):
+            game_state.reset()
+    return ticks / (time.perf_counter() - start)
+
+def bench_batch(sprites, n: int, ticks: int) -> float:
+    """Returns the number of game steps per second (summed over
+    the batch) of a `BatchGameState` running `n` games.
+    """
+    batch = BatchGameState(sprites, n)
+    rng = np.random.default_rng(1)
+    actions = rng.choice(
+        np.array([NOOP, JUMP, DUCK]),
+        size=(ticks, n),
+        p=(0.8, 0.1, 0.1)
+    )
+    start = time.perf_counter()
+    for tick_actions in actions:
+        game_over = batch.step(tick_actions)
+        if game_over.any():
+            batch.reset(game_over.copy())
+    return n * ticks / (time.perf_counter() - start)
+
+def main():
+    sprites = load_sprites()
+    failed = False
+    for game_speed, ticks in PARITY_RUNS:
+        mismatches = check_parity(sprites, PARITY_GAMES, ticks, game_speed)
+        swept = " (swept collisions)" if game_speed > SWEEP_SPEED else ""
+        print(
+            f"parity from speed {game_speed}{swept}: {PARITY_GAMES} games x {ticks} ticks,"
+            f" {mismatches} mismatches"
+        )
+        failed = failed or mismatches > 0
+    if failed:
+        sys.exit(1)
+    print(f"{'GameState':>16}: {bench_scalar(sprites):>14,.0f} steps/s")
+    for n in BATCH_SIZES:
+        ticks = max(50, 200000 // n)
+        rate = bench_batch(sprites, n, ticks)
+        print(f"{f'batch N={n}':>16}: {rate:>14,.0f} steps/s")
+
+if __name__ == '__main__':
+    main()
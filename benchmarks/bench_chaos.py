@@ -0,0 +1,92 @@
+# bench_chaos.py
+"""Time per frame (step and render) of chaos mode against a normal
+game, and against flipping the whole screen every frame.
+
+The three play the same seeded game with a bot. "Flipped screen" draws
+the normal frame, then flips the whole screen with
+`pygame.transform.flip` and pushes all of it; chaos mode draws through
+a `MirrorView` with the dirty-rectangle renderer, like a normal game.
+The three take turns for `REPEATS` rounds, so a slow patch of the
+machine hits them alike, and each reports its median.
+
+Usage: `python -m benchmarks.bench_chaos` (from the repo's root folder).
+Runs under `SDL_VIDEODRIVER=dummy` unless a video driver is already set.
+"""
+
+# standard library dependencies
+import os
+import random
+import time
+from statistics import median
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.chaos import MirrorView
+from assets.game_state import GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from assets.hud import ScoreHUD, get_font
+from assets.renderer import BACKGROUND_COLOR, DirtyRectRenderer, draw_game
+from assets.sprites import load_sprites
+from benchmarks.bench_replay import bot
+
+FRAMES = 2000
+REPEATS = 7
+
+class FlippedScreenRenderer:
+    """Chaos mode done by flipping the finished frame.
+    """
+    def __init__(self, screen: pygame.Surface, score_hud: ScoreHUD):
+        self.screen = screen
+        self.score_hud = score_hud
+
+    def render(self, game_state: GameState):
+        self.screen.fill(BACKGROUND_COLOR)
+        draw_game(game_state, self.screen, self.score_hud)
+        self.screen.blit(pygame.transform.flip(self.screen, True, True), (0, 0))
+        pygame.display.update()
+
+def ms_per_frame(renderer, sprites) -> float:
+    """Time per frame to step and render a seeded bot game.
+    """
+    game_state = GameState(sprites, seed = 0)
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        if game_state.step(bot(game_state, rng)):
+            game_state.reset()
+        renderer.render(game_state)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+    score_hud = ScoreHUD(get_font(size = 20))
+
+    normal = DirtyRectRenderer(screen, score_hud)
+    start = time.perf_counter()
+    chaos = DirtyRectRenderer(screen, score_hud)
+    chaos.view = MirrorView(sprites, GameState(sprites, seed = 0).background, screen.get_size())
+    setup = time.perf_counter() - start
+    flipped_screen = FlippedScreenRenderer(screen, score_hud)
+
+    print(f"flipping every image and strip once: {setup * 1000:.1f} ms")
+    renderers = {"normal": normal, "chaos mode": chaos, "flipped screen": flipped_screen}
+    times = {name: [] for name in renderers}
+    for _ in range(REPEATS):
+        for name, renderer in renderers.items():
+            times[name].append(ms_per_frame(renderer, sprites))
+    baseline = median(times["normal"])
+    print(f"median of {REPEATS} runs of {FRAMES} frames:")
+    for name, elapsed in times.items():
+        elapsed = median(elapsed)
+        print(
+            f"{name:>15}: {elapsed:6.3f} ms/frame ({elapsed / baseline - 1:+.1%})"
+            f" [{min(times[name]):.3f}-{max(times[name]):.3f}]"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+# bench_collision.py
+"""Cost and accuracy of the collision test: the points-of-interest
+test `DinoAvatar.collides_with` used to run against the current
+rect broadphase + mask test.
+
+The dino/obstacle pairs come from seeded games played by a scripted
+bot (the cost per frame) and from random placements where the dino
+and obstacle rects overlap (the hard cases). Both tests are checked
+against a pixel-by-pixel comparison of the images' alpha channels.
+
+Usage: `python -m benchmarks.bench_collision` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import copy
+import os
+import random
+import time
+from types import SimpleNamespace
+from typing import List, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import numpy as np
+import pygame
+
+# local dependencies
+from assets.dino_avatar import DinoAvatar
+from assets.game_element import GameElement
+from assets.game_state import GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from assets.sprites import load_sprites
+from benchmarks.bench_replay import bot
+
+Sample = Tuple[DinoAvatar, GameElement]
+
+def legacy_dino(dino_avatar: DinoAvatar) -> SimpleNamespace:
+    """Returns the state the old `collides_with` read, with the
+    points-of-interest `run`, `duck` and `jump` used to keep up to date.
+    """
+    x, y = dino_avatar.rect.topleft
+    if not dino_avatar.is_jumping:
+        y = 310
+    return SimpleNamespace(
+        is_ducking = dino_avatar.is_ducking,
+        is_jumping = dino_avatar.is_jumping,
+        front_point = [x + 45, y + 5],
+        front_point_when_ducking = (x + 105, 350),
+        bottom_point = [x + 10, y + 70],
+        tail_point = [x, y + 50]
+    )
+
+def legacy_collides(dino_avatar: SimpleNamespace, rect: pygame.Rect) -> bool:
+    # the old `DinoAvatar.collides_with`
+    if dino_avatar.is_ducking:
+        return rect.collidepoint(dino_avatar.bottom_point) \
+            or rect.collidepoint(dino_avatar.front_point_when_ducking)
+    elif dino_avatar.is_jumping:
+        return rect.collidepoint(dino_avatar.bottom_point) \
+            or rect.collidepoint(dino_avatar.front_point) \
+            or rect.collidepoint(dino_avatar.tail_point)
+    else:
+        return rect.collidepoint(dino_avatar.front_point)
+
+def played_samples(sprites, ticks: int) -> List[Sample]:
+    """Every (dino, obstacle) pair tested during `ticks` ticks of
+    seeded bot games.
+    """
+    samples = []
+    game_state = GameState(sprites, seed = 0)
+    rng = random.Random(0)
+    for _ in range(ticks):
+        game_over = game_state.step(bot(game_state, rng))
+        # positions haven't changed since the step tested them
+        for obstacle in game_state.obstacles:
+            dino_avatar = copy.copy(game_state.dino_avatar)
+            dino_avatar.rect = dino_avatar.rect.copy()
+            obstacle = copy.copy(obstacle)
+            obstacle.rect = obstacle.rect.copy()
+            samples.append((dino_avatar, obstacle))
+        if game_over:
+            game_state.reset()
+    return samples
+
+def placed_samples(sprites, count: int) -> List[Sample]:
+    """`count` random placements of a random obstacle image over a
+    random dino image, with their rects overlapping.
+    """
+    rng = random.Random(1)
+    poses = (
+        [(image, False, False) for image in sprites.running_images]
+        + [(image, True, False) for image in sprites.ducking_images]
+        + [(image, False, True) for image in sprites.jumping_images]
+    )
+    obstacle_images = sprites.small_cactus_images + sprites.large_cactus_images + sprites.bird_images
+    samples = []
+    for _ in range(count):
+        dino_avatar = DinoAvatar(
+            sprites.running_images,
+            sprites.ducking_images,
+            sprites.jumping_images,
+            SCREEN_WIDTH
+        )
+        image, dino_avatar.is_ducking, dino_avatar.is_jumping = rng.choice(poses)
+        dino_avatar.is_running = not (dino_avatar.is_ducking or dino_avatar.is_jumping)
+        dino_avatar.image = image
+        dino_avatar.rect = image.get_rect(topleft = (80, 340 if dino_avatar.is_ducking else 310))
+        if dino_avatar.is_jumping:
+            dino_avatar.rect.y -= rng.randint(0, 140)
+        obstacle = GameElement(rng.choice(obstacle_images), SCREEN_WIDTH)
+        obstacle.rect.x = rng.randint(
+            dino_avatar.rect.left - obstacle.rect.width + 1,
+            dino_avatar.rect.right - 1
+        )
+        obstacle.rect.y = rng.randint(
+            dino_avatar.rect.top - obstacle.rect.height + 1,
+            dino_avatar.rect.bottom - 1
+        )
+        samples.append((dino_avatar, obstacle))
+    return samples
+
+def pixels_overlap(dino_avatar: DinoAvatar, obstacle: GameElement) -> bool:
+    """Ground truth: whether any pixel is opaque in both images.
+    """
+    a = pygame.surfarray.array_alpha(dino_avatar.image) > 127
+    b = pygame.surfarray.array_alpha(obstacle.image) > 127
+    dx = obstacle.rect.x - dino_avatar.rect.x
+    dy = obstacle.rect.y - dino_avatar.rect.y
+    left, top = max(0, dx), max(0, dy)
+    right = min(a.shape[0], dx + b.shape[0])
+    bottom = min(a.shape[1], dy + b.shape[1])
+    if left >= right or top >= bottom:
+        return False
+    return bool(np.any(
+        a[left:right, top:bottom] & b[left - dx:right - dx, top - dy:bottom - dy]
+    ))
+
+def time_ns(function, repeats: int = 5) -> int:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        function()
+        best = min(best, time.perf_counter_ns() - start)
+    return best
+
+def report(name: str, samples: List[Sample], frames: int):
+    truth = [pixels_overlap(dino_avatar, obstacle) for dino_avatar, obstacle in samples]
+    legacy_samples = [(legacy_dino(dino_avatar), obstacle.rect) for dino_avatar, obstacle in samples]
+    legacy = [legacy_collides(dino_avatar, rect) for dino_avatar, rect in legacy_samples]
+    masked = [dino_avatar.collides_with(obstacle) for dino_avatar, obstacle in samples]
+
+    def run_legacy():
+        for dino_avatar, rect in legacy_samples:
+            legacy_collides(dino_avatar, rect)
+
+    def run_masked():
+        for dino_avatar, obstacle in samples:
+            dino_avatar.collides_with(obstacle)
+
+    print(f"{name}: {len(samples)} tests over {frames} frames, {sum(truth)} real overlaps")
+    for label, results, function in (
+            ("points", legacy, run_legacy),
+            ("rect + mask", masked, run_masked)):
+        missed = sum(t and not r for t, r in zip(truth, results))
+        false_hits = sum(r and not t for t, r in zip(truth, results))
+        elapsed = time_ns(function)
+        print(
+            f"{label:>14}: {elapsed / frames:8.1f} ns/frame, {elapsed / len(samples):6.1f} ns/test,"
+            f" {missed} missed, {false_hits} false hits"
+        )
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+    frames = 20_000
+    report("played games", played_samples(sprites, frames), frames)
+    samples = placed_samples(sprites, 5_000)
+    report("overlapping rects", samples, len(samples))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+# bench_dino.py
+"""Cost of `DinoAvatar.update`, before and after the avatar's poses
+were compiled into lookup tables, and memory per avatar when many of
+them are simulated at once.
+
+"Before" is the avatar as it used to be: `run` and `duck` built a new
+rect from the image and recomputed the image index every tick, and
+`jump` integrated the velocity one tick at a time. Both versions go
+through the same inputs (runs, ducks and jumps, including jumps
+straight out of a duck) and must end up in the same states.
+
+Usage: `python -m benchmarks.bench_dino` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import os
+import random
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.dino_avatar import (
+    DinoAvatar,
+    Y_POSITION,
+    Y_POSITION_WHEN_DUCKING,
+    animation_of
+)
+from assets.game_state import ACTION_INPUTS, NOOP, JUMP, DUCK, SCREEN_WIDTH
+from assets.sprites import load_sprites
+
+TICKS = 100_000
+AVATARS = 5_000
+
+class LegacyDinoAvatar(DinoAvatar):
+    """`DinoAvatar` with the old `duck`, `run` and `jump`.
+    """
+    __slots__ = ()
+
+    def reset(self):
+        super().reset()
+        self.rect = self.image.get_rect(topleft = (self.x_position, self.y_position))
+
+    def duck(self):
+        self.image = self.ducking_images[(self.update_step_index() // 5) % len(self.ducking_images)]
+        self.rect = self.image.get_rect()
+        self.rect.x = self.x_position
+        self.rect.y = self.y_position_when_ducking
+        self.is_ducking = True
+
+    def run(self):
+        self.image = self.running_images[(self.update_step_index() // 5) % len(self.running_images)]
+        self.rect = self.image.get_rect()
+        self.rect.x = self.x_position
+        self.rect.y = self.y_position
+        self.is_running = True
+
+    def jump(self):
+        self.image = self.jumping_images[(self.update_step_index() // 5) % len(self.jumping_images)]
+        self.rect.size = self.image.get_size()
+        if self.is_jumping:
+            self.can_jump = False
+            self.rect.y -= self.jump_velocity * 4
+            self.jump_velocity -= 0.8
+        if self.jump_velocity < -8.5:
+            self.can_jump = True
+            self.is_jumping = False
+            self.jump_velocity = 8.5
+            self.rect.y = 310
+
+def state_of(dino_avatar: DinoAvatar):
+    return (
+        tuple(dino_avatar.rect),
+        dino_avatar.image,
+        dino_avatar.jump_velocity,
+        dino_avatar.is_running,
+        dino_avatar.is_ducking,
+        dino_avatar.is_jumping,
+        dino_avatar.can_jump,
+        dino_avatar.step_index
+    )
+
+def ns_per_update(dino_avatar: DinoAvatar, inputs, repeats: int = 5) -> float:
+    best = float("inf")
+    update = dino_avatar.update
+    for _ in range(repeats):
+        dino_avatar.reset()
+        start = time.perf_counter_ns()
+        for keys in inputs:
+            update(keys)
+        best = min(best, time.perf_counter_ns() - start)
+    return best / len(inputs)
+
+def bytes_per_avatar(cls, sprites) -> float:
+    """Memory allocated per avatar, for `AVATARS` of them (including
+    the tables, which the first one builds).
+    """
+    animation_of.cache_clear()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    avatars = [
+        cls(sprites.running_images, sprites.ducking_images, sprites.jumping_images, SCREEN_WIDTH)
+        for _ in range(AVATARS)
+    ]
+    # every jump's frames
+    for avatar in avatars:
+        avatar.animation.jump_frames(Y_POSITION)
+        avatar.animation.jump_frames(Y_POSITION_WHEN_DUCKING)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del avatars
+    return allocated / AVATARS
+
+def main():
+    pygame.init()
+    sprites = load_sprites()
+    rng = random.Random(0)
+    # held keys last a few ticks, like a player's
+    inputs = []
+    while len(inputs) < TICKS:
+        action = rng.choice((NOOP, NOOP, JUMP, DUCK))
+        inputs.extend([ACTION_INPUTS[action]] * rng.randint(1, 30))
+    inputs = inputs[:TICKS]
+
+    legacy = LegacyDinoAvatar(sprites.running_images, sprites.ducking_images, sprites.jumping_images, SCREEN_WIDTH)
+    tabled = DinoAvatar(sprites.running_images, sprites.ducking_images, sprites.jumping_images, SCREEN_WIDTH)
+    for keys in inputs:
+        legacy.update(keys)
+        tabled.update(keys)
+        assert state_of(legacy) == state_of(tabled), "the tables changed the dino's behavior"
+
+    print(f"DinoAvatar.update (best of 5 x {TICKS} ticks):")
+    print(f"{'before':>8}: {ns_per_update(legacy, inputs):7.0f} ns")
+    print(f"{'after':>8}: {ns_per_update(tabled, inputs):7.0f} ns")
+    print(f"memory per avatar ({AVATARS} avatars):")
+    print(f"{'before':>8}: {bytes_per_avatar(LegacyDinoAvatar, sprites):7.0f} bytes")
+    print(f"{'after':>8}: {bytes_per_avatar(DinoAvatar, sprites):7.0f} bytes (tables included)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# bench_hud.py
+"""Time and surface allocations per frame of the score display:
+rendering "Points: <score>" every frame against `ScoreHUD`, with a
+score that changes every frame and one that stays the same (e.g.
+frames drawn between two ticks, or a paused game). Times are the
+median of `REPEATS` passes.
+
+Usage: `python -m benchmarks.bench_hud` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import os
+import time
+from statistics import median
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.hud import ScoreHUD
+
+REPEATS = 7
+
+class CountingFont(pygame.font.Font):
+    """Font that counts the surfaces it renders.
+    """
+    renders = 0
+
+    def render(self, *args, **kwargs):
+        CountingFont.renders += 1
+        return super().render(*args, **kwargs)
+
+def draw_score_per_frame(points: int, screen: pygame.Surface, font: pygame.font.Font):
+    # what `update_and_draw_score` used to do every frame
+    text = font.render("Points: " + str(points), True, (0, 0, 0))
+    text_rect = text.get_rect()
+    text_rect.center = (1000, 40)
+    screen.blit(text, text_rect)
+
+def measure(draw, frames: int = 20000):
+    """Returns time (µs, median of `REPEATS` passes) and surfaces
+    allocated per frame.
+    """
+    draw(0)
+    CountingFont.renders = 0
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for points in range(1, frames + 1):
+            draw(points)
+        times.append((time.perf_counter() - start) / frames * 1e6)
+    return median(times), CountingFont.renders / (frames * REPEATS)
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((1100, 600))
+    font = CountingFont('freesansbold.ttf', 20)
+    score_hud = ScoreHUD(font)
+    results = {
+        "render per frame": measure(lambda points: draw_score_per_frame(points, screen, font)),
+        "ScoreHUD": measure(lambda points: score_hud.draw(points, screen)),
+        "ScoreHUD, same": measure(lambda points: score_hud.draw(12345, screen)),
+    }
+    for name, (per_frame, renders) in results.items():
+        print(f"{name:>16}: {per_frame:7.2f} µs/frame, {renders:.2f} surfaces allocated/frame")
+
+if __name__ == '__main__':
+    main()
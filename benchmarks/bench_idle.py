@@ -0,0 +1,80 @@
+# bench_idle.py
+"""CPU use of `DinoRunner` while nobody plays, before and after the
+menu and game over scenes started waiting for events.
+
+"Before" runs the scenes the way `DinoRunner.run_once` used to: the
+menu redrawn as fast as possible, and the game over pause blocking in
+`pygame.time.delay`. Each scene is left alone for a few seconds (a
+timer posts `QUIT`), and the CPU time the process used is compared
+with the wall time. The game over scene also reports how long a `QUIT`
+posted during the pause waits before the runner stops.
+
+Usage: `python -m benchmarks.bench_idle [seconds]` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+import main as game
+
+class LegacyRunner(game.DinoRunner):
+    """Runs the menu and game over scenes like they used to.
+    """
+    def run_once(self):
+        for event in pygame.event.get():
+            self.handle_event(event)
+        if not self.running:
+            return
+        if self.scene == game.PLAYING:
+            self.play_frame()
+        elif self.scene == game.GAME_OVER:
+            pygame.time.delay(self.game_over_delay)
+            self.scene = game.MENU
+        else:
+            game.draw_menu(self.screen, self.score, self.rank, self.best)
+
+def idle(runner: game.DinoRunner, seconds: float):
+    """Runs `runner` until a `QUIT` posted after `seconds`.
+
+    Returns
+    -------
+    Tuple[float, float]
+        CPU time used (% of one core) and seconds between the `QUIT`
+        and the runner stopping.
+    """
+    runner.running = True
+    pygame.event.clear()
+    pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), loops = 1)
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    runner.run()
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - start_cpu
+    return 100 * cpu / elapsed, elapsed - seconds
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    pygame.init()
+    for label, runner_class in (("before", LegacyRunner), ("after", game.DinoRunner)):
+        runner = runner_class(game.SCREEN, game_over_delay = int(seconds * 2000))
+        runner.score = 0
+        menu_cpu, _ = idle(runner, seconds)
+        # game over scene (twice as long as the wait for `QUIT`)
+        runner.start_game()
+        runner.end_game()
+        game_over_cpu, quit_latency = idle(runner, seconds)
+        print(
+            f"{label:>6}: menu {menu_cpu:5.1f}% CPU; game over {game_over_cpu:5.1f}% CPU,"
+            f" QUIT handled after {quit_latency * 1000:7.1f} ms"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# bench_leaderboard.py
+"""Load test of `Leaderboard`: insert throughput through the background
+writer, and top-10 and rank query latencies as the table grows (10M
+runs by default), against the same queries answered by a full scan.
+
+Scores follow an exponential distribution (most games end early).
+
+Usage: `python -m benchmarks.bench_leaderboard [--entries N] [--path FILE]`
+(from the repo's root folder); without `--path`, a temporary file is
+used and deleted at the end.
+"""
+
+# standard library dependencies
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+# local dependencies
+from assets.leaderboard import Leaderboard
+
+# the same queries without the index or the score counts
+FULL_SCAN_TOP = "SELECT score, seed, played_at FROM runs NOT INDEXED ORDER BY score DESC, id LIMIT 10"
+FULL_SCAN_RANK = "SELECT 1 + COUNT(*) FROM runs NOT INDEXED WHERE score > ?"
+
+def latencies_us(function, repeats: int):
+    """p50 and p99 time of `function()` in µs.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        function()
+        timings.append(time.perf_counter_ns() - start)
+    quantiles = statistics.quantiles(timings, n = 100)
+    return quantiles[49] / 1000, quantiles[98] / 1000
+
+def report_queries(leaderboard: Leaderboard, rng: random.Random, repeats: int = 1000):
+    top_p50, top_p99 = latencies_us(lambda: leaderboard.top(10), repeats)
+    rank_p50, rank_p99 = latencies_us(lambda: leaderboard.rank(score(rng)), repeats)
+    # the lowest score adds up the count of every other score
+    worst_p50, _ = latencies_us(lambda: leaderboard.rank(-1), 100)
+    print(
+        f"  top-10 p50 {top_p50:7.1f} µs, p99 {top_p99:7.1f} µs;"
+        f" rank p50 {rank_p50:7.1f} µs, p99 {rank_p99:7.1f} µs, lowest score {worst_p50:7.1f} µs"
+    )
+
+def score(rng: random.Random) -> int:
+    return int(rng.expovariate(1 / 800))
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument("--entries", type = int, default = 10_000_000)
+    parser.add_argument("--path")
+    args = parser.parse_args()
+    directory = None
+    path = args.path
+    if path is None:
+        directory = tempfile.TemporaryDirectory()
+        path = os.path.join(directory.name, "leaderboard.db")
+
+    rng = random.Random(0)
+    step = max(1, args.entries // 10)
+    leaderboard = Leaderboard(path)
+    # preallocated so that growing it doesn't stall `submit` calls
+    submit_ns = [0] * args.entries
+    print(f"inserting {args.entries} runs:")
+    insert_time = 0.0
+    for first in range(0, args.entries, step):
+        chunk_start = time.perf_counter()
+        for seed in range(first, min(first + step, args.entries)):
+            submit_start = time.perf_counter_ns()
+            leaderboard.submit(score(rng), seed, 0.0)
+            submit_ns[seed] = time.perf_counter_ns() - submit_start
+        leaderboard.flush()
+        chunk_time = time.perf_counter() - chunk_start
+        insert_time += chunk_time
+        print(f"{len(leaderboard):>10} runs: {step / chunk_time:9.0f} inserts/s")
+        report_queries(leaderboard, rng)
+    quantiles = statistics.quantiles(submit_ns, n = 100)
+    print(
+        f"total: {args.entries / insert_time:.0f} inserts/s;"
+        f" `submit` p50 {quantiles[49] / 1000:.1f} µs, p99 {quantiles[98] / 1000:.1f} µs,"
+        f" max {max(submit_ns) / 1000:.1f} µs"
+    )
+
+    connection = leaderboard.connection
+    print("full scans:")
+    top_p50, _ = latencies_us(lambda: connection.execute(FULL_SCAN_TOP).fetchall(), 3)
+    rank_p50, _ = latencies_us(lambda: connection.execute(FULL_SCAN_RANK, (score(rng),)).fetchone(), 3)
+    print(f"  top-10 {top_p50:10.1f} µs; rank {rank_p50:10.1f} µs")
+    print("query plans:")
+    for query, parameters in (
+            ("SELECT score FROM runs ORDER BY score DESC, id LIMIT 10", ()),
+            ("SELECT SUM(count) FROM score_counts WHERE score > ?", (0,))):
+        for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", parameters):
+            print(f"  {query}: {row[-1]}")
+    leaderboard.close()
+    if directory is not None:
+        directory.cleanup()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# bench_lookahead.py
+"""Cost of asking "does the dino survive these actions?" with
+`first_collision`, compared with finding out by stepping the game.
+
+Stepping needs a copy of the game to step; here it's the cheapest one
+available, a `GameState` replayed from the seed (not counted in its
+time), so the comparison only counts the ticks themselves. Every
+prediction is checked against the stepped game.
+
+Usage: `python -m benchmarks.bench_lookahead` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.game_state import GameState, NOOP, JUMP, DUCK
+from assets.lookahead import first_collision
+from assets.sprites import load_sprites
+
+HORIZONS = (10, 30, 60)
+STATES = 200
+
+def sample_states(sprites, count: int, seed: int = 0):
+    """Returns `count` (actions played from the start, game) pairs, with
+    obstacles on the screen.
+    """
+    rng = random.Random(seed)
+    states = []
+    while len(states) < count:
+        game_state = GameState(sprites, seed = len(states))
+        history = []
+        for _ in range(rng.randint(100, 1500)):
+            action = rng.choice((NOOP, NOOP, NOOP, JUMP, DUCK))
+            if game_state.step(action):
+                break
+            history.append(action)
+        if not game_state.game_over and game_state.obstacles:
+            states.append((history, game_state))
+    return states
+
+def replay(sprites, seed: int, history) -> GameState:
+    game_state = GameState(sprites, seed = seed)
+    for action in history:
+        game_state.step(action)
+    return game_state
+
+def main():
+    pygame.init()
+    sprites = load_sprites()
+    states = sample_states(sprites, STATES)
+    rng = random.Random(1)
+    # the masks and their bounds are computed on first use; a planner
+    # asks many queries, so that isn't timed
+    for _, game_state in states:
+        first_collision(game_state, [NOOP] * max(HORIZONS))
+
+    print(f"time per query over {STATES} game states:")
+    for horizon in HORIZONS:
+        plans = [
+            [rng.choice((NOOP, NOOP, NOOP, JUMP, DUCK)) for _ in range(horizon)]
+            for _ in states
+        ]
+        predicted_ns = 0
+        stepped_ns = 0
+        collisions = 0
+        for seed, ((history, game_state), plan) in enumerate(zip(states, plans)):
+            start = time.perf_counter_ns()
+            predicted = first_collision(game_state, plan)
+            predicted_ns += time.perf_counter_ns() - start
+
+            copy = replay(sprites, seed, history)
+            actual = None
+            start = time.perf_counter_ns()
+            for tick, action in enumerate(plan, 1):
+                if copy.step(action):
+                    actual = tick
+                    break
+            stepped_ns += time.perf_counter_ns() - start
+            assert predicted == actual, f"state {seed}: predicted {predicted}, stepped {actual}"
+            collisions += actual is not None
+        print(
+            f"  {horizon:>3} ticks: first_collision {predicted_ns / STATES / 1000:6.1f} µs, "
+            f"stepping {stepped_ns / STATES / 1000:7.1f} µs ({collisions} collisions)"
+        )
+
+if __name__ == '__main__':
+    main()
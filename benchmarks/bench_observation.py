@@ -0,0 +1,112 @@
+# bench_observation.py
+"""Cost and allocations of each observation mode, against the copy of
+the whole screen agents used to make (`pygame.surfarray.array3d`).
+
+Allocations are measured with `tracemalloc` around each observation,
+after a warmup: the peak of memory allocated during the call (even if
+it's freed before it returns); the "nothing" row is what measuring
+allocates by itself. The arrays observers write to are also
+checked to still be the same buffers at the end.
+
+Usage: `python -m benchmarks.bench_observation` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import numpy as np
+import pygame
+
+# local dependencies
+from assets.game_state import GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from assets.observation import FeatureObserver, PixelObserver
+from assets.hud import ScoreHUD, get_font
+from assets.renderer import BACKGROUND_COLOR, draw_game
+from assets.sprites import load_sprites
+from benchmarks.bench_replay import bot
+
+def screen_copy(screen: pygame.Surface, score_hud: ScoreHUD, game_state: GameState):
+    """The old way: draw the game on the screen and copy it.
+    """
+    def observe():
+        screen.fill(BACKGROUND_COLOR)
+        draw_game(game_state, screen, score_hud)
+        return pygame.surfarray.array3d(screen)
+    return observe
+
+def measure(game_state: GameState, observe, ticks: int, warmup: int = 100):
+    """Plays a seeded bot game, observing it after every step.
+
+    Returns
+    -------
+    Tuple[float, float, int]
+        p50 and p99 time per observation (ns), and the largest number
+        of bytes allocated during one observation after the warmup.
+    """
+    rng = random.Random(0)
+    timings = []
+    peak = 0
+    tracemalloc.start()
+    for tick in range(warmup + ticks):
+        if game_state.step(bot(game_state, rng)):
+            game_state.reset()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter_ns()
+        observe()
+        elapsed = time.perf_counter_ns() - start
+        if tick >= warmup:
+            timings.append(elapsed)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    quantiles = statistics.quantiles(timings, n = 100)
+    return quantiles[49], quantiles[98], peak
+
+def buffers(*arrays: np.ndarray):
+    return [array.__array_interface__["data"][0] for array in arrays]
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+    score_hud = ScoreHUD(get_font(size = 20))
+    ticks = 2_000
+
+    game_state = GameState(sprites, seed = 0)
+    features = FeatureObserver(game_state)
+    pixels = PixelObserver(game_state)
+    colors = PixelObserver(GameState(sprites, seed = 0), grayscale = False)
+
+    def observe_pixels():
+        pixels.observe()
+        pixels.stacked()
+
+    def observe_colors():
+        colors.observe()
+        colors.stacked()
+
+    arrays = (features.out, pixels.pixels, pixels.frames, pixels.stacked_frames, colors.frames)
+    start_buffers = buffers(*arrays)
+    print(f"per observation ({ticks} ticks of a bot game, after a warmup):")
+    for label, state, observe, shape in (
+            ("nothing", game_state, lambda: None, ()),
+            ("screen copy", game_state, screen_copy(screen, score_hud, game_state), (SCREEN_WIDTH, SCREEN_HEIGHT, 3)),
+            ("features", game_state, features.observe, features.out.shape),
+            ("gray x4 stack", game_state, observe_pixels, pixels.frames.shape),
+            ("color x4 stack", colors.game_state, observe_colors, colors.frames.shape)):
+        p50, p99, peak = measure(state, observe, ticks)
+        print(
+            f"{label:>15}: p50 {p50 / 1000:8.2f} µs, p99 {p99 / 1000:8.2f} µs,"
+            f" {peak:8d} bytes allocated at most, shape {shape}"
+        )
+    print("observation buffers unchanged:", buffers(*arrays) == start_buffers)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# bench_pool.py
+"""Memory per game element and obstacle allocations, before and after
+`__slots__` and the obstacle pool.
+
+"Before" is measured with plain objects holding the same attributes in
+a `__dict__` (how the classes used to store them), and with a pool that
+never hands back a used obstacle (a new one per spawn, like before).
+
+Usage: `python -m benchmarks.bench_pool` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import copy
+import os
+import random
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.game_element import GameElement
+from assets.game_state import GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from assets.obstacles import SmallCactus, LargeCactus, Bird, ObstaclePool
+from assets.sprites import load_sprites
+from benchmarks.bench_replay import bot
+
+class PlainObject:
+    """Stand-in for a game element without `__slots__`.
+    """
+
+class NoReusePool(ObstaclePool):
+    """Builds a new obstacle for every spawn.
+    """
+    def release(self, obstacle: GameElement):
+        pass
+
+def slot_names(element: GameElement):
+    for cls in type(element).__mro__:
+        yield from getattr(cls, "__slots__", ())
+
+def as_plain_object(element: GameElement) -> PlainObject:
+    plain = PlainObject()
+    for name in slot_names(element):
+        setattr(plain, name, getattr(element, name))
+    return plain
+
+def bytes_per_instance(make, count: int = 10_000) -> float:
+    """Memory allocated (and kept) per object built by `make`.
+    """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    kept = [make() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del kept
+    return used / count
+
+def spawns(sprites, pool_class, ticks: int):
+    """Plays seeded bot games for `ticks` ticks.
+
+    Returns
+    -------
+    Tuple[int, int, float]
+        Spawns, obstacles built and seconds taken.
+    """
+    game_state = GameState(sprites, seed = 0)
+    game_state.obstacle_pool = pool_class(SCREEN_WIDTH)
+    rng = random.Random(0)
+    spawn_count = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        next_spawn = game_state.next_spawn
+        game_over = game_state.step(bot(game_state, rng))
+        spawn_count += game_state.next_spawn is not next_spawn
+        if game_over:
+            game_state.reset()
+    return spawn_count, game_state.obstacle_pool.allocated, time.perf_counter() - start
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+    game_state = GameState(sprites, seed = 0)
+    elements = [
+        game_state.dino_avatar,
+        SmallCactus(SCREEN_WIDTH, sprites.small_cactus_images[0]),
+        LargeCactus(SCREEN_WIDTH, sprites.large_cactus_images[0]),
+        Bird(SCREEN_WIDTH, sprites.bird_images),
+    ]
+    print("bytes per instance (without the shared images and the rect):")
+    for element in elements:
+        before = bytes_per_instance(lambda: as_plain_object(element))
+        after = bytes_per_instance(lambda: copy.copy(element))
+        print(f"{type(element).__name__:>12}: {before:6.0f} before, {after:6.0f} after")
+
+    ticks = 100_000
+    print(f"obstacles built per 1000 spawns ({ticks} ticks of bot games):")
+    for label, pool_class in (("before", NoReusePool), ("after", ObstaclePool)):
+        spawn_count, built, elapsed = spawns(sprites, pool_class, ticks)
+        print(
+            f"{label:>12}: {1000 * built / spawn_count:6.1f} built per 1000 spawns"
+            f" ({spawn_count} spawns), {elapsed / ticks * 1e6:5.2f} µs/tick"
+        )
+
+if __name__ == '__main__':
+    main()
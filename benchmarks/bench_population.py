@@ -0,0 +1,101 @@
+# bench_population.py
+"""Time per frame of a population of 5,000 dinos on one course, with
+`PopulationRenderer` and with one blit per dino.
+
+The dinos react to obstacles at random distances (see
+`reflex_actions`), so they die off gradually; every frame steps the
+whole population once and draws it. "One blit per dino" draws every
+live and fading dino with its own `screen.blit`, like calling each
+avatar's `draw`. The target is 30 frames per second (33.3 ms/frame).
+
+Usage: `python -m benchmarks.bench_population` (from the repo's root folder).
+Runs under `SDL_VIDEODRIVER=dummy` unless a video driver is already set.
+"""
+
+# standard library dependencies
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import numpy as np
+import pygame
+
+# local dependencies
+from assets.batch_game_state import DINO_X
+from assets.game_state import SCREEN_WIDTH, SCREEN_HEIGHT
+from assets.hud import ScoreHUD, get_font
+from assets.population import (
+    FADE_LEVELS,
+    FADE_TICKS,
+    Population,
+    PopulationRenderer,
+    reflex_actions
+)
+from assets.sprites import load_sprites
+
+POPULATION = 5000
+FRAMES = 600
+
+class BlitPerDinoRenderer(PopulationRenderer):
+    """Draws every dino on its own, with no cap.
+    """
+    def dino_blits(self, population: Population):
+        ids = self.pose_ids[population.pose] + population.dino_images()
+        age = population.ticks - population.death_tick
+        fading = population.game_over & (age < FADE_TICKS)
+        for i in np.flatnonzero(fading):
+            level = FADE_LEVELS - age[i] * FADE_LEVELS // FADE_TICKS
+            x = population.distance - population.death_distance[i]
+            self.screen.blit(self.fades[level][ids[i]], (DINO_X - x, population.dino_y[i]))
+        for i in np.flatnonzero(~population.game_over):
+            self.screen.blit(self.fades[FADE_LEVELS][ids[i]], (DINO_X, population.dino_y[i]))
+        return []
+
+def run(renderer: PopulationRenderer, population: Population):
+    """Steps and draws the population for `FRAMES` frames (or until every
+    dino is out); returns the step and render times in ms, and how many
+    dinos were left.
+    """
+    population.reset(0)
+    reach = np.random.default_rng(0).uniform(2, 10, population.n)
+    observations = None
+    step_times = []
+    render_times = []
+    for _ in range(FRAMES):
+        start = time.perf_counter()
+        observations = population.observe(observations)
+        population.step(reflex_actions(observations, reach))
+        middle = time.perf_counter()
+        renderer.render(population)
+        step_times.append(middle - start)
+        render_times.append(time.perf_counter() - middle)
+        if population.game_over.all():
+            break
+    return np.array(step_times) * 1000, np.array(render_times) * 1000, population.alive()
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+    population = Population(sprites, POPULATION, seed = 0)
+    font = get_font(size = 20)
+    alive_hud = ScoreHUD(font, center = (120, 40), label = "Alive: ")
+    renderers = (
+        ("PopulationRenderer", PopulationRenderer(screen, sprites, ScoreHUD(font), alive_hud)),
+        ("one blit per dino", BlitPerDinoRenderer(screen, sprites, ScoreHUD(font), alive_hud)),
+    )
+    print(f"{POPULATION} dinos:")
+    for name, renderer in renderers:
+        step_times, render_times, alive = run(renderer, population)
+        frame_times = step_times + render_times
+        print(
+            f"  {name:>18}: {len(frame_times)} frames ({alive} dinos left),"
+            f" step {np.median(step_times):5.2f} ms, render {np.median(render_times):5.2f} ms,"
+            f" frame p50 {np.median(frame_times):5.2f} ms, p99 {np.percentile(frame_times, 99):5.2f} ms"
+            f" ({1000 / np.mean(frame_times):.0f} fps)"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# bench_render.py
+"""Render time per frame of a full refresh against the dirty-rectangle
+renderer, and CPU use of each when capped at 30 and 144 FPS.
+
+Usage: `python -m benchmarks.bench_render` (from the repo's root folder).
+Runs under `SDL_VIDEODRIVER=dummy` unless a video driver is already set;
+with the dummy driver `display.update` is nearly free, so run it with a
+real display to see the full effect of pushing fewer pixels.
+"""
+
+# standard library dependencies
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.game_state import GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from assets.hud import ScoreHUD, get_font
+from assets.renderer import BACKGROUND_COLOR, DirtyRectRenderer, draw_game
+from assets.sprites import load_sprites
+
+class FullRenderer:
+    """What `main()` used to do every frame.
+    """
+    def __init__(self, screen: pygame.Surface, score_hud: ScoreHUD):
+        self.screen = screen
+        self.score_hud = score_hud
+
+    def render(self, game_state: GameState):
+        self.screen.fill(BACKGROUND_COLOR)
+        draw_game(game_state, self.screen, self.score_hud)
+        pygame.display.update()
+
+def run(renderer, sprites, frames: int, fps: int = 0):
+    """Steps and renders a seeded game for `frames` frames.
+
+    Returns
+    -------
+    Tuple[float, float]
+        Render time per frame (ms) and CPU use (fraction of one core).
+    """
+    game_state = GameState(sprites, seed=0)
+    clock = pygame.time.Clock()
+    render_time = 0.0
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for _ in range(frames):
+        pygame.event.pump()
+        if game_state.step():
+            game_state.reset()
+        start = time.perf_counter()
+        renderer.render(game_state)
+        render_time += time.perf_counter() - start
+        if fps:
+            clock.tick(fps)
+    cpu = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+    return render_time / frames * 1000, cpu
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+    score_hud = ScoreHUD(get_font(size = 20))
+    renderers = {
+        "full refresh": lambda: FullRenderer(screen, score_hud),
+        "dirty rects": lambda: DirtyRectRenderer(screen, score_hud),
+    }
+    for name, make_renderer in renderers.items():
+        per_frame, _ = run(make_renderer(), sprites, 2000)
+        print(f"{name:>14}: {per_frame:6.3f} ms/frame")
+        for fps in (30, 144):
+            _, cpu = run(make_renderer(), sprites, fps * 3, fps)
+            print(f"{'':>14}  {cpu:6.1%} CPU at {fps} FPS")
+
+if __name__ == '__main__':
+    main()
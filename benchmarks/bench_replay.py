@@ -0,0 +1,52 @@
+# bench_replay.py
+"""Records games played by a simple scripted bot, then measures the size
+of their replays and how fast they can be re-simulated and verified.
+
+Usage: `python -m benchmarks.bench_replay [games]` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import random
+import sys
+import time
+
+# local dependencies
+from assets.game_state import GameState, NOOP, JUMP, DUCK
+from assets.replay import Replay, ReplayRecorder, verify
+from assets.sprites import load_sprites
+
+def bot(game_state: GameState, rng: random.Random) -> int:
+    """Jumps (or ducks under birds) when an obstacle gets close, with some noise.
+    """
+    obstacle = game_state.nearest_obstacle()
+    if obstacle is not None:
+        distance = obstacle.rect.x - 80
+        if 0 < distance < game_state.game_speed * 6:
+            return DUCK if obstacle.rect.y < 300 else JUMP
+    return rng.choices((NOOP, JUMP, DUCK), (40, 1, 1))[0]
+
+def record_games(sprites, games: int):
+    rng = random.Random(0)
+    replays = []
+    for seed in range(games):
+        recorder = ReplayRecorder(GameState(sprites, seed=seed))
+        while not recorder.step(bot(recorder.game_state, rng)):
+            pass
+        replays.append(Replay.from_bytes(recorder.replay.to_bytes()))
+    return replays
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    sprites = load_sprites()
+    replays = record_games(sprites, games)
+    ticks = sum(len(replay) for replay in replays)
+    size = sum(len(replay.to_bytes()) for replay in replays)
+    start = time.perf_counter()
+    verified = sum(verify(replay, sprites) for replay in replays)
+    elapsed = time.perf_counter() - start
+    print(f"{games} games, {ticks:,} ticks, {verified} verified")
+    print(f"replay size: {size:,} bytes ({size * 8 / ticks:.2f} bits/tick)")
+    print(f"re-simulation: {ticks / elapsed:,.0f} ticks/s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# bench_rollout.py
+"""Step rates of `RolloutRunner` for an increasing number of workers,
+as a scaling table: the speedup over one worker, and the efficiency
+(speedup per worker, 100% for linear scaling). Every worker runs the
+same number of games.
+
+Usage: `python -m benchmarks.bench_rollout [games_per_worker [max_workers]]`
+(from the repo's root folder). `max_workers` is the number of CPUs by
+default; more workers than CPUs show the cost of oversubscribing them.
+"""
+
+# standard library dependencies
+import multiprocessing as mp
+import sys
+import time
+from typing import List
+
+# external dependencies
+import numpy as np
+
+# local dependencies
+from assets.game_state import NOOP, JUMP, DUCK
+from assets.rollout import RolloutRunner
+
+def bench(n_workers: int, games_per_worker: int, ticks: int = 200) -> float:
+    """Returns the number of game steps per second over all workers.
+    """
+    n_games = n_workers * games_per_worker
+    rng = np.random.default_rng(0)
+    actions = rng.choice(
+        np.array([NOOP, JUMP, DUCK], dtype=np.int8),
+        size=(ticks, n_games),
+        p=(0.8, 0.1, 0.1)
+    )
+    with RolloutRunner(n_games, n_workers=n_workers, seed=0) as runner:
+        start = time.perf_counter()
+        for tick_actions in actions:
+            runner.step(tick_actions)
+        elapsed = time.perf_counter() - start
+    return n_games * ticks / elapsed
+
+def worker_counts(max_workers: int) -> List[int]:
+    """Returns the powers of two up to `max_workers`, and `max_workers`.
+    """
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+def main():
+    games_per_worker = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else mp.cpu_count()
+    print(f"{games_per_worker} games per worker, {mp.cpu_count()} CPUs:")
+    print(f"{'workers':>7} {'steps/s':>14} {'speedup':>8} {'efficiency':>10}")
+    single = None
+    for n_workers in worker_counts(max_workers):
+        rate = bench(n_workers, games_per_worker)
+        single = single or rate
+        speedup = rate / single
+        print(f"{n_workers:>7} {rate:>14,.0f} {speedup:>7.2f}x {speedup / n_workers:>10.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# bench_snapshot.py
+"""Cost of saving and restoring a whole game with `GameState.snapshot`
+and `restore`, compared with `copy.deepcopy` (which can't copy the
+images, so it's told to share them).
+
+Cycles (one snapshot then one restore) are timed on games in progress
+with obstacles on the screen. Restoring to a snapshot taken before an
+obstacle spawned also reloads the obstacles' random number generator,
+which is timed separately.
+
+Exits with status 1 if the cycles don't reach `TARGET` per second.
+
+Usage: `python -m benchmarks.bench_snapshot` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import copy
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.game_state import GameState, NOOP, JUMP, DUCK
+from assets.sprites import load_sprites
+
+CYCLES = 100_000
+GAMES = 20
+# snapshot + restore cycles per second to reach, on one core
+TARGET = 100_000
+
+def games_in_progress(sprites, count: int):
+    rng = random.Random(0)
+    games = []
+    while len(games) < count:
+        game_state = GameState(sprites, seed = len(games))
+        for _ in range(rng.randint(100, 1000)):
+            if game_state.step(rng.choice((NOOP, NOOP, NOOP, JUMP, DUCK))):
+                break
+        if not game_state.game_over and len(game_state.obstacles) > 1:
+            games.append(game_state)
+    return games
+
+def cycles_per_second(games, cycles: int) -> float:
+    best = float("inf")
+    per_game = cycles // len(games)
+    for _ in range(5):
+        start = time.perf_counter_ns()
+        for game_state in games:
+            snapshot = game_state.snapshot
+            restore = game_state.restore
+            for _ in range(per_game):
+                restore(snapshot())
+        best = min(best, time.perf_counter_ns() - start)
+    return per_game * len(games) / best * 1e9
+
+def main():
+    pygame.init()
+    sprites = load_sprites()
+    games = games_in_progress(sprites, GAMES)
+    print(f"record size: {games[0].snapshot_layout.size} bytes")
+    rate = cycles_per_second(games, CYCLES)
+    verdict = "meets" if rate >= TARGET else "misses"
+    print(f"snapshot + restore: {rate:10,.0f} cycles/s ({verdict} the {TARGET:,} target)")
+
+    # restores that also reload the obstacles' random number generator
+    restores = 0
+    elapsed = 0
+    for game_state in games:
+        snapshot = game_state.snapshot()
+        spawn_tick = game_state.next_spawn.tick
+        while game_state.ticks < spawn_tick and not game_state.game_over:
+            game_state.step()
+        for _ in range(1_000):
+            start = time.perf_counter_ns()
+            game_state.restore(snapshot)
+            elapsed += time.perf_counter_ns() - start
+            # forget the restored states, as after another spawn
+            game_state.rng_states = None
+            restores += 1
+    print(f"restore across a spawn: {restores / elapsed * 1e9:10,.0f} restores/s")
+
+    # Surfaces can't be copied, so they (and the tables built from
+    # them) are shared between the copies
+    game_state = games[0]
+    shared = [
+        game_state.sprites,
+        game_state.dino_avatar.animation,
+        game_state.snapshot_layout,
+        *(layer.tile for layer in game_state.background.layers),
+    ]
+    for images in game_state.sprites:
+        shared += images if isinstance(images, list) else [images]
+    count = 200
+    start = time.perf_counter_ns()
+    for _ in range(count):
+        copy.deepcopy(game_state, {id(value): value for value in shared})
+    print(f"copy.deepcopy: {count / (time.perf_counter_ns() - start) * 1e9:10,.0f} copies/s (sharing the images)")
+    if rate < TARGET:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
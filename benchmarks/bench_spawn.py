@@ -0,0 +1,87 @@
+# bench_spawn.py
+"""Cost per tick with dozens of obstacles alive at game speed 40.
+
+Obstacles are packed together (`gap_scale`) and the dino can't lose
+(collisions are still tested, their result is ignored), so the number
+of live obstacles stays high; the cost per tick should only grow with
+the number of obstacles moved, not with culling or searching.
+
+Usage: `python -m benchmarks.bench_spawn` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import os
+import statistics
+import time
+from typing import Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.dino_avatar import DinoAvatar
+from assets.game_element import GameElement
+from assets.game_state import GameState, JUMP, SCREEN_WIDTH, SCREEN_HEIGHT
+from assets.hud import ScoreHUD, get_font
+from assets.renderer import DirtyRectRenderer
+from assets.sprites import load_sprites
+
+class InvincibleDinoAvatar(DinoAvatar):
+    __slots__ = ()
+
+    def collides_with(  self,
+                        obstacle: GameElement,
+                        motion: Tuple[int, int] = (0, 0),
+                        steps: int = 1) -> bool:
+        super().collides_with(obstacle, motion, steps)
+        return False
+
+def measure(sprites, gap_scale: float, ticks: int, renderer: DirtyRectRenderer = None):
+    """Returns the p50 and p99 time per tick (ns) and the mean and
+    largest number of live obstacles.
+    """
+    game_state = GameState(sprites, game_speed = 40, seed = 0, gap_scale = gap_scale)
+    game_state.dino_avatar = InvincibleDinoAvatar(
+        sprites.running_images,
+        sprites.ducking_images,
+        sprites.jumping_images,
+        SCREEN_WIDTH
+    )
+    # fill the screen first
+    for _ in range(200):
+        game_state.step()
+    timings = []
+    counts = []
+    for tick in range(ticks):
+        start = time.perf_counter_ns()
+        game_state.step(JUMP if tick % 30 == 0 else 0)
+        if renderer is not None:
+            renderer.render(game_state)
+        timings.append(time.perf_counter_ns() - start)
+        counts.append(len(game_state.obstacles))
+    quantiles = statistics.quantiles(timings, n = 100)
+    return quantiles[49], quantiles[98], statistics.mean(counts), max(counts)
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+    renderer = DirtyRectRenderer(screen, ScoreHUD(get_font(size = 20)))
+    for label, render in (("simulation", None), ("with rendering", renderer)):
+        print(f"{label}:")
+        for gap_scale in (1.0, 0.1, 0.02):
+            p50, p99, mean_count, max_count = measure(
+                sprites,
+                gap_scale,
+                2_000 if render else 20_000,
+                render
+            )
+            print(
+                f"  gap_scale {gap_scale:<4}: {mean_count:5.1f} obstacles on average ({max_count} max),"
+                f" p50 {p50 / 1000:7.2f} µs/tick, p99 {p99 / 1000:7.2f} µs/tick"
+            )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# bench_startup.py
+"""Cold and warm startup times of the sprite atlas against decoding
+every PNG separately, and the cost of blitting unconverted images
+against display-format ones.
+
+Usage: `SDL_VIDEODRIVER=dummy python -m benchmarks.bench_startup`
+(from the repo's root folder).
+"""
+
+# standard library dependencies
+import glob
+import os
+import tempfile
+import time
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.atlas import IMAGES_DIRPATH, SpriteAtlas
+from assets.sprites import load_sprites
+
+def time_it(function, repeat: int = 5) -> float:
+    """Returns the best time (in ms) out of `repeat` calls to `function`.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def load_pngs():
+    # what `main.py` used to do at import
+    for filepath in glob.glob(os.path.join(IMAGES_DIRPATH, "*", "*.png")):
+        pygame.image.load(filepath)
+
+def load_atlas(cache_dirpath: str):
+    atlas = SpriteAtlas(cache_dirpath=cache_dirpath)
+    for name in atlas.regions:
+        atlas.get(name)
+
+def blit_all(sprites, screen: pygame.Surface, frames: int = 200):
+    images = sprites.running_images + sprites.ducking_images \
+        + sprites.small_cactus_images + sprites.large_cactus_images \
+        + sprites.bird_images + [sprites.cloud_image, sprites.bg_image]
+    for _ in range(frames):
+        for image in images:
+            screen.blit(image, (0, 0))
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dirpath:
+        cold = time_it(
+            lambda: load_atlas(os.path.join(cache_dirpath, str(time.perf_counter_ns())))
+        )
+        load_atlas(cache_dirpath)
+        warm = time_it(lambda: load_atlas(cache_dirpath))
+    print(f"{'separate PNGs':>20}: {time_it(load_pngs):8.2f} ms")
+    print(f"{'atlas (cold cache)':>20}: {cold:8.2f} ms")
+    print(f"{'atlas (warm cache)':>20}: {warm:8.2f} ms")
+
+    unconverted = load_sprites()
+    screen = pygame.display.set_mode((1100, 600))
+    # once a display exists, the atlas hands out display-format images
+    displayed = load_sprites()
+    print(f"{'blit, unconverted':>20}: {time_it(lambda: blit_all(unconverted, screen)) / 200:8.3f} ms/frame")
+    print(f"{'blit, display format':>20}: {time_it(lambda: blit_all(displayed, screen)) / 200:8.3f} ms/frame")
+
+if __name__ == '__main__':
+    main()
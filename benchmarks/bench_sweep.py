@@ -0,0 +1,159 @@
+# bench_sweep.py
+"""Accuracy and cost of the swept collision test `GameState.step` uses
+above `SWEEP_SPEED`, compared with the discrete test (obstacles only
+tested where they are at every tick).
+
+Accuracy: one obstacle of every image passes the dino, from every
+starting offset, while the dino runs, ducks or jumps at one of several
+ticks. A pass is a hit if the obstacle touches the dino anywhere along
+its path, according to a sweep 16 times finer than the game's; a
+tunnel is a hit the discrete test misses.
+
+Cost: the tests `GameState.step` makes during seeded bot games at speed
+40, timed with the discrete test and with the swept one.
+
+Usage: `python -m benchmarks.bench_sweep` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import copy
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.dino_avatar import DinoAvatar, X_POSITION
+from assets.game_element import GameElement
+from assets.game_state import (
+    GameState,
+    NOOP,
+    JUMP,
+    DUCK,
+    MAX_GAME_SPEED,
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    SWEEP_SPEED,
+    collision_sweep
+)
+from assets.lookahead import dino_frames
+from assets.spawn_scheduler import OBSTACLE_Y, SMALL_CACTUS, LARGE_CACTUS, BIRD
+from assets.sprites import load_sprites
+from benchmarks.bench_replay import bot
+
+SPEEDS = (16, 20, 25, 30, 40)
+# ticks of running before the dino's action
+START_TICKS = 12
+TICKS = 20_000
+
+def passes(sprites, game_speed: int):
+    """Yields, for every pass of an obstacle by the dino, whether the
+    discrete test, the game's test and the reference sweep see a hit.
+    """
+    dino_avatar = DinoAvatar(
+        sprites.running_images,
+        sprites.ducking_images,
+        sprites.jumping_images,
+        SCREEN_WIDTH
+    )
+    images = [(image, OBSTACLE_Y[SMALL_CACTUS]) for image in sprites.small_cactus_images] \
+        + [(image, OBSTACLE_Y[LARGE_CACTUS]) for image in sprites.large_cactus_images] \
+        + [(image, OBSTACLE_Y[BIRD]) for image in sprites.bird_images]
+    tester = copy.copy(dino_avatar)
+    for image, y in images:
+        obstacle = GameElement(image, SCREEN_WIDTH)
+        for action in (NOOP, JUMP, DUCK):
+            for start in range(START_TICKS):
+                for offset in range(game_speed):
+                    obstacle.rect.topleft = (X_POSITION + tester.rect.width + offset, y)
+                    dino_y = dino_avatar.rect.y
+                    was_jumping = False
+                    hits = [False, False, False]
+                    for frame, is_jumping in dino_frames(dino_avatar, [NOOP] * start + [action] * 60):
+                        obstacle.update(game_speed)
+                        if obstacle.rect.right < X_POSITION - game_speed:
+                            break
+                        tester.image, tester.rect = frame
+                        dy = dino_y - tester.rect.y if was_jumping or is_jumping else 0
+                        dino_y = tester.rect.y
+                        was_jumping = is_jumping
+                        dx, dy, steps = collision_sweep(game_speed, dy)
+                        # the reference sweeps every speed, much finer
+                        fine_steps = 16 * (game_speed + abs(dy))
+                        hits[0] = hits[0] or tester.collides_with(obstacle)
+                        hits[1] = hits[1] or tester.collides_with(obstacle, (dx, dy), steps)
+                        hits[2] = hits[2] or tester.collides_with(obstacle, (-game_speed, dy), fine_steps)
+                    yield hits
+
+def played_tests(sprites, game_speed: int, ticks: int):
+    """Every (dino, obstacle, motion, steps) collision test of `ticks`
+    ticks of seeded bot games at `game_speed`.
+    """
+    tests = []
+    game_state = GameState(sprites, seed = 0, game_speed = game_speed)
+    rng = random.Random(0)
+    for _ in range(ticks):
+        dino_y = game_state.dino_avatar.rect.y
+        was_jumping = game_state.dino_avatar.is_jumping
+        game_over = game_state.step(bot(game_state, rng))
+        dino_avatar = copy.copy(game_state.dino_avatar)
+        dy = dino_y - dino_avatar.rect.y if was_jumping or dino_avatar.is_jumping else 0
+        dx, dy, steps = collision_sweep(game_state.game_speed, dy)
+        for obstacle in game_state.obstacles:
+            if obstacle.rect.x >= dino_avatar.rect.right:
+                break
+            obstacle = copy.copy(obstacle)
+            obstacle.rect = obstacle.rect.copy()
+            tests.append((dino_avatar, obstacle, (dx, dy), steps))
+        if game_over:
+            game_state.reset()
+    return tests
+
+def time_ns(function, repeats: int = 5) -> int:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        function()
+        best = min(best, time.perf_counter_ns() - start)
+    return best
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+
+    print(f"obstacle passes (swept above speed {SWEEP_SPEED}):")
+    for game_speed in SPEEDS:
+        results = list(passes(sprites, game_speed))
+        hits = sum(fine for _, _, fine in results)
+        tunnels = sum(fine and not discrete for discrete, _, fine in results)
+        missed = sum(fine and not swept for _, swept, fine in results)
+        false_hits = sum(swept and not fine for _, swept, fine in results)
+        print(
+            f"  speed {game_speed:2}: {len(results)} passes, {hits} hits, {tunnels} tunnels;"
+            f" the game's test misses {missed}, {false_hits} false hits"
+        )
+
+    tests = played_tests(sprites, MAX_GAME_SPEED, TICKS)
+
+    def discrete():
+        for dino_avatar, obstacle, _, _ in tests:
+            dino_avatar.collides_with(obstacle)
+
+    def swept():
+        for dino_avatar, obstacle, motion, steps in tests:
+            dino_avatar.collides_with(obstacle, motion, steps)
+
+    # builds the swept masks, which are cached
+    swept()
+    print(f"{len(tests)} tests over {TICKS} ticks at speed {MAX_GAME_SPEED}:")
+    for label, function in (("discrete", discrete), ("swept", swept)):
+        elapsed = time_ns(function)
+        print(f"  {label:>8}: {elapsed / TICKS:7.1f} ns/tick, {elapsed / len(tests):7.1f} ns/test")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# bench_video.py
+"""Cost of recording a game with `VideoRecorder`, and how fast a replay
+records headlessly.
+
+Capture: a seeded bot game is drawn at 60 frames per second (paced
+like the game loop), and recorded at 30 frames per second to a GIF, at
+every scale. The time of every `capture` call that keeps a frame is the
+overhead the game loop pays; frames the encoder couldn't keep up with
+are dropped.
+
+Headless: a bot game's replay is recorded with `record_replay` (every
+tick kept, waiting for the encoder) to a GIF and to PNGs.
+
+Usage: `python -m benchmarks.bench_video` (from the repo's root folder).
+Runs under `SDL_VIDEODRIVER=dummy` unless a video driver is already set.
+"""
+
+# standard library dependencies
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import numpy as np
+import pygame
+
+# local dependencies
+from assets.game_state import GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+from assets.hud import ScoreHUD, get_font
+from assets.renderer import DirtyRectRenderer
+from assets.replay import ReplayRecorder
+from assets.sprites import load_sprites
+from assets.video import VideoRecorder, record_replay
+from benchmarks.bench_replay import bot
+
+FRAMES = 600
+FRAME_TIME = 1 / 60
+SCALES = (1, 2, 3, 4)
+REPLAY_TICKS = 1000
+
+def capture_times(screen, sprites, path: str, scale: int):
+    """Times the captures of a paced bot game recorded to `path`.
+    """
+    renderer = DirtyRectRenderer(screen, ScoreHUD(get_font(size = 20)))
+    game_state = GameState(sprites, seed = 0)
+    rng = random.Random(0)
+    times = []
+    with VideoRecorder(screen, path, scale) as recorder:
+        deadline = time.perf_counter()
+        for _ in range(FRAMES):
+            if game_state.step(bot(game_state, rng)):
+                game_state.reset()
+            renderer.render(game_state)
+            start = time.perf_counter()
+            if recorder.capture():
+                times.append(time.perf_counter() - start)
+            deadline += FRAME_TIME
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+    return np.array(times) * 1000, recorder.dropped
+
+def bot_replay(sprites, ticks: int, seeds: int = 20):
+    """Longest replay of seeded bot games, cut at `ticks` ticks.
+    """
+    replays = []
+    for seed in range(seeds):
+        game_state = GameState(sprites, seed = seed)
+        recorder = ReplayRecorder(game_state)
+        recorder.reset()
+        rng = random.Random(seed)
+        for _ in range(ticks):
+            if recorder.step(bot(game_state, rng)):
+                break
+        replays.append(recorder.replay)
+    return max(replays, key = len)
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"capture at 30 fps of a game drawn at 60 fps ({FRAMES} frames):")
+        for scale in SCALES:
+            times, dropped = capture_times(screen, sprites, os.path.join(folder, f"live{scale}.gif"), scale)
+            print(
+                f"  scale {scale}: {len(times)} frames kept, {dropped} dropped;"
+                f" capture p50 {np.percentile(times, 50):.3f} ms, p99 {np.percentile(times, 99):.3f} ms"
+            )
+
+        replay = bot_replay(sprites, REPLAY_TICKS)
+        print(f"headless recording of a {len(replay)}-tick replay:")
+        for name in ("replay.gif", "replay.png"):
+            start = time.perf_counter()
+            recorder = record_replay(replay, sprites, os.path.join(folder, name))
+            elapsed = time.perf_counter() - start
+            print(f"  {name}: {recorder.captured} frames in {elapsed:.2f} s ({recorder.captured / elapsed:.0f} frames/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# soak_restarts.py
+"""Plays and restarts the game many times through `DinoRunner` and
+checks that memory use and stack depth stay flat.
+
+Usage: `python -m benchmarks.soak_restarts [restarts]` (from the repo's root folder).
+"""
+
+# standard library dependencies
+import os
+import resource
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+import main as game
+
+def rss_kb() -> int:
+    """Current resident set size in kB (peak RSS where /proc isn't available).
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def stack_depth() -> int:
+    depth = 0
+    frame = sys._getframe()
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+class SoakRunner(game.DinoRunner):
+    """Records the stack depth every time a game starts.
+    """
+    def start_game(self):
+        self.depths.add(stack_depth())
+        super().start_game()
+
+def main():
+    restarts = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    pygame.init()
+    # no pause after a collision, and each frame simulates
+    # (almost always) a whole game
+    runner = SoakRunner(game.SCREEN, max_speed = True, game_over_delay = 0)
+    runner.depths = set()
+    space = pygame.event.Event(pygame.KEYDOWN, key = pygame.K_SPACE)
+    report_every = max(1, restarts // 10)
+    for restart in range(1, restarts + 1):
+        pygame.event.post(space)
+        runner.run_once()
+        while runner.scene != game.MENU:
+            runner.run_once()
+        if restart % report_every == 0 or restart == 1:
+            print(
+                f"{restart:>8} restarts: RSS {rss_kb():>8,} kB, "
+                f"stack depths seen {sorted(runner.depths)}"
+            )
+
+if __name__ == '__main__':
+    main()
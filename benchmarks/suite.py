@@ -0,0 +1,210 @@
+# suite.py
+"""Benchmark suite for the simulation, collision and rendering hot paths.
+
+Usage (from the repo's root folder):
+
+    python -m benchmarks.suite [--output FILE] [--compare FILE] [--threshold 0.1]
+
+Every benchmark is repeated `--repeats` times and reports the median
+nanoseconds per operation; the time of every repeat is kept too.
+Results are written as JSON; when `--compare` points to the JSON of a
+previous run, a benchmark regresses when its median is slower than
+that run's median by more than `--threshold` (a fraction) *and* slower
+than that run's slowest repeat, so the noise between two runs doesn't
+fail the suite. Any regression makes the suite exit with status 1.
+Runs under `SDL_VIDEODRIVER=dummy` unless a video driver is already set.
+"""
+
+# standard library dependencies
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from statistics import median
+from typing import Callable, Dict, List
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# external dependencies
+import pygame
+
+# local dependencies
+from assets.game_state import GameState, ACTION_INPUTS, NOOP, JUMP, DUCK, SCREEN_WIDTH, SCREEN_HEIGHT
+from assets.hud import ScoreHUD, get_font
+from assets.obstacles import Bird, LargeCactus
+from assets.renderer import DirtyRectRenderer
+from assets.sprites import load_sprites
+from benchmarks.bench_replay import bot
+
+REPEATS = 9
+
+def ns_per_op(function: Callable[[], None], operations: int, repeats: int = REPEATS) -> List[float]:
+    """Returns the time per operation (in ns) of each of `repeats`
+    calls to `function`, which runs `operations` operations.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        function()
+        times.append((time.perf_counter_ns() - start) / operations)
+    return times
+
+def scripted_game(sprites, ticks: int, renderer: DirtyRectRenderer = None) -> Callable[[], None]:
+    """Returns a function playing `ticks` ticks of a seeded game with
+    the scripted bot, drawing every tick if a renderer is given.
+    """
+    def play():
+        game_state = GameState(sprites, seed = 0)
+        rng = random.Random(0)
+        for _ in range(ticks):
+            if game_state.step(bot(game_state, rng)):
+                game_state.reset()
+            if renderer is not None:
+                renderer.render(game_state)
+    return play
+
+def run_benchmarks(quick: bool = False, repeats: int = REPEATS) -> Dict[str, List[float]]:
+    """Runs every benchmark `repeats` times.
+
+    Returns
+    -------
+    Dict[str, List[float]]
+        Nanoseconds per operation of every repeat, by benchmark name.
+    """
+    scale = 10 if quick else 1
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    sprites = load_sprites()
+    results = {}
+
+    # DinoAvatar.update, cycling through every input
+    game_state = GameState(sprites, seed = 0)
+    dino_avatar = game_state.dino_avatar
+    inputs = [ACTION_INPUTS[action] for action in (NOOP,) * 20 + (JUMP,) * 5 + (DUCK,) * 5]
+    calls = 30_000 // scale
+    def update_dino():
+        for i in range(calls):
+            dino_avatar.update(inputs[i % len(inputs)])
+    results["dino_avatar.update"] = ns_per_op(update_dino, calls, repeats)
+
+    # DinoAvatar.collides_with, in every state, against a near and a far obstacle
+    obstacles = [LargeCactus(SCREEN_WIDTH, sprites.large_cactus_images[0]), Bird(SCREEN_WIDTH, sprites.bird_images)]
+    obstacles[0].rect.x = 100
+    calls = 30_000 // scale
+    def collide():
+        for i in range(calls):
+            dino_avatar.is_ducking = i % 3 == 1
+            dino_avatar.is_jumping = i % 3 == 2
+            dino_avatar.collides_with(obstacles[i & 1])
+    results["dino_avatar.collides_with"] = ns_per_op(collide, calls, repeats)
+    dino_avatar.reset()
+
+    # ParallaxBackground.update + draw (what `update_background` used to do)
+    background = GameState(sprites, seed = 0).background
+    calls = 2_000 // scale
+    def scroll_background():
+        for _ in range(calls):
+            background.update(16)
+            background.draw(screen)
+    results["draw_background"] = ns_per_op(scroll_background, calls, repeats)
+
+    # Bird.update + Bird.draw (flipping between images)
+    bird = Bird(SCREEN_WIDTH, sprites.bird_images)
+    calls = 10_000 // scale
+    def bird_frame():
+        for _ in range(calls):
+            bird.update(0)
+            bird.draw(screen)
+    results["bird.update_and_draw"] = ns_per_op(bird_frame, calls, repeats)
+
+    # full frames, with and without rendering
+    ticks = 20_000 // scale
+    results["frame.simulation_only"] = ns_per_op(scripted_game(sprites, ticks), ticks, repeats)
+    ticks = 2_000 // scale
+    renderer = DirtyRectRenderer(screen, ScoreHUD(get_font(size = 20)))
+    results["frame.with_rendering"] = ns_per_op(scripted_game(sprites, ticks, renderer), ticks, repeats)
+    return results
+
+def compare(  samples: Dict[str, List[float]],
+                previous: Dict[str, float],
+                previous_samples: Dict[str, List[float]],
+                threshold: float) -> bool:
+    """Prints how the medians of `samples` compare with `previous`.
+
+    Parameters
+    ----------
+    samples : Dict[str, List[float]]
+        Nanoseconds per operation of every repeat, by benchmark name.
+    previous : Dict[str, float]
+        Medians of a previous run.
+    previous_samples : Dict[str, List[float]]
+        Repeats of the previous run (empty for results written before
+        they were kept, which are only compared with `threshold`).
+    threshold : float
+        Slowdown of the median allowed, as a fraction.
+
+    Returns
+    -------
+    bool
+        Whether no benchmark regressed: slower by more than `threshold`
+        and slower than every repeat of the previous run.
+    """
+    passed = True
+    for name, times in samples.items():
+        ns = median(times)
+        spread = f"{min(times):,.0f}-{max(times):,.0f}"
+        if name not in previous:
+            print(f"{name:>28}: {ns:12,.0f} ns/op [{spread}] (new)")
+            continue
+        change = ns / previous[name] - 1
+        slowest = max(previous_samples.get(name, [previous[name]]))
+        regressed = change > threshold and ns > slowest
+        passed = passed and not regressed
+        print(
+            f"{name:>28}: {ns:12,.0f} ns/op [{spread}] ({change:+7.1%})"
+            + ("  REGRESSION" if regressed else "")
+        )
+    return passed
+
+def main(argv = None) -> int:
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[0])
+    parser.add_argument("--output", default = "bench_results.json", help = "where to write the results")
+    parser.add_argument("--compare", metavar = "FILE", help = "results of a previous run to compare with")
+    parser.add_argument("--threshold", type = float, default = 0.10, help = "allowed slowdown, as a fraction")
+    parser.add_argument("--repeats", type = int, default = REPEATS, help = "runs of every benchmark")
+    parser.add_argument("--quick", action = "store_true", help = "run 10x fewer operations")
+    args = parser.parse_args(argv)
+
+    samples = run_benchmarks(quick = args.quick, repeats = args.repeats)
+    results = {name: median(times) for name, times in samples.items()}
+    ops_per_second = {name: 1e9 / ns for name, ns in results.items()}
+    with open(args.output, "w") as output_file:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "machine": platform.machine(),
+                "ns_per_op": results,
+                "ns_per_op_repeats": samples,
+                "ops_per_second": ops_per_second,
+            },
+            output_file,
+            indent = 2
+        )
+
+    previous = {}
+    previous_samples = {}
+    if args.compare:
+        with open(args.compare) as previous_file:
+            previous_run = json.load(previous_file)
+        previous = previous_run["ns_per_op"]
+        previous_samples = previous_run.get("ns_per_op_repeats", {})
+    passed = compare(samples, previous, previous_samples, args.threshold)
+    print(f"headless steps/s: {ops_per_second['frame.simulation_only']:,.0f}")
+    return 0 if passed else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,345 +1,616 @@
 # standard library dependencies
-import os
-import random 
-from typing import Tuple 
+import argparse
+import random
+import time
+from typing import Callable, List, Union
 
 # external dependencies
+import numpy as np
 import pygame
 
 # local dependencies
-from assets.game_element import Cloud
-from assets.dino_avatar import DinoAvatar
-from assets.obstacles import SmallCactus, LargeCactus, Bird
+from assets.chaos import MirrorView
+from assets.game_state import (
+    GameState,
+    action_from_keys,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH
+)
+from assets.hud import ScoreHUD, get_font, render_text
+from assets.leaderboard import Leaderboard
+from assets.population import Population, PopulationRenderer, reflex_actions
+from assets.profiler import FrameProfiler, ProfilerOverlay, EVENTS, WAIT
+from assets.renderer import DirtyRectRenderer, PositionHistory
+from assets.replay import Replay, ReplayRecorder
+from assets.sprites import load_sprites
+from assets.timestep import FixedTimestep, TICK_RATE
+from assets.video import VideoRecorder, record_replay
 
 # constants
 # NOTE: Remind IM of convention of having constants in uppercase
-SCREEN_HEIGHT = 600
-SCREEN_WIDTH = 1100
 SCREEN = pygame.display.set_mode(
     (SCREEN_WIDTH, SCREEN_HEIGHT)
 )
 
-IMAGES_DIRPATH = os.path.join(
-    os.getcwd(),
-    "assets",
-    "images"
-)
-
-RUNNING_IMAGES = [
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Dino", "DinoRun1.png")),
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Dino", "DinoRun2.png"))
-]
-
-JUMPING_IMAGES = [
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Dino", "DinoJump.png"))
-]
-
-DUCKING_IMAGES = [
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Dino", "DinoDuck1.png")),
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Dino", "DinoDuck2.png"))
-]
-
-SMALL_CACTUS_IMAGES = [
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Cactus", "SmallCactus1.png")),
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Cactus", "SmallCactus2.png")),
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Cactus", "SmallCactus3.png"))
-]
+# scenes of `DinoRunner`
+MENU = "menu"
+PLAYING = "playing"
+GAME_OVER = "game_over"
 
-LARGE_CACTUS_IMAGES = [
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Cactus", "LargeCactus1.png")),
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Cactus", "LargeCactus2.png")),
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Cactus", "LargeCactus3.png"))
-]
+# in max speed mode, how long to simulate between two frames
+MAX_SPEED_FRAME_NS = 1_000_000_000 // 30
 
-BIRD_IMAGES = [
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Bird", "Bird1.png")),
-    pygame.image.load(os.path.join(IMAGES_DIRPATH, "Bird", "Bird2.png"))
-]
+# loaded after `set_mode` so that the images are in the display's format
+SPRITES = load_sprites()
 
-CLOUD_IMAGE = pygame.image.load(os.path.join(IMAGES_DIRPATH, "Other", "Cloud.png"))
+RUNNING_IMAGES = SPRITES.running_images
+JUMPING_IMAGES = SPRITES.jumping_images
+DUCKING_IMAGES = SPRITES.ducking_images
+SMALL_CACTUS_IMAGES = SPRITES.small_cactus_images
+LARGE_CACTUS_IMAGES = SPRITES.large_cactus_images
+BIRD_IMAGES = SPRITES.bird_images
+CLOUD_IMAGE = SPRITES.cloud_image
+BG_IMAGE = SPRITES.bg_image
 
-BG_IMAGE = pygame.image.load(os.path.join(IMAGES_DIRPATH, "Other", "Track.png"))
 
-
-# utility functions
-
-def update_score_and_game_speed(points: int, 
-                                game_speed: int) -> Tuple[int,int]:
-    """Updates `points` and `game_speed`
+def advance( game_state: GameState,
+             step: Callable[[], bool],
+             history: PositionHistory,
+             timestep: FixedTimestep,
+             max_speed: bool = False) -> bool:
+    """Runs the simulation ticks due before the next frame.
 
     Parameters
     ----------
-    points : int
-        Current points.
-    game_speed : int
-        Current game speed.
+    game_state : GameState
+        Game being played.
+    step : Callable[[], bool]
+        Runs one tick and returns whether the game is over.
+    history : PositionHistory
+        Updated with the positions before the last tick.
+    timestep : FixedTimestep
+        Decides how many ticks are due.
+    max_speed : bool, optional
+        If True, ticks run back-to-back for a whole frame's worth of
+        wall time instead of following `timestep`; by default False.
 
     Returns
     -------
-    Tuple[int,int]
-        The updated values for points and game speed.
+    bool
+        Whether the game is over.
+    """
+    if max_speed:
+        deadline = time.perf_counter_ns() + MAX_SPEED_FRAME_NS
+        while time.perf_counter_ns() < deadline:
+            history.capture(game_state)
+            if step():
+                return True
+        return False
+    for _ in range(timestep.ticks_due()):
+        history.capture(game_state)
+        if step():
+            return True
+    return False
+
+class DinoRunner:
+    """Runs the game as a few scenes (menu, playing, game over)
+    driven by one flat loop.
+
+    Switching scenes only changes `scene`: the same `GameState` (and
+    everything else) is reset and reused for every game, so playing
+    any number of games doesn't grow the stack or leave old game
+    objects behind.
     """
-    points += 1
-    if points % 100 == 0:
-        game_speed += 1
-    # cap game_speed at 40
-    return points, min(game_speed, 40)
-    
-def update_and_draw_score(  points: int, 
-                            game_speed: int,
-                            screen: pygame.Surface,
-                            font : pygame.font.Font) -> Tuple[int,int]:
-    """Wrapper around `update_score_and_game_speed` that
-    also displays the updated score (`points`) on the screen.
+    def __init__(   self,
+                    screen: pygame.Surface,
+                    game_speed: int = 15, 
+                    x_pos_bg: int = 0, 
+                    y_pos_bg: int = 380,
+                    record_path: str = None,
+                    tick_rate: int = TICK_RATE,
+                    fps: int = 60,
+                    max_speed: bool = False,
+                    game_over_delay: int = 2000,
+                    profile_path: str = None,
+                    leaderboard_path: str = None,
+                    chaos: bool = False,
+                    video_path: str = None):
+        """
+        Parameters
+        ----------
+        screen : pygame.Surface
+            Game screen.
+        game_speed : int, optional
+            Starting value for game speed, by default 15.
+        x_pos_bg : int, optional
+            Starting value for the x-position of the background image, by default 0.
+        y_pos_bg : int, optional
+            Starting value for the y-position of the background image, by default 380.
+        record_path : str, optional
+            If given, a replay of every game is saved to this file when it ends.
+        tick_rate : int, optional
+            Simulation ticks per second, by default 30.
+        fps : int, optional
+            Most frames drawn per second, by default 60; 0 means no cap.
+            Frames drawn between two ticks are interpolated.
+        max_speed : bool, optional
+            If True, the simulation runs as fast as the CPU allows, by default False.
+        game_over_delay : int, optional
+            Time (in ms) the last frame stays on screen after a collision, by default 2000.
+        profile_path : str, optional
+            If given, every phase of every frame is timed, F3 shows the timings
+            on screen, and the last frames' timings are saved to this CSV file on exit.
+        leaderboard_path : str, optional
+            If given, every score is saved to this SQLite file, and the menu
+            shows the last game's rank and the best score.
+        chaos : bool, optional
+            If True (chaos mode), games are drawn mirrored and upside down,
+            and UP and DOWN are swapped; by default False.
+        video_path : str, optional
+            If given, the frames of every game are recorded to this GIF
+            (or PNG sequence, see `VideoRecorder`), at half size; frames
+            the encoder can't keep up with are dropped.
+        """
+        self.screen = screen
+        self.record_path = record_path
+        self.fps = fps
+        self.max_speed = max_speed
+        self.game_over_delay = game_over_delay
+        self.chaos = chaos
+
+        # useful for setting the time between frames
+        self.clock = pygame.time.Clock()
+
+        # all the game logic lives in `GameState`; the scenes only
+        # feed it the keyboard and draw it
+        self.game_state = GameState(
+            SPRITES,
+            screen_width = SCREEN_WIDTH,
+            game_speed = game_speed,
+            x_pos_bg = x_pos_bg,
+            y_pos_bg = y_pos_bg
+        )
+        self.recorder = ReplayRecorder(self.game_state)
+        # only redraws and pushes the parts of the screen that changed
+        self.renderer = DirtyRectRenderer(
+            screen,
+            ScoreHUD(get_font(size = 20))
+        )
+        if chaos:
+            # every image is flipped here, once
+            self.renderer.view = MirrorView(SPRITES, self.game_state.background, screen.get_size())
+        # the simulation runs at `tick_rate` whatever the frame rate is
+        self.timestep = FixedTimestep(tick_rate)
+        self.history = PositionHistory()
+
+        self.profile_path = profile_path
+        self.profiler = None
+        self.profiler_overlay = None
+        if profile_path is not None:
+            self.profiler = FrameProfiler()
+            self.profiler_overlay = ProfilerOverlay(self.profiler, get_font(size = 14))
+            self.game_state.profiler = self.profiler
+            self.renderer.profiler = self.profiler
+            self.renderer.overlays.append(self.profiler_overlay)
+
+        self.leaderboard = None
+        if leaderboard_path is not None:
+            self.leaderboard = Leaderboard(leaderboard_path)
+
+        self.video = None
+        if video_path is not None:
+            self.video = VideoRecorder(screen, video_path)
+
+        self.scene = MENU
+        # score of the last game, -1 before the first one
+        self.score = -1
+        # rank of the last game and best score, if there's a leaderboard
+        self.rank = None
+        self.best = None
+        # when the game over scene ends (in `pygame.time.get_ticks` ms)
+        self.game_over_until = 0
+        # the menu and game over scenes are only drawn when this is set
+        self.needs_redraw = True
+        self.running = True
+
+    def start_game(self):
+        """Switches to the playing scene with a fresh game.
+        """
+        self.game_state.reset(seed = random.getrandbits(32))
+        self.recorder.reset()
+        self.timestep.reset()
+        self.history = PositionHistory()
+        self.renderer.invalidate()
+        self.scene = PLAYING
+
+    def end_game(self):
+        """Switches to the game over scene.
+        """
+        self.score = self.game_state.score
+        if self.leaderboard is not None:
+            # the rank only counts better runs, so it doesn't need this
+            # one to be saved yet
+            self.rank = self.leaderboard.rank(self.score)
+            top = self.leaderboard.top(1)
+            self.best = max([self.score] + [run.score for run in top])
+            self.leaderboard.submit(self.score, self.game_state.seed)
+        if self.record_path is not None:
+            self.recorder.replay.save(self.record_path)
+        if self.video is not None:
+            # the menus aren't recorded, so the next game follows right after
+            self.video.pause()
+        self.game_over_until = pygame.time.get_ticks() + self.game_over_delay
+        self.scene = GAME_OVER
+
+    def show_menu(self):
+        """Switches to the menu scene.
+        """
+        self.needs_redraw = True
+        self.scene = MENU
+
+    def handle_event(self, event: pygame.event.Event):
+        """Quits, starts a game from the menu, toggles the profiler overlay,
+        or asks for a redraw when the window needs one.
+        """
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.needs_redraw = True
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3 \
+                and self.profiler_overlay is not None:
+            self.profiler_overlay.toggle()
+        elif self.scene == MENU and event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.running = False
+            elif event.key == pygame.K_SPACE:
+                self.start_game()
+
+    def play_frame(self):
+        """Runs the ticks due and draws one frame of the game.
+        """
+        action = action_from_keys(pygame.key.get_pressed(), inverted = self.chaos)
+        game_over = advance(
+            self.game_state,
+            lambda: self.recorder.step(action),
+            self.history,
+            self.timestep,
+            max_speed = self.max_speed
+        )
+        self.renderer.render(
+            self.game_state,
+            self.history,
+            alpha = 1.0 if game_over or self.max_speed else self.timestep.alpha
+        )
+        if self.video is not None:
+            self.video.capture()
+        if game_over:
+            self.end_game()
+        elif not self.max_speed:
+            self.clock.tick(self.fps)
+        if self.profiler is not None:
+            self.profiler.mark(WAIT)
+
+    def events(self) -> List[pygame.event.Event]:
+        """Returns the pending events; outside of a game, first sleeps
+        until there's one (or until the game over scene ends), since
+        nothing else can change what's on screen.
+        """
+        if self.scene == PLAYING or self.needs_redraw:
+            return pygame.event.get()
+        if self.scene == GAME_OVER:
+            remaining = self.game_over_until - pygame.time.get_ticks()
+            # a timeout of 0 would wait forever
+            if remaining <= 0:
+                return pygame.event.get()
+            event = pygame.event.wait(remaining)
+        else:
+            event = pygame.event.wait()
+        return [event] + pygame.event.get()
+
+    def run_once(self):
+        """Handles pending events and runs the current scene once.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_frame()
+        for event in self.events():
+            self.handle_event(event)
+        if profiler is not None:
+            profiler.mark(EVENTS)
+            # only the frames of a game are kept
+            if self.scene != PLAYING or not self.running:
+                profiler.cancel_frame()
+        if not self.running:
+            return
+        if self.scene == PLAYING:
+            self.play_frame()
+        elif self.scene == GAME_OVER:
+            if pygame.time.get_ticks() >= self.game_over_until:
+                self.show_menu()
+            elif self.needs_redraw:
+                # the last frame of the game stays on screen
+                self.renderer.invalidate()
+                self.renderer.render(self.game_state)
+                self.needs_redraw = False
+        if self.scene == MENU and self.needs_redraw:
+            draw_menu(self.screen, self.score, self.rank, self.best)
+            self.needs_redraw = False
+
+    def run(self):
+        """Flat loop running the current scene until the player quits.
+        """
+        while self.running:
+            self.run_once()
+        if self.profiler is not None:
+            self.profiler.dump_csv(self.profile_path)
+        if self.leaderboard is not None:
+            self.leaderboard.close()
+        if self.video is not None:
+            self.video.close()
+
+def main(**game_options):
+    """Starts the game at the menu.
 
     Parameters
     ----------
-    points : int
-        Current points.
-    game_speed : int
-        Current game speed.
-    screen : pygame.Surface
-        Game screen.
-    font : pygame.font.Font
-        Font used for the display.
-
-    Returns
-    -------
-    Tuple[int,int]
-        The updated values for points and game speed.
+    **game_options
+        Passed to `DinoRunner`.
     """
-    updated_score, updated_game_speed = update_score_and_game_speed(
-        points, 
-        game_speed
-    )
-    text = font.render("Points: " + str(updated_score), True, (0, 0, 0))
-    textRect = text.get_rect()
-    textRect.center = (1000, 40)
-    screen.blit(
-        text, 
-        textRect
-    )
-    return updated_score, updated_game_speed
+    DinoRunner(SCREEN, **game_options).run()
 
-def update_background(  bg_image: pygame.Surface,
-                        screen: pygame.Surface,
-                        game_speed: int,
-                        x_pos_bg: int = 0,
-                        y_pos_bg: int = 380) -> int:
-    """Convenience function that handles updating
-    the background according to the game speed.
+def watch_replay(   replay_path: str,
+                    tick_rate: int = TICK_RATE,
+                    fps: int = 60,
+                    max_speed: bool = False,
+                    chaos: bool = False,
+                    video_path: str = None):
+    """Plays a recorded game on the screen.
 
     Parameters
     ----------
-    bg_image : pygame.Surface
-        Image for the background.
-    screen : pygame.Surface
-        Game screen.
-    game_speed : int
-        Current value for game speed.
-    x_pos_bg : int, optional
-        x-position for the background image, by default 0.
-    y_pos_bg : int, optional
-        y-position for the background image, by default 380.
-
-    Returns
-    -------
-    int
-        The updated x-position for the background image.
+    replay_path : str
+        File saved by `main(record_path=...)`.
+    tick_rate : int, optional
+        Simulation ticks per second, by default 30 (normal speed).
+    fps : int, optional
+        Most frames drawn per second, by default 60; 0 means no cap.
+    max_speed : bool, optional
+        If True, the replay runs as fast as the CPU allows, by default False.
+    chaos : bool, optional
+        If True, the game is drawn mirrored and upside down, by default False.
+    video_path : str, optional
+        If given, the game is recorded to this GIF (or PNG sequence, see
+        `VideoRecorder`), at half size; in max speed mode, it is recorded
+        headlessly instead of shown: every tick, at `tick_rate` ticks per second.
     """
-    image_width = bg_image.get_width()
-    screen.blit(
-        bg_image, (x_pos_bg, y_pos_bg)
-    )
-    screen.blit(
-        bg_image, 
-        (image_width + x_pos_bg, y_pos_bg)
+    clock = pygame.time.Clock()
+    replay = Replay.load(replay_path)
+    if video_path is not None and max_speed:
+        record_replay(replay, SPRITES, video_path, tick_rate = tick_rate, chaos = chaos)
+        return
+    game_state = GameState(
+        SPRITES,
+        screen_width = SCREEN_WIDTH,
+        game_speed = replay.game_speed,
+        seed = replay.seed
     )
-    # reset background - put it back to its initial position
-    if x_pos_bg <= -image_width:
-        screen.blit(
-            bg_image, 
-            (image_width + x_pos_bg, y_pos_bg)
-        )
-        x_pos_bg = 0
-    x_pos_bg -= game_speed
-    return x_pos_bg
-
-def main(   game_speed: int = 15, 
-            x_pos_bg: int = 0, 
-            y_pos_bg: int = 380):
-    """Main game loop.
+    renderer = DirtyRectRenderer(SCREEN, ScoreHUD(get_font(size = 20)))
+    if chaos:
+        renderer.view = MirrorView(SPRITES, game_state.background, SCREEN.get_size())
+    timestep = FixedTimestep(tick_rate)
+    history = PositionHistory()
+    actions = replay.actions()
+    video = None
+    if video_path is not None:
+        video = VideoRecorder(SCREEN, video_path)
+
+    def step() -> bool:
+        action = next(actions, None)
+        # a replay that runs out without a collision was cut short
+        return action is None or game_state.step(action)
+
+    game_over = False
+    try:
+        while not game_over:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+            game_over = advance(game_state, step, history, timestep, max_speed)
+            renderer.render(
+                game_state,
+                history,
+                alpha = 1.0 if game_over or max_speed else timestep.alpha
+            )
+            if video is not None:
+                video.capture()
+            if not max_speed:
+                clock.tick(fps)
+    finally:
+        if video is not None:
+            video.close()
+
+def watch_population(   n: int,
+                        tick_rate: int = TICK_RATE,
+                        max_speed: bool = False,
+                        seed: Union[int, None] = None):
+    """Shows `n` dinos with random reflexes (see `reflex_actions`)
+    running the same course, until the last one is out (the best ones
+    may never be) or the window is closed.
 
     Parameters
     ----------
-    game_speed : int, optional
-        Starting value for game speed, by default 15.
-    x_pos_bg : int, optional
-        Starting value for the x-position of the background image, by default 0.
-    y_pos_bg : int, optional
-        Starting value for the y-position of the background image, by default 380.
+    n : int
+        Number of dinos.
+    tick_rate : int, optional
+        Ticks (and frames) per second, by default 30.
+    max_speed : bool, optional
+        If True, the population runs as fast as the CPU allows, by default False.
+    seed : int, optional
+        Seed of the course and of the dinos' reflexes, by default a random one.
     """
-    # useful for setting the time between frames
     clock = pygame.time.Clock()
-
-    # instantiate known assets
-    font = pygame.font.Font('freesansbold.ttf', 20)
-    
-    dino_avatar = DinoAvatar(
-        RUNNING_IMAGES,
-        DUCKING_IMAGES,
-        JUMPING_IMAGES,
-        SCREEN_WIDTH
-    )
-
-    cloud = Cloud(
-        SCREEN_WIDTH,
-        image = CLOUD_IMAGE
-    )
-
-    score, game_speed = update_and_draw_score(  
-        -1, 
-        game_speed,
+    population = Population(SPRITES, n, seed = seed)
+    font = get_font(size = 20)
+    renderer = PopulationRenderer(
         SCREEN,
-        font
+        SPRITES,
+        ScoreHUD(font),
+        ScoreHUD(font, center = (120, 40), label = "Alive: ")
     )
-    obstacles = []
-    run = True 
-
-    while run:
+    reach = np.random.default_rng(population.course.seed).uniform(2, 10, n)
+    observations = None
+    while not population.game_over.all():
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                run = False
-        # fill with white
-        SCREEN.fill((255,255,255))
-        cloud.draw(SCREEN)
-        cloud.update(game_speed)
-
-        dino_avatar.draw(SCREEN)
-        dino_avatar.update(pygame.key.get_pressed())
-
-        if len(obstacles) == 0:
-            # NOTE: could also refactor this to use `random.choices`
-            random_choice = random.randint(0,2)
-            # decide which obstacle to add
-            if random_choice == 0:
-                obstacles.append(
-                    SmallCactus(
-                        SCREEN_WIDTH,
-                        SMALL_CACTUS_IMAGES[
-                            random.randint(0, len(SMALL_CACTUS_IMAGES)-1)
-                        ]
-                    )
-                )
-            elif random_choice == 1:
-                obstacles.append(
-                    LargeCactus(
-                        SCREEN_WIDTH,
-                        LARGE_CACTUS_IMAGES[
-                            random.randint(0, len(LARGE_CACTUS_IMAGES)-1)
-                        ]
-                    )
-                )
-            else:
-                obstacles.append(
-                    Bird(
-                        SCREEN_WIDTH,
-                        BIRD_IMAGES
-                    )
-                )
-            
-        
-        for obstacle in obstacles:
-            obstacle.draw(SCREEN)
-            obstacle.update(game_speed)
-
-            # if the obstacle image is completely off-screen, 
-            # pop it
-            if obstacle.rect.x < -obstacle.rect.width:
-                obstacles.pop()
-                break
-
-            if dino_avatar.collides_with(obstacle.rect):
-                pygame.time.delay(2000)
-                menu(
-                    SCREEN,
-                    score = score
-                )
-        
-        x_pos_bg = update_background(
-            BG_IMAGE,
-            SCREEN,
-            game_speed,
-            x_pos_bg = x_pos_bg,
-            y_pos_bg = y_pos_bg
-        )
+                return
+        observations = population.observe(observations)
+        population.step(reflex_actions(observations, reach))
+        renderer.render(population)
+        if not max_speed:
+            clock.tick(tick_rate)
+
+def draw_menu(  screen: pygame.Surface,
+                score: int = -1,
+                rank: Union[int, None] = None,
+                best: Union[int, None] = None):
+    """Draws the menu, with the score of the last game if there was one.
 
-        score, game_speed = update_and_draw_score(  
-            score, 
-            game_speed,
-            SCREEN,
-            font
+    Parameters
+    ----------
+    screen : pygame.Surface
+        Game screen.
+    score : int, optional
+        Score of the last game, by default -1 (no game played yet).
+    rank : int, optional
+        Rank of the last game on the leaderboard, by default None (not shown).
+    best : int, optional
+        Best score on the leaderboard, by default None (not shown).
+    """
+    screen.fill((255,255,255))
+    if score == -1:
+        text = render_text(
+            "Press SPACE to start!",
+            size = 30
         )
-
-        clock.tick(30)
-        pygame.display.update()
-
-def menu(   screen: pygame.Surface,
-            score: int = -1):
-    run = True
-    font = pygame.font.Font('freesansbold.ttf', 30)
-
-    while run:
-        screen.fill((255,255,255))
-        if score == -1:
-            text = font.render(
-                "Press SPACE to start!",
-                True,
-                (0,0,0)
-            )
-            text_rect = text.get_rect()
-            text_rect.center = (
-                SCREEN_WIDTH // 2, 
-                SCREEN_HEIGHT // 2
-            )
-            screen.blit(text, text_rect)
-        else:
-            text = font.render(
-                "Press SPACE to start over!",
-                True, 
-                (0,0,0)
-            )
-            text_rect = text.get_rect()
-            text_rect.center = (
-                SCREEN_WIDTH // 2, 
-                SCREEN_HEIGHT // 2
-            )
-            screen.blit(
-                text, text_rect
-            )
-            text = font.render(
-                f"Your score: {score}",
-                True,
-                (0,0,0)
+        text_rect = text.get_rect()
+        text_rect.center = (
+            SCREEN_WIDTH // 2, 
+            SCREEN_HEIGHT // 2
+        )
+        screen.blit(text, text_rect)
+    else:
+        text = render_text(
+            "Press SPACE to start over!",
+            size = 30
+        )
+        text_rect = text.get_rect()
+        text_rect.center = (
+            SCREEN_WIDTH // 2, 
+            SCREEN_HEIGHT // 2
+        )
+        screen.blit(
+            text, text_rect
+        )
+        text = render_text(
+            f"Your score: {score}" if rank is None else f"Your score: {score} (#{rank})",
+            size = 30
+        )
+        text_rect = text.get_rect()
+        text_rect.center = (
+            SCREEN_WIDTH // 2, 
+            SCREEN_HEIGHT // 2 + 50
+        )
+        screen.blit(text, text_rect)
+        if best is not None:
+            text = render_text(
+                f"Best: {best}",
+                size = 30
             )
             text_rect = text.get_rect()
             text_rect.center = (
                 SCREEN_WIDTH // 2, 
-                SCREEN_HEIGHT // 2 + 50
+                SCREEN_HEIGHT // 2 + 100
             )
             screen.blit(text, text_rect)
-        screen.blit(
-            RUNNING_IMAGES[0],
-            (SCREEN_WIDTH // 2 - 20, SCREEN_HEIGHT // 2 - 140)
-        )
-        pygame.display.update()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT or pygame.key.get_pressed()[pygame.K_ESCAPE]:
-                raise SystemExit
-
-            if pygame.key.get_pressed()[pygame.K_SPACE]:
-                main()
+    screen.blit(
+        RUNNING_IMAGES[0],
+        (SCREEN_WIDTH // 2 - 20, SCREEN_HEIGHT // 2 - 140)
+    )
+    pygame.display.update()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Chrome Dinosaur running game")
+    parser.add_argument(
+        "--record",
+        metavar = "FILE",
+        help = "save a replay of every game to FILE when it ends"
+    )
+    parser.add_argument(
+        "--replay",
+        metavar = "FILE",
+        help = "watch the game recorded in FILE instead of playing"
+    )
+    parser.add_argument(
+        "--tick-rate",
+        type = int,
+        default = TICK_RATE,
+        help = "simulation ticks per second (also sets the replay speed)"
+    )
+    parser.add_argument(
+        "--fps",
+        type = int,
+        default = 60,
+        help = "most frames drawn per second (0 for no cap)"
+    )
+    parser.add_argument(
+        "--max-speed",
+        action = "store_true",
+        help = "run the simulation as fast as the CPU allows"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar = "CSV",
+        help = "time every phase of every frame (F3 shows the timings) and save them to CSV on exit"
+    )
+    parser.add_argument(
+        "--leaderboard",
+        metavar = "FILE",
+        help = "save every score to the SQLite file FILE and show ranks in the menu"
+    )
+    parser.add_argument(
+        "--chaos",
+        action = "store_true",
+        help = "chaos mode: the game is mirrored and upside down, and UP and DOWN are swapped"
+    )
+    parser.add_argument(
+        "--video",
+        metavar = "FILE",
+        help = "record the games to the GIF FILE (or to numbered PNGs);"
+            " with --replay and --max-speed, record the replay headlessly"
+    )
+    parser.add_argument(
+        "--population",
+        metavar = "N",
+        type = int,
+        help = "watch N dinos with random reflexes run the same course"
+    )
+    args = parser.parse_args()
+    timing = dict(
+        tick_rate = args.tick_rate,
+        fps = args.fps,
+        max_speed = args.max_speed
+    )
     pygame.init()
-    menu(SCREEN)
\ No newline at end of file
+    if args.population:
+        watch_population(args.population, args.tick_rate, args.max_speed)
+    elif args.replay:
+        watch_replay(args.replay, chaos = args.chaos, video_path = args.video, **timing)
+    else:
+        main(
+            record_path = args.record,
+            profile_path = args.profile,
+            leaderboard_path = args.leaderboard,
+            chaos = args.chaos,
+            video_path = args.video,
+            **timing
+        )
\ No newline at end of file